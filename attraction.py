@@ -4,14 +4,21 @@ from PIL import Image, ImageTk, ImageDraw
 import io
 import random
 import os
-import time
-import json
-import subprocess
 import sys
 from datetime import datetime
 from typing import List, Dict, Tuple
-from concurrent.futures import ThreadPoolExecutor
 from profile import Profile
+from image_service import get_image_service, load_photo, load_photo_async
+from virtual_grid import VirtualGrid
+from catalog_index import CatalogIndex
+from search_index import SearchIndex
+from catalog_store import load_catalog
+from geo_index import coordinates, haversine_km
+from session import get_session
+from page_router import SCRIPTS, get_router, navigate, run
+
+# Where distance_km is measured from (Kuala Lumpur city centre)
+HOME_COORDINATES = (3.1390, 101.6869)
 
 class AttractionApp:
     def __init__(self, root, email):
@@ -52,12 +59,13 @@ class AttractionApp:
         
         # Data
         self.attractions = self.load_attractions()
+        self.attraction_index = self.build_attraction_index()
+        self.attraction_search = self.build_attraction_search()
         self.filtered_attractions = self.attractions.copy()
         
-        # Image cache
+        # Placeholder cache (real images are decoded by the shared image service)
         self.image_cache = {}
-        self.cache_size = 50
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.all_attractions_grid = None
         
         # Filter variables
         self.min_price_var = tk.IntVar(value=0)
@@ -87,28 +95,23 @@ class AttractionApp:
         self.menu_bold_font = tkFont.Font(family="Arial", size=11, weight="bold")  # Use tkFont
 
     def load_user_session(self):
-        """Load user information from session file"""
-        session_file = 'user_session.json'
-        if os.path.exists(session_file):
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                    self.email = session_data.get('email', 'user@example.com')
-                    self.user_name = session_data.get('user_name', 'Guest User')
-            except:
-                self.email = 'user@example.com'
-                self.user_name = 'Guest User'
-        else:
-            self.email = 'user@example.com'
-            self.user_name = 'Guest User'
+        """Fill in user information that was not passed in from the current session"""
+        session = get_session()
+        self.email = self.email or session.email or 'user@example.com'
+        self.user_name = getattr(self, 'user_name', None) or session.user_name or 'Guest User'
 
     def load_attractions(self) -> List[Dict]:
-        """Load attractions data with 15 international locations - ALL WITH PRICES"""
+        """Load attractions from the local catalog store"""
+        return load_catalog("attraction", 2, self.default_attractions)
+
+    def default_attractions(self) -> List[Dict]:
+        """Default attractions data with 15 international locations - ALL WITH PRICES"""
         attractions = [
             # Malaysian attractions - All with prices
             {
                 "id": 1, 
                 "name": "Petronas Twin Towers", 
+                "lat": 3.1579, "lon": 101.7116,
                 "location": "Kuala Lumpur, Malaysia",
                 "description": "Iconic twin skyscrapers with skybridge.", 
                 "category": "Landmark",
@@ -129,6 +132,7 @@ class AttractionApp:
             {
                 "id": 2, 
                 "name": "Batu Caves", 
+                "lat": 3.2379, "lon": 101.684,
                 "location": "Selangor, Malaysia",
                 "description": "Limestone hill with cave temples.", 
                 "category": "Religious",
@@ -149,6 +153,7 @@ class AttractionApp:
             {
                 "id": 3, 
                 "name": "Langkawi Sky Bridge", 
+                "lat": 6.386, "lon": 99.6616,
                 "location": "Langkawi, Malaysia",
                 "description": "Curved pedestrian bridge with stunning views.", 
                 "category": "Viewpoint",
@@ -169,6 +174,7 @@ class AttractionApp:
             {
                 "id": 4, 
                 "name": "Perhentian Islands", 
+                "lat": 5.908, "lon": 102.746,
                 "location": "Terengganu, Malaysia",
                 "description": "Tropical paradise with crystal clear waters.", 
                 "category": "Beach",
@@ -189,6 +195,7 @@ class AttractionApp:
             {
                 "id": 5, 
                 "name": "Penang Hill", 
+                "lat": 5.4246, "lon": 100.269,
                 "location": "Penang, Malaysia",
                 "description": "Hill resort with panoramic views.", 
                 "category": "Viewpoint",
@@ -209,6 +216,7 @@ class AttractionApp:
             {
                 "id": 6, 
                 "name": "Taman Negara", 
+                "lat": 4.385, "lon": 102.401,
                 "location": "Pahang, Malaysia",
                 "description": "Ancient tropical rainforest.", 
                 "category": "Nature",
@@ -229,6 +237,7 @@ class AttractionApp:
             {
                 "id": 7, 
                 "name": "Cameron Highlands", 
+                "lat": 4.4718, "lon": 101.3767,
                 "location": "Pahang, Malaysia",
                 "description": "Hill station with tea plantations.", 
                 "category": "Nature",
@@ -249,6 +258,7 @@ class AttractionApp:
             {
                 "id": 8, 
                 "name": "Malacca Historical Sites", 
+                "lat": 2.1944, "lon": 102.249,
                 "location": "Malacca, Malaysia",
                 "description": "UNESCO World Heritage city.", 
                 "category": "Historical",
@@ -271,6 +281,7 @@ class AttractionApp:
             {
                 "id": 9, 
                 "name": "Eiffel Tower", 
+                "lat": 48.8584, "lon": 2.2945,
                 "location": "Paris, France",
                 "description": "Iconic iron lattice tower on the Champ de Mars.", 
                 "category": "Landmark",
@@ -291,6 +302,7 @@ class AttractionApp:
             {
                 "id": 10, 
                 "name": "Great Wall of China", 
+                "lat": 40.4319, "lon": 116.5704,
                 "location": "Beijing, China",
                 "description": "Ancient fortification stretching over 13,000 miles.", 
                 "category": "Historical",
@@ -311,6 +323,7 @@ class AttractionApp:
             {
                 "id": 11, 
                 "name": "Statue of Liberty", 
+                "lat": 40.6892, "lon": -74.0445,
                 "location": "New York, USA",
                 "description": "Colossal neoclassical sculpture on Liberty Island.", 
                 "category": "Landmark",
@@ -331,6 +344,7 @@ class AttractionApp:
             {
                 "id": 12, 
                 "name": "Taj Mahal", 
+                "lat": 27.1751, "lon": 78.0421,
                 "location": "Agra, India",
                 "description": "White marble mausoleum built by Mughal emperor Shah Jahan.", 
                 "category": "Historical",
@@ -351,6 +365,7 @@ class AttractionApp:
             {
                 "id": 13, 
                 "name": "Sydney Opera House", 
+                "lat": -33.8568, "lon": 151.2153,
                 "location": "Sydney, Australia",
                 "description": "Multi-venue performing arts centre with unique architecture.", 
                 "category": "Landmark",
@@ -371,6 +386,7 @@ class AttractionApp:
             {
                 "id": 14, 
                 "name": "Colosseum", 
+                "lat": 41.8902, "lon": 12.4922,
                 "location": "Rome, Italy",
                 "description": "Ancient amphitheatre, the largest ever built.", 
                 "category": "Historical",
@@ -391,6 +407,7 @@ class AttractionApp:
             {
                 "id": 15, 
                 "name": "Mount Fuji", 
+                "lat": 35.3606, "lon": 138.7274,
                 "location": "Shizuoka, Japan",
                 "description": "Active volcano and Japan's highest mountain.", 
                 "category": "Nature",
@@ -413,7 +430,8 @@ class AttractionApp:
         # Add calculated fields for all attractions
         for attr in attractions:
             attr["popularity"] = random.uniform(3.5, 5.0)
-            attr["distance_km"] = random.randint(5, 500)  # Increased range for international
+            point = coordinates(attr)
+            attr["distance_km"] = round(haversine_km(HOME_COORDINATES, point)) if point else None
             attr["is_featured"] = attr["id"] in [1, 4, 8, 9, 12]  # Featured attractions
             
             # Ensure all required fields exist
@@ -680,6 +698,11 @@ class AttractionApp:
             self.profile_menu = None
         self.is_menu_open = False
 
+    def suspend(self):
+        """Called by the page router when another page replaces this one"""
+        if self.is_menu_open:
+            self.hide_profile_menu()
+
     def check_click_outside(self, event):
         """Check if click is outside menu"""
         if self.is_menu_open and hasattr(self, 'profile_menu') and self.profile_menu:
@@ -878,7 +901,7 @@ class AttractionApp:
         # All attractions tab
         all_frame = tk.Frame(notebook, bg=self.colors["light"])
         notebook.add(all_frame, text="🌍 All Attractions")
-        self.create_attractions_grid(all_frame, self.filtered_attractions)
+        self.all_attractions_grid = self.create_attractions_grid(all_frame, self.filtered_attractions)
         
         # Trending tab
         trend_frame = tk.Frame(notebook, bg=self.colors["light"])
@@ -905,76 +928,73 @@ class AttractionApp:
         self.create_attractions_grid(intl_frame, international)
     
     def create_attractions_grid(self, parent, attractions):
-        """Create grid of attraction cards matching car rental style"""
+        """Create virtualized grid of attraction cards matching car rental style"""
         # Header
         header = tk.Frame(parent, bg=self.colors["light"])
         header.pack(fill="x", pady=(0, 20))
         
-        tk.Label(header, text=f"{len(attractions)} Attractions",
-                font=("Segoe UI", 16, "bold"),
-                bg=self.colors["light"], fg=self.colors["primary"]).pack(side="left")
-        
-        # Grid container
-        grid_frame = tk.Frame(parent, bg=self.colors["light"])
-        grid_frame.pack(fill="both", expand=True)
-        
-        # Display attractions
-        if not attractions:
-            tk.Label(grid_frame, text="No attractions found",
-                    font=("Segoe UI", 14),
-                    bg=self.colors["light"], fg=self.colors["text_light"]).pack(expand=True)
+        count_label = tk.Label(header, text=f"{len(attractions)} Attractions",
+                              font=("Segoe UI", 16, "bold"),
+                              bg=self.colors["light"], fg=self.colors["primary"])
+        count_label.pack(side="left")
+        
+        # Only the rows in view get card widgets
+        grid = VirtualGrid(parent, self.build_attraction_card, self.fill_attraction_card,
+                           columns=3, row_height=470, padx=10, pady=10,
+                           bg=self.colors["light"], height=self.get_grid_height(),
+                           empty_text="No attractions found", empty_fg=self.colors["text_light"])
+        grid.pack(fill="both", expand=True)
+        grid.count_label = count_label
+        grid.set_items(attractions)
+        return grid
+    
+    def update_attractions_grid(self):
+        """Show filtered_attractions in the existing All tab, reusing its cards"""
+        grid = self.all_attractions_grid
+        if grid is None or not grid.canvas.winfo_exists():
+            self.show_attractions_page()
             return
-        
-        # Create 3-column grid
-        row, col = 0, 0
-        for attraction in attractions:
-            card = self.create_attraction_card(grid_frame, attraction)
-            card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-            grid_frame.grid_columnconfigure(col, weight=1)
-            
-            col += 1
-            if col == 3:
-                col = 0
-                row += 1
-        
-        # Configure grid rows
-        for i in range(row + 1):
-            grid_frame.grid_rowconfigure(i, weight=0)
+        grid.count_label.config(text=f"{len(self.filtered_attractions)} Attractions")
+        grid.set_items(self.filtered_attractions)
+    
+    def get_grid_height(self):
+        """Height of the card viewport inside the scrolling page"""
+        return max(500, self.root.winfo_screenheight() - 260)
     
     def create_attraction_card(self, parent, attraction):
         """Create a single attraction card matching car rental style"""
+        card = self.build_attraction_card(parent)
+        self.fill_attraction_card(card, attraction)
+        return card
+    
+    def build_attraction_card(self, parent):
+        """Build an empty attraction card whose widgets are filled by fill_attraction_card"""
         card = tk.Frame(parent, bg="white",
                        highlightbackground=self.colors["border"],
                        highlightthickness=1)
         
         # Image
-        photo = self.load_image(attraction["image_file"], (350, 180))
-        img_label = tk.Label(card, image=photo, bg="white")
-        img_label.image = photo
-        img_label.pack(fill="x")
+        card.image_label = tk.Label(card, bg="white")
+        card.image_label.pack(fill="x")
         
-        # Badges matching car rental style
-        if attraction.get("is_featured"):
-            tk.Label(card, text="⭐ Featured", font=("Segoe UI", 8, "bold"),
-                    bg=self.colors["warning"], fg="white", padx=6, pady=2).place(x=10, y=10)
-        
-        # Country flag indicator for international attractions
-        if attraction["id"] >= 9:  # International attractions
-            country = attraction["location"].split(", ")[-1]
-            flag_text = self.get_country_flag(country)
-            tk.Label(card, text=flag_text, font=("Segoe UI", 12),
-                    bg="white", fg=self.colors["primary"]).place(x=280, y=10)
+        # Badges matching car rental style (placed when needed)
+        card.featured_badge = tk.Label(card, text="⭐ Featured", font=("Segoe UI", 8, "bold"),
+                                       bg=self.colors["warning"], fg="white", padx=6, pady=2)
+        card.flag_label = tk.Label(card, font=("Segoe UI", 12),
+                                   bg="white", fg=self.colors["primary"])
         
         # Content
         content = tk.Frame(card, bg="white", padx=15, pady=15)
         content.pack(fill="both", expand=True)
         
         # Title and location
-        tk.Label(content, text=attraction["name"], font=("Segoe UI", 14, "bold"),
-                bg="white", fg=self.colors["dark"], wraplength=280).pack(anchor="w")
+        card.name_label = tk.Label(content, font=("Segoe UI", 14, "bold"),
+                                   bg="white", fg=self.colors["dark"], wraplength=280)
+        card.name_label.pack(anchor="w")
         
-        tk.Label(content, text=f"📍 {attraction['location']}", font=("Segoe UI", 10),
-                bg="white", fg=self.colors["text_light"]).pack(anchor="w", pady=(2, 10))
+        card.location_label = tk.Label(content, font=("Segoe UI", 10),
+                                       bg="white", fg=self.colors["text_light"])
+        card.location_label.pack(anchor="w", pady=(2, 10))
         
         # Rating stars matching car rental style
         rating_frame = tk.Frame(content, bg="white")
@@ -983,39 +1003,78 @@ class AttractionApp:
         stars_frame = tk.Frame(rating_frame, bg="white")
         stars_frame.pack(side="left")
         
-        rating = attraction["rating"]
+        card.star_labels = []
         for i in range(5):
-            star = "★" if i < int(rating) else "☆"
-            color = self.colors["secondary"] if i < int(rating) else "#e2e8f0"
-            tk.Label(stars_frame, text=star, font=("Segoe UI", 12),
-                    bg="white", fg=color).pack(side="left")
+            star = tk.Label(stars_frame, font=("Segoe UI", 12), bg="white")
+            star.pack(side="left")
+            card.star_labels.append(star)
         
-        tk.Label(rating_frame, text=f" {rating:.1f}", font=("Segoe UI", 11, "bold"),
-                bg="white", fg=self.colors["dark"]).pack(side="left", padx=(5, 10))
+        card.rating_label = tk.Label(rating_frame, font=("Segoe UI", 11, "bold"),
+                                     bg="white", fg=self.colors["dark"])
+        card.rating_label.pack(side="left", padx=(5, 10))
         
-        tk.Label(rating_frame, text=f"({attraction['reviews']:,})", font=("Segoe UI", 10),
-                bg="white", fg=self.colors["text_light"]).pack(side="left")
+        card.reviews_label = tk.Label(rating_frame, font=("Segoe UI", 10),
+                                      bg="white", fg=self.colors["text_light"])
+        card.reviews_label.pack(side="left")
         
-        # Price and duration - REMOVED FREE CHECK
+        # Price and duration
         info_frame = tk.Frame(content, bg="white")
         info_frame.pack(fill="x", pady=(10, 0))
         
-        tk.Label(info_frame, text=f"RM {attraction['price']}", font=("Segoe UI", 16, "bold"),
-                bg="white", fg=self.colors["secondary"]).pack(side="left")
+        card.price_label = tk.Label(info_frame, font=("Segoe UI", 16, "bold"),
+                                    bg="white", fg=self.colors["secondary"])
+        card.price_label.pack(side="left")
         
-        tk.Label(info_frame, text=f"⏱️ {attraction['duration']}", font=("Segoe UI", 10),
-                bg="white", fg=self.colors["text_light"]).pack(side="right")
+        card.duration_label = tk.Label(info_frame, font=("Segoe UI", 10),
+                                       bg="white", fg=self.colors["text_light"])
+        card.duration_label.pack(side="right")
         
         # View Details button - Matching car rental style
-        tk.Button(content, text="View Details",
-                 font=("Segoe UI", 11),
-                 bg=self.colors["secondary"], fg=self.colors["light"],
-                 relief="flat", cursor="hand2",
-                 command=lambda a=attraction: self.show_detail_page(a),
-                 padx=15, pady=8).pack(fill="x", pady=(15, 0))
+        card.details_button = tk.Button(content, text="View Details",
+                                        font=("Segoe UI", 11),
+                                        bg=self.colors["secondary"], fg=self.colors["light"],
+                                        relief="flat", cursor="hand2",
+                                        padx=15, pady=8)
+        card.details_button.pack(fill="x", pady=(15, 0))
         
         return card
     
+    def fill_attraction_card(self, card, attraction):
+        """Show attraction in an existing attraction card"""
+        # Image: placeholder first, decoded in the background by the image service
+        photo = self.get_placeholder_image((350, 180))
+        card.image_label.config(image=photo)
+        card.image_label.image = photo
+        load_photo_async(card.image_label, self.resolve_image_path(attraction["image_file"]), (350, 180))
+        
+        if attraction.get("is_featured"):
+            card.featured_badge.place(x=10, y=10)
+        else:
+            card.featured_badge.place_forget()
+        
+        # Country flag indicator for international attractions
+        if attraction["id"] >= 9:  # International attractions
+            country = attraction["location"].split(", ")[-1]
+            card.flag_label.config(text=self.get_country_flag(country))
+            card.flag_label.place(x=280, y=10)
+        else:
+            card.flag_label.place_forget()
+        
+        card.name_label.config(text=attraction["name"])
+        card.location_label.config(text=f"📍 {attraction['location']}")
+        
+        rating = attraction["rating"]
+        for i, star in enumerate(card.star_labels):
+            filled = i < int(rating)
+            star.config(text="★" if filled else "☆",
+                        fg=self.colors["secondary"] if filled else "#e2e8f0")
+        card.rating_label.config(text=f" {rating:.1f}")
+        card.reviews_label.config(text=f"({attraction['reviews']:,})")
+        
+        card.price_label.config(text=f"RM {attraction['price']}")
+        card.duration_label.config(text=f"⏱️ {attraction['duration']}")
+        card.details_button.config(command=lambda a=attraction: self.show_detail_page(a))
+    
     def get_country_flag(self, country):
         """Get emoji flag for country"""
         flag_map = {
@@ -1031,62 +1090,42 @@ class AttractionApp:
         return flag_map.get(country, "🌐")
     
     # ==================== IMAGE HANDLING ====================
+    def resolve_image_path(self, file_path: str):
+        """Find the local file for an attraction image, or None if missing"""
+        filename = os.path.basename(file_path)
+        return get_image_service().find_image([
+            file_path,
+            f"images/attractions/{filename}",
+            f"./{filename}",
+            f"./attractions/{filename}",
+        ])
+    
     def load_image(self, file_path: str, size: Tuple[int, int] = (300, 200)) -> ImageTk.PhotoImage:
-        """Load image from local file with enhanced error handling"""
-        cache_key = f"{file_path}_{size[0]}_{size[1]}"
-        if cache_key in self.image_cache:
-            self.image_cache[cache_key]["last_used"] = time.time()
-            return self.image_cache[cache_key]["image"]
-        
-        try:
-            # Try to load from local file
-            if os.path.exists(file_path):
-                image = Image.open(file_path)
-            else:
-                # If file doesn't exist, check in images/attractions folder
-                filename = os.path.basename(file_path)
-                alternative_path = f"images/attractions/{filename}"
-                
-                if os.path.exists(alternative_path):
-                    image = Image.open(alternative_path)
-                else:
-                    # Try to find the file with different path combinations
-                    search_paths = [
-                        file_path,
-                        alternative_path,
-                        f"./{filename}",
-                        f"./attractions/{filename}",
-                    ]
-                    
-                    found = False
-                    for path in search_paths:
-                        if os.path.exists(path):
-                            image = Image.open(path)
-                            found = True
-                            break
-                    
-                    if not found:
-                        raise FileNotFoundError(f"Image file not found: {file_path}")
-            
-            image = image.convert('RGB')
-            image = image.resize(size, Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(image)
-            self.image_cache[cache_key] = {"image": photo, "last_used": time.time()}
-            return photo
-            
-        except Exception as e:
-            print(f"Error loading image {file_path}: {e}")
-            # Create placeholder image
-            placeholder = Image.new('RGB', size, (245, 247, 250))
-            draw = ImageDraw.Draw(placeholder)
-            draw.rectangle([0, 0, size[0]-1, size[1]-1], outline=(229, 231, 235), width=1)
-            draw.text((size[0]//2, size[1]//2), "Image\nNot Found", 
-                     fill=(156, 163, 175), anchor="mm", align="center")
-            photo = ImageTk.PhotoImage(placeholder)
-            
-            # Cache the placeholder too
-            self.image_cache[cache_key] = {"image": photo, "last_used": time.time()}
+        """Load image from local file through the shared image service"""
+        image_path = self.resolve_image_path(file_path)
+        photo = load_photo(image_path, size) if image_path else None
+        if photo is not None:
             return photo
+        
+        if image_path is None:
+            print(f"Error loading image {file_path}: Image file not found")
+        return self.get_placeholder_image(size)
+    
+    def get_placeholder_image(self, size: Tuple[int, int]) -> ImageTk.PhotoImage:
+        """Placeholder shown while an image loads or when it is missing"""
+        # Placeholders are cheap, keep them per window
+        cache_key = f"placeholder_{size[0]}_{size[1]}"
+        if cache_key in self.image_cache:
+            return self.image_cache[cache_key]
+        
+        placeholder = Image.new('RGB', size, (245, 247, 250))
+        draw = ImageDraw.Draw(placeholder)
+        draw.rectangle([0, 0, size[0]-1, size[1]-1], outline=(229, 231, 235), width=1)
+        draw.text((size[0]//2, size[1]//2), "Image\nNot Found", 
+                 fill=(156, 163, 175), anchor="mm", align="center")
+        photo = ImageTk.PhotoImage(placeholder)
+        self.image_cache[cache_key] = photo
+        return photo
     
     # ==================== FILTER FUNCTIONS ====================
     def on_price_change(self, value):
@@ -1112,6 +1151,29 @@ class AttractionApp:
             self.root.after_cancel(self._search_timer)
         self._search_timer = self.root.after(300, self.filter_attractions)
     
+    def build_attraction_index(self):
+        """Index the numeric attraction fields used by filters and sorting"""
+        return CatalogIndex(
+            self.attractions,
+            columns={
+                "price": lambda a: a["price"],
+                "rating": lambda a: a["rating"],
+                "popularity": lambda a: a.get("popularity", 0),
+            },
+            sort_keys={"price": "price", "rating": "rating", "popularity": "popularity"},
+            groups={"category": lambda a: a["category"]},
+        )
+    
+    def build_attraction_search(self):
+        """Full-text index over the fields the search box looks at"""
+        return SearchIndex(self.attractions, fields=[
+            (lambda a: a["name"], 3),
+            (lambda a: a["location"], 2),
+            (lambda a: a["category"], 2),
+            (lambda a: " ".join(a.get("tags", [])), 2),
+            (lambda a: a["description"], 1),
+        ])
+    
     def filter_attractions(self, *args):
         """Filter attractions based on criteria"""
         # Get filter values
@@ -1123,46 +1185,31 @@ class AttractionApp:
         # Get selected categories
         selected_categories = [cat for cat, var in self.category_vars.items() if var.get()]
         
-        # Apply filters
-        filtered = []
-        for attr in self.attractions:
-            # Price filter
-            if not (min_price <= attr["price"] <= max_price):
-                continue
-            
-            # Rating filter
-            if attr["rating"] < min_rating:
-                continue
-            
-            # Category filter
-            if attr["category"] not in selected_categories:
-                continue
-            
-            # Search filter
-            if search_text and search_text != "search attractions...":
-                search_match = (search_text in attr["name"].lower() or
-                              search_text in attr["location"].lower() or
-                              search_text in attr["description"].lower() or
-                              search_text in attr["category"].lower() or
-                              search_text in " ".join(attr.get("tags", [])).lower())
-                if not search_match:
-                    continue
-            
-            filtered.append(attr)
-        
-        # Sort
-        sort_by = self.sort_var.get()
-        if sort_by == "popularity":
-            filtered.sort(key=lambda x: x.get("popularity", 0), reverse=True)
-        elif sort_by == "rating_desc":
-            filtered.sort(key=lambda x: x["rating"], reverse=True)
-        elif sort_by == "price_asc":
-            filtered.sort(key=lambda x: x["price"])
-        elif sort_by == "price_desc":
-            filtered.sort(key=lambda x: x["price"], reverse=True)
+        # Search filter
+        matches = None
+        if search_text != "search attractions...":
+            matches = self.attraction_search.positions(search_text)
+        
+        # Sort option -> (index sort key, descending)
+        sort_options = {
+            "popularity": ("popularity", True),
+            "rating_desc": ("rating", True),
+            "price_asc": ("price", False),
+            "price_desc": ("price", True),
+        }
+        sort_by, descending = sort_options.get(self.sort_var.get(), (None, False))
+        
+        # Apply price, rating and category filters on the index
+        filtered = self.attraction_index.select(
+            ranges={"price": (min_price, max_price), "rating": (min_rating, None)},
+            equals={"category": set(selected_categories)},
+            within=matches,
+            sort_by=sort_by,
+            reverse=descending,
+        )
         
         self.filtered_attractions = filtered
-        self.show_attractions_page()  # Refresh display
+        self.update_attractions_grid()  # Refresh display
         
         # Update status
         self.set_status(f"Found {len(filtered)} attractions", "success")
@@ -1202,17 +1249,9 @@ class AttractionApp:
         if script_file == "attraction.py":  # Already on attractions page
             return
         
-        if os.path.exists(script_file):
+        if script_file in SCRIPTS:
             try:
-                session_data = {
-                    'email': self.email,
-                    'user_name': self.user_name
-                }
-                with open('user_session.json', 'w') as f:
-                    json.dump(session_data, f)
-                
-                self.root.destroy()
-                subprocess.Popen(["python", script_file])
+                navigate(script_file, self.email, self.user_name)
             except Exception as e:
                 messagebox.showerror("Error", f"Cannot open {script_file}: {str(e)}")
         else:
@@ -1228,32 +1267,19 @@ class AttractionApp:
                 if field not in attraction:
                     attraction[field] = "Not specified"
             
-            # Close current window
-            self.root.destroy()
-            
-            # Import and open attraction_detail.py
-            import attraction_detail
-            root = tk.Tk()
-            app = attraction_detail.AttractionDetailApp(root, attraction, self.email)
-            root.mainloop()
+            # Open attraction_detail.py in the same window
+            get_router().show("attraction_detail", attraction, self.email)
             
         except ImportError as e:
-            # If attraction_detail.py doesn't exist, reopen attractions page
+            # If attraction_detail.py doesn't exist, stay on the attractions page
             print(f"Error: {e}")
             
-            # Reopen attractions page
-            root = tk.Tk()
-            app = AttractionApp(root, self.email)
-            root.mainloop()
-            
         except Exception as e:
             # Handle any other errors
             print(f"Error opening detail page: {e}")
             
             # Reopen attractions page
-            root = tk.Tk()
-            app = AttractionApp(root, self.email)
-            root.mainloop()
+            get_router().show("attraction", self.email)
     
     # ==================== UTILITY FUNCTIONS ====================
     def set_status(self, message: str, status_type: str = "info"):
@@ -1269,22 +1295,27 @@ class AttractionApp:
         return "break"
     
     def on_mousewheel(self, event):
-        """Handle mouse wheel scrolling"""
+        """Handle mouse wheel scrolling for the canvas under the cursor"""
+        canvas = self.canvas
+        widget = self.root.winfo_containing(event.x_root, event.y_root)
+        while widget is not None:
+            if isinstance(widget, tk.Canvas):
+                canvas = widget
+                break
+            widget = widget.master
+        
         if event.delta > 0:
-            self.canvas.yview_scroll(-1, "units")
+            canvas.yview_scroll(-1, "units")
         else:
-            self.canvas.yview_scroll(1, "units")
+            canvas.yview_scroll(1, "units")
 
 def main():
-    root = tk.Tk()
     if len(sys.argv) > 2:
         email = sys.argv[1]
         user_name = sys.argv[2]
-        app = AttractionApp(root, email)
+        run("attraction", email)
     else:
-        app = AttractionApp(root, "user@example.com")
-    
-    root.mainloop()
+        run("attraction", "user@example.com")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
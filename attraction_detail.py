@@ -4,10 +4,12 @@ from PIL import Image, ImageTk, ImageDraw
 import io
 from datetime import datetime, timedelta
 import os
-import time
 import webbrowser
 import random
-import gc
+from booking_dates import normalize_dates
+from booking_record import BookingRecord
+from image_service import load_photo
+from page_router import get_router
 
 class CalendarPopup:
     def __init__(self, parent, callback, initial_date=None):
@@ -874,36 +876,25 @@ class AttractionDetailApp:
                 bg=self.colors["footer_bg"], fg=self.colors["footer_text"]).pack()
     
     def load_image(self, url: str, size: tuple = (300, 200)) -> ImageTk.PhotoImage:
-        """Load image from local file"""
-        cache_key = f"{url}_{size[0]}_{size[1]}"
-        if cache_key in self.image_cache:
-            self.image_cache[cache_key]["last_used"] = time.time()
-            return self.image_cache[cache_key]["image"]
-        
-        try:
-            # Try as local file
-            if os.path.exists(url):
-                image = Image.open(url)
-            else:
-                raise FileNotFoundError(f"File not found: {url}")
-            
-            image = image.convert('RGB')
-            image = image.resize(size, Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(image)
-            self.image_cache[cache_key] = {"image": photo, "last_used": time.time()}
-            return photo
-            
-        except Exception:
-            # Create placeholder image
-            placeholder = Image.new('RGB', size, (245, 247, 250))
-            draw = ImageDraw.Draw(placeholder)
-            draw.rectangle([0, 0, size[0]-1, size[1]-1], outline=(229, 231, 235), width=1)
-            draw.text((size[0]//2, size[1]//2), "Image\nNot Found", 
-                     fill=(156, 163, 175), anchor="mm", align="center")
-            photo = ImageTk.PhotoImage(placeholder)
-            
-            self.image_cache[cache_key] = {"image": photo, "last_used": time.time()}
+        """Load image from local file through the shared image service"""
+        photo = load_photo(url, size) if url and os.path.exists(url) else None
+        if photo is not None:
             return photo
+        
+        cache_key = f"placeholder_{size[0]}_{size[1]}"
+        if cache_key in self.image_cache:
+            return self.image_cache[cache_key]
+        
+        # Create placeholder image
+        placeholder = Image.new('RGB', size, (245, 247, 250))
+        draw = ImageDraw.Draw(placeholder)
+        draw.rectangle([0, 0, size[0]-1, size[1]-1], outline=(229, 231, 235), width=1)
+        draw.text((size[0]//2, size[1]//2), "Image\nNot Found", 
+                 fill=(156, 163, 175), anchor="mm", align="center")
+        photo = ImageTk.PhotoImage(placeholder)
+        
+        self.image_cache[cache_key] = photo
+        return photo
     
     def open_booking_detail(self):
         """Open booking detail page with booking information"""
@@ -947,6 +938,7 @@ class AttractionDetailApp:
                 "tickets": ticket_count,
                 "ticket_price": str(unit_price),
                 "total_price": str(total_price),
+                "pricing": BookingRecord("attraction", unit_price, ticket_count, total=total_price).to_dict(),
                 "image_file": self.attraction.get("image_file", ""),
                 "category": self.attraction.get("category", ""),
                 "duration": self.attraction.get("duration", ""),
@@ -958,30 +950,18 @@ class AttractionDetailApp:
                 "phone": "",  # Will be filled in booking form
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
+            normalize_dates(booking_details, "attraction")
             
-            # Store the current root reference
-            current_root = self.root
-            
-            # Clean up image cache to prevent memory issues
-            self.image_cache.clear()
-            
-            # Force garbage collection
-            gc.collect()
-            
-            # Destroy current window
-            current_root.destroy()
-            
-            # Import and create booking detail window
+            # Open the booking detail window over this page
             try:
                 import booking_detail
-                booking_root = tk.Tk()
-                booking_root.title("Booking Confirmation - Traney")
-                booking_root.geometry("900x700")
-                booking_root.configure(bg="#f8fafc")
+                booking_window = tk.Toplevel(self.root)
+                booking_window.title("Booking Confirmation - Traney")
+                booking_window.geometry("900x700")
+                booking_window.configure(bg="#f8fafc")
                 
                 # Create booking detail app
-                booking_detail.BookingDetailApp(booking_root, booking_details, self.email)
-                booking_root.mainloop()
+                booking_detail.BookingDetailApp(booking_window, booking_details, self.email)
             except ImportError as ie:
                 messagebox.showerror("Error", f"Booking module not found: {ie}")
                 # Try to go back to attractions page
@@ -1004,25 +984,9 @@ class AttractionDetailApp:
             # Clean up all image references
             self.image_cache.clear()
             
-            # Force garbage collection
-            gc.collect()
-            
-            # Destroy the current window
-            self.root.quit()
-            self.root.destroy()
-            
-            # Start fresh attractions window
-            import attraction
-            import tkinter as tk
-            
-            root = tk.Tk()
-            root.attributes('-fullscreen', True)
-            
-            # Force another garbage collection
-            gc.collect()
-            
-            app = attraction.AttractionApp(root, self.email)
-            root.mainloop()
+            # The attractions page was suspended when this page opened; showing
+            # it again resumes it with its scroll position and filters intact
+            get_router().show("attraction", self.email)
             
         except Exception as e:
             print(f"Error in go_back: {e}")
@@ -0,0 +1,283 @@
+"""Filter, sort and render latency of the listing pages on large catalogs.
+
+Synthetic catalogs of hotels, attractions, cars and flights are generated
+from each page's own default items, so every field the filters read has
+the same type and format as in the app. For every page and size the
+benchmark times, separately:
+
+    index    building the page's CatalogIndex (and SearchIndex)
+    filter   CatalogIndex.select_positions() with the page's default filters
+    sort     ordering the matches by the page's default sort
+    search   SearchIndex.positions() for a two-word query (attractions, cars)
+    scan     the same filter and sort as a plain list scan, for comparison
+    render   handing the result to the page's grid until it is laid out
+             (only with --render, which needs a display)
+
+    python benchmarks/filter_sort.py --sizes 1000 10000 100000 --json filter_sort.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from attraction import AttractionApp  # noqa: E402
+from car_rental import CarRentalApp  # noqa: E402
+from flight import Flight  # noqa: E402
+from hotel import HOTEL_DATA, Hotel  # noqa: E402
+
+SEED = 20240601
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def timed(function, repeat):
+    """Run function repeat times; returns (last result, samples in ms)"""
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, samples
+
+
+def bare_page(page_class):
+    """A page instance without its window, for the methods that only touch data"""
+    return page_class.__new__(page_class)
+
+
+# ==================== SYNTHETIC CATALOGS ====================
+def replicate(templates, size, vary):
+    """size items copied round-robin from templates, each changed by vary(item, i, rng)"""
+    rng = random.Random(SEED)
+    items = []
+    for i in range(size):
+        item = dict(templates[i % len(templates)])
+        vary(item, i, rng)
+        items.append(item)
+    return items
+
+
+def hotel_catalog(size):
+    page = bare_page(Hotel)
+    templates = [page.convert_city_hotel_format(hotel)
+                 for hotels in HOTEL_DATA["cities"].values() for hotel in hotels]
+    categories = ["City Hotel", "Resort", "Boutique", "Budget", "Business"]
+
+    def vary(hotel, i, rng):
+        price = rng.randint(80, 2500)
+        hotel.update(id=i, name=f"{hotel['name']} {i}", price=price, discount_price=price,
+                     original_price=price * 1.2, total_price=price * 1.1,
+                     rating=round(rng.uniform(5.0, 10.0), 1), stars="★" * rng.randint(1, 5),
+                     category=rng.choice(categories))
+    return replicate(templates, size, vary)
+
+
+def attraction_catalog(size):
+    templates = bare_page(AttractionApp).default_attractions()
+    categories = sorted({a["category"] for a in templates})
+
+    def vary(attraction, i, rng):
+        attraction.update(id=i, name=f"{attraction['name']} {i}", price=rng.randint(0, 600),
+                          rating=round(rng.uniform(3.0, 5.0), 1), popularity=rng.randint(0, 100),
+                          reviews=rng.randint(0, 50000), category=rng.choice(categories))
+    return replicate(templates, size, vary)
+
+
+def car_catalog(size):
+    templates = bare_page(CarRentalApp).default_cars()
+    categories = sorted({c["category"] for c in templates})
+
+    def vary(car, i, rng):
+        rate = rng.randint(40, 900)
+        car.update(id=i, name=f"{car['name']} {i}", daily_rate=rate, price=rate, weekly_rate=rate * 6,
+                   rating=round(rng.uniform(3.0, 5.0), 1), popularity=rng.randint(0, 100),
+                   category=rng.choice(categories))
+    return replicate(templates, size, vary)
+
+
+def flight_catalog(size):
+    page = bare_page(Flight)
+    page.flight_data = page.get_default_flight_data()
+    templates = page.get_all_flights()
+
+    def vary(flight, i, rng):
+        departure = rng.randint(0, 23 * 60)
+        minutes = rng.randint(45, 18 * 60)
+        arrival = (departure + minutes) % (24 * 60)
+        flight.update(id=f"SYN{i:06d}", price=f"RM {rng.randint(150, 6000):,}",
+                      duration=f"{minutes // 60}h {minutes % 60:02d}m",
+                      time=f"{departure // 60:02d}:{departure % 60:02d} - {arrival // 60:02d}:{arrival % 60:02d}",
+                      stops=rng.choice(["Non-stop", "1 stop", "2 stops"]))
+    return replicate(templates, size, vary)
+
+
+# ==================== PAGES ====================
+# Each page: how to build its indexes on a catalog, the select_positions()
+# arguments and sort of its default filters, and the equivalent list scan.
+def hotel_case(items):
+    page = bare_page(Hotel)
+    page.hotels = items
+
+    def scan():
+        matches = [h for h in items if h["price"] <= 1000 and h["rating"] >= 7.0]
+        return sorted(matches, key=lambda h: h["rating"], reverse=True)
+    return {
+        "build": lambda: {"index": page.build_hotel_index()},
+        "filter": {"ranges": {"price": (None, 1000), "rating": (7.0, None)}},
+        "sort": ("rating", True),
+        "scan": scan,
+    }
+
+
+def attraction_case(items):
+    page = bare_page(AttractionApp)
+    page.attractions = items
+    categories = {a["category"] for a in items}
+
+    def scan():
+        matches = [a for a in items
+                   if 0 <= a["price"] <= 500 and a["rating"] >= 4.0 and a["category"] in categories]
+        return sorted(matches, key=lambda a: a.get("popularity", 0), reverse=True)
+    return {
+        "build": lambda: {"index": page.build_attraction_index(), "search": page.build_attraction_search()},
+        "filter": {"ranges": {"price": (0, 500), "rating": (4.0, None)},
+                   "equals": {"category": categories}},
+        "sort": ("popularity", True),
+        "search": "twin towers",
+        "scan": scan,
+    }
+
+
+def car_case(items):
+    page = bare_page(CarRentalApp)
+    page.cars = items
+
+    def scan():
+        matches = [c for c in items if 50 <= c["daily_rate"] <= 500 and c["rating"] >= 4.0]
+        return sorted(matches, key=lambda c: c.get("popularity", 0), reverse=True)
+    return {
+        "build": lambda: {"index": page.build_car_index(), "search": page.build_car_search()},
+        "filter": {"ranges": {"daily_rate": (50, 500), "rating": (4.0, None)}},
+        "sort": ("popularity", True),
+        "search": "honda city",
+        "scan": scan,
+    }
+
+
+def flight_case(items):
+    page = bare_page(Flight)
+
+    def build():
+        page.current_displayed_flights = items
+        page.flight_index = page.flight_index_source = None
+        return {"index": page.get_flight_index()}
+
+    def scan():
+        matches = [f for f in items if page.parse_price(f["price"]) <= 2000]
+        return sorted(matches, key=lambda f: page.parse_price(f["price"]))
+    return {
+        "build": build,
+        "filter": {"ranges": {"price": (None, 2000)}, "keep_missing": ("hour",)},
+        "sort": ("price", False),
+        "scan": scan,
+    }
+
+
+PAGES = {
+    "hotel": (hotel_catalog, hotel_case),
+    "attraction": (attraction_catalog, attraction_case),
+    "car_rental": (car_catalog, car_case),
+    "flight": (flight_catalog, flight_case),
+}
+
+
+def show_result(name, page, result):
+    """Put a filtered result on a live page the way its filter method does"""
+    if name == "hotel":
+        page.filtered_hotels = result
+        page.display_hotels_grid_optimized()
+    elif name == "attraction":
+        page.filtered_attractions = result
+        page.update_attractions_grid()
+    elif name == "car_rental":
+        page.filtered_cars = result
+        page.update_cars_grid()
+    else:
+        page.display_flights(result)
+
+
+def measure_render(name, result, repeat):
+    """Render timings of result on the real page, built through the router"""
+    from page_router import get_router
+
+    router = get_router()
+    router.root.withdraw()
+    page = router.show(name, "benchmark@example.com")
+
+    def render():
+        # Alternate with an empty result so every run lays out the cards again
+        show_result(name, page, [])
+        router.root.update_idletasks()
+        start = time.perf_counter()
+        show_result(name, page, result)
+        router.root.update_idletasks()
+        return (time.perf_counter() - start) * 1000
+    samples = [render() for _ in range(repeat)]
+    router.leave()
+    return samples
+
+
+def measure(name, size, repeat, render):
+    make_catalog, make_case = PAGES[name]
+    items = make_catalog(size)
+    case = make_case(items)
+
+    samples = {}
+    built, samples["index"] = timed(case["build"], max(1, repeat // 5))
+    index = built["index"]
+    positions, samples["filter"] = timed(lambda: index.select_positions(**case["filter"]), repeat)
+    ordered, samples["sort"] = timed(lambda: index.order_positions(positions, *case["sort"]), repeat)
+    if "search" in case:
+        _, samples["search"] = timed(lambda: built["search"].positions(case["search"]), repeat)
+    _, samples["scan"] = timed(case["scan"], repeat)
+    if render:
+        result = [index.items[i] for i in ordered]
+        samples["render"] = measure_render(name, result, max(1, repeat // 5))
+    return len(positions), samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=list(PAGES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20, help="runs per operation")
+    parser.add_argument("--render", action="store_true", help="also time rendering (needs a display)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'page':<12}{'items':>8}{'matches':>9}  {'operation':<8}{'p50 ms':>10}{'p95 ms':>10}")
+    for name in args.pages:
+        for size in args.sizes:
+            matches, samples = measure(name, size, args.repeat, args.render)
+            for operation, times in samples.items():
+                p50, p95 = statistics.median(times), percentile(times, 0.95)
+                print(f"{name:<12}{size:>8}{matches:>9}  {operation:<8}{p50:>10.2f}{p95:>10.2f}")
+                results.append({"page": name, "items": size, "matches": matches, "operation": operation,
+                                "p50_ms": p50, "p95_ms": p95, "runs": len(times)})
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"repeat": args.repeat, "seed": SEED, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
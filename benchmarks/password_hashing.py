@@ -0,0 +1,74 @@
+"""Login latency of the password hasher for a range of cost settings.
+
+Each setting hashes a password once and then times verify(), which is the
+work a login does. Pick the strongest setting whose p95 stays under the UI
+latency budget on the machine the app runs on:
+
+    python benchmarks/password_hashing.py --budget-ms 250 --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import PasswordHasher  # noqa: E402
+
+SETTINGS = [
+    ("scrypt", {"n": 2 ** 12}),
+    ("scrypt", {"n": 2 ** 13}),
+    ("scrypt", {"n": 2 ** 14}),
+    ("scrypt", {"n": 2 ** 15}),
+    ("scrypt", {"n": 2 ** 16}),
+    ("pbkdf2_sha256", {"iterations": 100_000}),
+    ("pbkdf2_sha256", {"iterations": 300_000}),
+    ("pbkdf2_sha256", {"iterations": 600_000}),
+    ("pbkdf2_sha256", {"iterations": 1_200_000}),
+]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(algorithm, params, repeat):
+    """Verify timings in milliseconds for one setting"""
+    hasher = PasswordHasher(algorithm, **params)
+    stored = hasher.hash("correct horse battery staple")
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hasher.verify("correct horse battery staple", stored)
+        samples.append((time.perf_counter() - start) * 1000)
+    return hasher.algorithm, samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="verifications per setting")
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="login latency budget")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'algorithm':<15}{'cost':<22}{'p50 ms':>10}{'p95 ms':>10}  budget")
+    for algorithm, params in SETTINGS:
+        used, samples = measure(algorithm, params, args.repeat)
+        p50, p95 = statistics.median(samples), percentile(samples, 0.95)
+        cost = ", ".join(f"{key}={value}" for key, value in params.items())
+        within = p95 <= args.budget_ms
+        print(f"{used:<15}{cost:<22}{p50:>10.1f}{p95:>10.1f}  {'ok' if within else 'over'}")
+        results.append({"algorithm": used, "params": params, "p50_ms": p50, "p95_ms": p95,
+                        "within_budget": within})
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"budget_ms": args.budget_ms, "repeat": args.repeat, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
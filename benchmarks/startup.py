@@ -0,0 +1,252 @@
+"""Time to interactive, widget count and peak memory of every page.
+
+Each page is built in a fresh interpreter, under a withdrawn Tk root, with
+fixture data, so every run pays the same imports and starts from the same
+memory. time_to_interactive_ms runs from before the page module is
+imported until update_idletasks() has finished laying the page out.
+
+The runs work on a copy of the app in a temporary directory, without its
+databases, caches and session, so a benchmark never touches the real
+stores. The first run seeds the copy's stores like a first start of the
+app does, which the medians absorb from --repeat 3 up.
+Without a display, an Xvfb server is started for the run (Linux).
+
+    python benchmarks/startup.py --repeat 5 --json startup.json
+
+Compare two commits by diffing their JSON files.
+"""
+import argparse
+import importlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+EMAIL = "benchmark@example.com"
+USER_NAME = "Benchmark User"
+
+ITINERARY = {
+    "destination": "Kuala Lumpur, Malaysia",
+    "start_date": "03/02/26",
+    "end_date": "03/06/26",
+    "days": 5,
+    "travelers": 2,
+    "budget": "Medium (RM 1,000 - 3,000)",
+    "travel_styles": ["Cultural", "Foodie"],
+    "transportation": "Mix of All",
+    "plan_id": "PLAN_BENCHMARK",
+}
+
+BOOKING = {
+    "booking_id": "BK100000",
+    "booking_type": "attraction",
+    "status": "pending",
+    "attraction_name": "Petronas Twin Towers",
+    "attraction_location": "Kuala Lumpur",
+    "attraction_id": 1,
+    "date": "2026-03-02",
+    "time_slot": "Any time",
+    "tickets": 2,
+    "ticket_price": "80.00",
+    "total_price": "160.00",
+    "user_email": EMAIL,
+    "customer_name": USER_NAME,
+    "phone": "",
+    "timestamp": "2026-03-01 09:00:00",
+}
+
+# Files of the checkout that are left out of the benchmark copy: stores and
+# caches the app writes, so every benchmark starts from the built-in data
+GENERATED = (".git", "__pycache__", ".cache", "*.db", "*.db-wal", "*.db-shm", "*.lock", "*.tmp",
+             "*.corrupt", "user_session.json")
+
+# Name -> (module, class, how it is opened, constructor args after the window).
+# "router" pages are shown through the PageRouter like in the app; "window"
+# pages get their own Toplevel, as travel_plan.py and the listings open them.
+PAGES = {
+    "home": ("home", "HomeApp", "router", (EMAIL, USER_NAME)),
+    "hotel": ("hotel", "Hotel", "router", (EMAIL,)),
+    "attraction": ("attraction", "AttractionApp", "router", (EMAIL,)),
+    "car_rental": ("car_rental", "CarRentalApp", "router", (EMAIL,)),
+    "flight": ("flight", "Flight", "router", (EMAIL,)),
+    "packing": ("packing", "PackingApp", "router", (EMAIL,)),
+    "travel_plan": ("travel_plan", "Enhancedtravel_plan", "router", (EMAIL,)),
+    "travel_detail": ("travel_detail", "TravelDetail", "window", (ITINERARY, {}, EMAIL)),
+    "booking_detail": ("booking_detail", "BookingDetailApp", "window", (BOOKING, EMAIL, "attraction")),
+}
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KiB, or None where unsupported"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(name):
+    """Build page name once in this process and return its measurements"""
+    import tkinter as tk
+    from page_router import get_router
+
+    module_name, class_name, opened_as, args = PAGES[name]
+    router = get_router()
+    router.root.withdraw()
+    router.root.update_idletasks()
+    rss_before = peak_rss_kb()
+
+    started = time.perf_counter()
+    page_class = getattr(importlib.import_module(module_name), class_name)
+    imported = time.perf_counter()
+    if opened_as == "router":
+        router.show(name, *args)
+    else:
+        window = tk.Toplevel(router.root)
+        window.withdraw()
+        page_class(window, *args)
+    router.root.update_idletasks()
+    ready = time.perf_counter()
+
+    result = {
+        "import_ms": (imported - started) * 1000,
+        "build_ms": (ready - imported) * 1000,
+        "time_to_interactive_ms": (ready - started) * 1000,
+        "widgets": count_widgets(router.root) - 1,
+        "peak_rss_kb": peak_rss_kb(),
+        "baseline_rss_kb": rss_before,
+    }
+    router.root.destroy()
+    return result
+
+
+def start_xvfb():
+    """Start an Xvfb server on a free display; returns (process, display) or None"""
+    if not sys.platform.startswith("linux") or not shutil.which("Xvfb"):
+        return None
+    for number in range(99, 120):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            continue
+        display = f":{number}"
+        process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(50):
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                return process, display
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+        process.kill()
+    return None
+
+
+def copy_app(target):
+    """Copy the app into target with fixture data in place of its stores; returns target"""
+    shutil.copytree(REPO_DIR, target, ignore=shutil.ignore_patterns(*GENERATED), dirs_exist_ok=True)
+    with open(os.path.join(target, "user_session.json"), "w", encoding="utf-8") as f:
+        json.dump({"email": EMAIL, "user_name": USER_NAME}, f)
+    return target
+
+
+def run_page(name, app_dir, env, timeout):
+    """Measure page name in a fresh interpreter, on the app copy in app_dir"""
+    script = os.path.join(app_dir, os.path.relpath(os.path.abspath(__file__), REPO_DIR))
+    completed = subprocess.run([sys.executable, script, "--worker", name],
+                               cwd=app_dir, env=env, capture_output=True, text=True, timeout=timeout)
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip()
+                       else f"exit status {completed.returncode}")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(runs):
+    times = [run["time_to_interactive_ms"] for run in runs]
+    return {
+        "runs": len(runs),
+        "import_ms": statistics.median(run["import_ms"] for run in runs),
+        "build_ms": statistics.median(run["build_ms"] for run in runs),
+        "time_to_interactive_ms": statistics.median(times),
+        "time_to_interactive_max_ms": max(times),
+        "widgets": max(run["widgets"] for run in runs),
+        "peak_rss_kb": max((run["peak_rss_kb"] for run in runs if run["peak_rss_kb"] is not None), default=None),
+        "baseline_rss_kb": max((run["baseline_rss_kb"] for run in runs if run["baseline_rss_kb"] is not None),
+                               default=None),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=list(PAGES),
+                        help="pages to measure (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh-process runs per page")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds before a run is abandoned")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--worker", choices=sorted(PAGES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        os.chdir(REPO_DIR)
+        print(json.dumps(measure(args.worker)))
+        return
+
+    env = dict(os.environ)
+    xvfb = None
+    if sys.platform.startswith("linux") and not env.get("DISPLAY"):
+        xvfb = start_xvfb()
+        if xvfb is None:
+            parser.error("no display: set DISPLAY or install Xvfb")
+        env["DISPLAY"] = xvfb[1]
+
+    results, errors = {}, {}
+    workspace = tempfile.TemporaryDirectory(prefix="traney-bench-")
+    try:
+        app_dir = copy_app(os.path.join(workspace.name, "app"))
+        print(f"{'page':<16}{'import ms':>11}{'build ms':>10}{'TTI ms':>10}{'widgets':>9}{'peak RSS MiB':>14}")
+        for name in args.pages:
+            runs = []
+            try:
+                for _ in range(args.repeat):
+                    runs.append(run_page(name, app_dir, env, args.timeout))
+            except (RuntimeError, subprocess.TimeoutExpired) as e:
+                errors[name] = str(e)
+                print(f"{name:<16}  failed: {e}")
+                continue
+            summary = results[name] = summarize(runs)
+            rss = summary["peak_rss_kb"]
+            print(f"{name:<16}{summary['import_ms']:>11.1f}{summary['build_ms']:>10.1f}"
+                  f"{summary['time_to_interactive_ms']:>10.1f}{summary['widgets']:>9}"
+                  f"{rss / 1024 if rss is not None else float('nan'):>14.1f}")
+    finally:
+        workspace.cleanup()
+        if xvfb is not None:
+            xvfb[0].terminate()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"commit": git_commit(), "python": sys.version.split()[0], "platform": sys.platform,
+                       "repeat": args.repeat, "results": results, "errors": errors}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+from datetime import datetime
+
+ISO_DATE = "%Y-%m-%d"
+ISO_DATETIME = "%Y-%m-%d %H:%M:%S"
+DISPLAY_DATE = "%d %b %Y"
+
+# Formats the booking pages write dates in. Day-first formats come before
+# month-first ones: the hotel and flight pages write 31/12/2025 and
+# 31-12-2025, and nothing writes month-first dates with a four-digit year.
+DATE_FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y",
+    "%m/%d/%y",
+    "%B %d, %Y %H:%M:%S",
+    "%B %d, %Y",
+]
+
+# Booking fields that hold a date (or a date and time)
+DATE_FIELDS = frozenset([
+    'date', 'booking_date', 'travel_date', 'visit_date', 'flight_date',
+    'check_in', 'check_out', 'check_in_date', 'check_out_date',
+    'departure_date', 'arrival_date', 'return_date',
+    'pickup_date', 'dropoff_date', 'start_date', 'end_date',
+    'created_at', 'timestamp', 'booking_time', 'confirmed_at', 'payment_date',
+])
+
+# Every date the booking pages emit today, as (producer, field, example,
+# ISO result). Run this module to check each one still normalizes.
+PRODUCER_SAMPLES = [
+    ("attraction", "date", "2026-03-02", "2026-03-02"),
+    ("attraction", "timestamp", "2026-03-01 09:15:00", "2026-03-01 09:15:00"),
+    ("car_rental", "pickup_date", "2026-03-02", "2026-03-02"),
+    ("car_rental", "return_date", "2026-03-05", "2026-03-05"),
+    ("car_rental", "timestamp", "2026-03-01 09:15:00", "2026-03-01 09:15:00"),
+    ("detail", "date", "2026-03-02", "2026-03-02"),
+    ("detail", "check_in", "2026-03-02", "2026-03-02"),
+    ("detail", "check_out", "2026-03-04", "2026-03-04"),
+    ("detail", "flight_date", "2026-03-02", "2026-03-02"),
+    ("detail", "visit_date", "2026-03-02", "2026-03-02"),
+    ("detail", "pickup_date", "2026-03-02", "2026-03-02"),
+    ("detail", "dropoff_date", "2026-03-02", "2026-03-02"),
+    ("detail", "timestamp", "2026-03-01 09:15:00", "2026-03-01 09:15:00"),
+    ("flight", "departure_date", "02-03-2026", "2026-03-02"),
+    ("flight", "departure_date", "2026-03-02", "2026-03-02"),
+    ("flight", "return_date", "06-03-2026", "2026-03-06"),
+    ("flight", "booking_date", "2026-03-01 09:15:00", "2026-03-01 09:15:00"),
+    ("hotel", "check_in", "02/03/2026", "2026-03-02"),
+    ("hotel", "check_out", "04/03/2026", "2026-03-04"),
+    ("hotel", "booking_time", "2026-03-01 09:15:00", "2026-03-01 09:15:00"),
+    ("travel_plan", "start_date", "03/02/26", "2026-03-02"),
+    ("booking", "created_at", "2026-03-01 09:15:00", "2026-03-01 09:15:00"),
+    ("payment", "payment_date", "2026-03-01 09:20:00", "2026-03-01 09:20:00"),
+    ("payment", "check_in", "December 15, 2024", "2024-12-15"),
+]
+
+
+def _strip_zone(text):
+    return text.split('+')[0].split('Z')[0].strip()
+
+
+def parse_iso(value):
+    """datetime for an ISO date or date-time string, without trying other formats; None otherwise"""
+    if not isinstance(value, str) or value[4:5] != '-':
+        return None
+    try:
+        return datetime.fromisoformat(_strip_zone(value))
+    except ValueError:
+        return None
+
+
+class DateParser:
+    """Parses dates in any of DATE_FORMATS, remembering which one each producer uses per field.
+
+    The first date a page writes into a field is matched against the formats
+    in order; the winning format is cached under (producer, field), so every
+    later date from that producer costs a single strptime. If a producer
+    changes format, the cached one fails once and the search runs again.
+    ISO strings are recognised directly and never go through the search.
+    """
+
+    def __init__(self, formats=DATE_FORMATS):
+        self.formats = list(formats)
+        self._known = {}     # (producer, field) -> format
+
+    def parse(self, value, producer=None, field=None):
+        """(datetime, has_time) for value, or None if no format fits"""
+        if isinstance(value, datetime):
+            return value, True
+        parsed = parse_iso(value)
+        if parsed is not None:
+            return parsed, len(value.strip()) > 10
+        if not isinstance(value, str):
+            return None
+
+        text = _strip_zone(value)
+        key = (producer, field)
+        known = self._known.get(key)
+        if known is not None:
+            try:
+                return datetime.strptime(text, known), "%H" in known
+            except ValueError:
+                pass
+        for fmt in self.formats:
+            if fmt == known:
+                continue
+            try:
+                parsed = datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+            self._known[key] = fmt
+            return parsed, "%H" in fmt
+        return None
+
+    def to_iso(self, value, producer=None, field=None):
+        """value as "YYYY-MM-DD" (or "YYYY-MM-DD HH:MM:SS" if it had a time); unchanged if it is not a date"""
+        result = self.parse(value, producer, field)
+        if result is None:
+            return value
+        parsed, has_time = result
+        return parsed.strftime(ISO_DATETIME if has_time else ISO_DATE)
+
+
+_parser = DateParser()
+
+
+def normalize_dates(booking, producer=None):
+    """Rewrite the date fields of a booking dict as ISO dates, in place; returns the booking"""
+    for field in DATE_FIELDS.intersection(booking):
+        value = booking[field]
+        if value:
+            booking[field] = _parser.to_iso(value, producer, field)
+    return booking
+
+
+def format_date(value):
+    """An ISO date as "02 Mar 2026"; anything else as it is"""
+    parsed = parse_iso(value)
+    return str(value) if parsed is None else parsed.strftime(DISPLAY_DATE)
+
+
+if __name__ == "__main__":
+    failures = 0
+    for producer, field, example, expected in PRODUCER_SAMPLES:
+        result = normalize_dates({field: example}, producer)[field]
+        if result != expected:
+            failures += 1
+            print(f"FAIL {producer}.{field}: {example!r} -> {result!r}, expected {expected!r}")
+    print(f"{len(PRODUCER_SAMPLES) - failures}/{len(PRODUCER_SAMPLES)} producer dates normalized")
+    raise SystemExit(1 if failures else 0)
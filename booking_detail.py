@@ -4,10 +4,103 @@ from datetime import datetime
 import sys
 import os
 import json
+from booking_dates import DATE_FIELDS, format_date, normalize_dates
+from booking_record import BookingRecord, quote, to_amount, unit_label
+from page_router import get_router
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Booking fields shown in the summary, with their display names, in order
+BOOKING_DETAIL_FIELDS = {
+    # Date and time fields
+    'date': 'Date',
+    'booking_date': 'Booking Date',
+    'travel_date': 'Travel Date',
+    'visit_date': 'Visit Date',
+    'check_in': 'Check-in',
+    'check_out': 'Check-out',
+    'check_in_date': 'Check-in Date',
+    'check_out_date': 'Check-out Date',
+    'departure_date': 'Departure',
+    'arrival_date': 'Arrival',
+    'departure_time': 'Departure Time',
+    'arrival_time': 'Arrival Time',
+    'pickup_date': 'Pick-up',
+    'dropoff_date': 'Drop-off',
+    'start_date': 'Start Date',
+    'end_date': 'End Date',
+    'time_slot': 'Time Slot',
+    'time': 'Time',
+    'flight_date': 'Flight Date',
+    
+    # Quantity fields
+    'guests': 'Guests',
+    'adults': 'Adults',
+    'children': 'Children',
+    'infants': 'Infants',
+    'tickets': 'Tickets',
+    'passengers': 'Passengers',
+    'quantity': 'Quantity',
+    'rooms': 'Rooms',
+    'nights': 'Nights',
+    'days': 'Days',
+    'rental_days': 'Rental Days',
+    'duration': 'Duration',
+    'hours': 'Hours',
+    
+    # Location and route fields
+    'location': 'Location',
+    'address': 'Address',
+    'city': 'City',
+    'country': 'Country',
+    'destination': 'Destination',
+    'origin': 'Origin',
+    'from': 'From',
+    'to': 'To',
+    'pickup_location': 'Pick-up Location',
+    'dropoff_location': 'Drop-off Location',
+    'departure_city': 'Departure City',
+    'arrival_city': 'Arrival City',
+    'departure_airport': 'Departure Airport',
+    'arrival_airport': 'Arrival Airport',
+    
+    # Type and class fields
+    'room_type': 'Room Type',
+    'room_types': 'Room Type',
+    'room_category': 'Room Category',
+    'flight_class': 'Class',
+    'cabin_class': 'Cabin Class',
+    'car_type': 'Car Type',
+    'vehicle_type': 'Vehicle Type',
+    'vehicle_category': 'Vehicle Category',
+    'ticket_type': 'Ticket Type',
+    'passenger_class': 'Class',
+    
+    # Identification fields
+    'flight_number': 'Flight Number',
+    'airline': 'Airline',
+    'car_model': 'Car Model',
+    'car_name': 'Car Name',
+    'car_brand': 'Car Brand',
+    'vehicle_model': 'Vehicle Model',
+    'vehicle_name': 'Vehicle Name',
+    'seats': 'Seats',
+    'seat_numbers': 'Seat Numbers',
+    'seat_selection': 'Seat Selection',
+    
+    # Other details
+    'description': 'Description',
+    'amenities': 'Amenities',
+    'features': 'Features',
+    'inclusions': 'Inclusions',
+    'exclusions': 'Exclusions',
+    'terms': 'Terms',
+    'conditions': 'Conditions',
+    'baggage_allowance': 'Baggage Allowance'
+}
+
+
 class BookingDetailApp:
     def __init__(self, root, booking_data, email, booking_type="attraction", callback=None):
         self.root = root
@@ -27,6 +120,10 @@ class BookingDetailApp:
         # Validate incoming data
         self.validate_incoming_data()
         
+        # Prices are read from the booking once; every summary line comes from this quote
+        self.pricing = BookingRecord.from_booking(self.booking_data, self.booking_type)
+        self.quote = quote(self.pricing)
+        
         # Set window title
         booking_id = self.booking_data.get('booking_id', 'N/A')
         self.root.title(f"Booking Confirmation - #{booking_id}")
@@ -129,6 +226,10 @@ class BookingDetailApp:
                 # 最后使用参数
                 self.booking_data['booking_type'] = self.booking_type
         
+        # Bookings from the listing pages arrive with ISO dates already; this
+        # converts any other source once, so the summary never guesses formats
+        normalize_dates(self.booking_data, self.booking_data['booking_type'])
+        
         # Update is_flight_booking based on corrected booking_type
         self.is_flight_booking = self.booking_data.get('booking_type', '') == "flight"
         
@@ -273,7 +374,7 @@ class BookingDetailApp:
                 bg="#e8f5e9", fg=self.colors["success"]).pack(side="right")
         
         # Store for reference
-        self.booking_data['display_total'] = total_amount
+        self.booking_data['display_total'] = float(total_amount)
     
     def get_status_display(self, status):
         """Get display information for status"""
@@ -295,102 +396,14 @@ class BookingDetailApp:
         if item_name:
             details.append(("Item", item_name))
         
-        # Define mapping of data fields with their display names
-        common_fields = {
-            # Date and time fields
-            'date': 'Date',
-            'booking_date': 'Booking Date',
-            'travel_date': 'Travel Date',
-            'visit_date': 'Visit Date',
-            'check_in': 'Check-in',
-            'check_out': 'Check-out',
-            'check_in_date': 'Check-in Date',
-            'check_out_date': 'Check-out Date',
-            'departure_date': 'Departure',
-            'arrival_date': 'Arrival',
-            'departure_time': 'Departure Time',
-            'arrival_time': 'Arrival Time',
-            'pickup_date': 'Pick-up',
-            'dropoff_date': 'Drop-off',
-            'start_date': 'Start Date',
-            'end_date': 'End Date',
-            'time_slot': 'Time Slot',
-            'time': 'Time',
-            'flight_date': 'Flight Date',
-            
-            # Quantity fields
-            'guests': 'Guests',
-            'adults': 'Adults',
-            'children': 'Children',
-            'infants': 'Infants',
-            'tickets': 'Tickets',
-            'passengers': 'Passengers',
-            'quantity': 'Quantity',
-            'rooms': 'Rooms',
-            'nights': 'Nights',
-            'days': 'Days',
-            'rental_days': 'Rental Days',
-            'duration': 'Duration',
-            'hours': 'Hours',
-            
-            # Location and route fields
-            'location': 'Location',
-            'address': 'Address',
-            'city': 'City',
-            'country': 'Country',
-            'destination': 'Destination',
-            'origin': 'Origin',
-            'from': 'From',
-            'to': 'To',
-            'pickup_location': 'Pick-up Location',
-            'dropoff_location': 'Drop-off Location',
-            'departure_city': 'Departure City',
-            'arrival_city': 'Arrival City',
-            'departure_airport': 'Departure Airport',
-            'arrival_airport': 'Arrival Airport',
-            
-            # Type and class fields
-            'room_type': 'Room Type',
-            'room_types': 'Room Type',
-            'room_category': 'Room Category',
-            'flight_class': 'Class',
-            'cabin_class': 'Cabin Class',
-            'car_type': 'Car Type',
-            'vehicle_type': 'Vehicle Type',
-            'vehicle_category': 'Vehicle Category',
-            'ticket_type': 'Ticket Type',
-            'passenger_class': 'Class',
-            
-            # Identification fields
-            'flight_number': 'Flight Number',
-            'airline': 'Airline',
-            'car_model': 'Car Model',
-            'car_name': 'Car Name',
-            'car_brand': 'Car Brand',
-            'vehicle_model': 'Vehicle Model',
-            'vehicle_name': 'Vehicle Name',
-            'seats': 'Seats',
-            'seat_numbers': 'Seat Numbers',
-            'seat_selection': 'Seat Selection',
-            
-            # Other details
-            'description': 'Description',
-            'amenities': 'Amenities',
-            'features': 'Features',
-            'inclusions': 'Inclusions',
-            'exclusions': 'Exclusions',
-            'terms': 'Terms',
-            'conditions': 'Conditions',
-            'baggage_allowance': 'Baggage Allowance'
-        }
         
         # Check for common details
-        for field, label in common_fields.items():
+        for field, label in BOOKING_DETAIL_FIELDS.items():
             if field in self.booking_data:
                 value = self.booking_data[field]
                 if value and str(value).strip() and str(value).strip().lower() != 'none':
-                    # Format dates if they look like dates
-                    if any(date_keyword in field.lower() for date_keyword in ['date', 'time', 'check', 'pickup', 'dropoff']):
+                    # Dates were normalized to ISO when the booking was created
+                    if field in DATE_FIELDS:
                         value = self.format_date_value(value)
                     
                     # Format price-related values
@@ -424,287 +437,47 @@ class BookingDetailApp:
     
     def format_date_value(self, value):
         """Format date values consistently"""
-        try:
-            # Try to parse common date formats
-            if isinstance(value, str):
-                # Remove timezone info if present
-                value = value.split('+')[0].split('Z')[0].strip()
-                
-                # Try different date formats
-                date_formats = [
-                    "%Y-%m-%d %H:%M:%S",
-                    "%Y-%m-%d",
-                    "%d/%m/%Y %H:%M:%S",
-                    "%d/%m/%Y",
-                    "%m/%d/%Y %H:%M:%S",
-                    "%m/%d/%Y",
-                    "%B %d, %Y %H:%M:%S",
-                    "%B %d, %Y"
-                ]
-                
-                for fmt in date_formats:
-                    try:
-                        date_obj = datetime.strptime(value, fmt)
-                        return date_obj.strftime("%d %b %Y")
-                    except ValueError:
-                        continue
-        except Exception:
-            pass
-        
-        return str(value)
+        return format_date(value)
     
     def format_price_value(self, value):
         """Format price values consistently"""
-        try:
-            if isinstance(value, (int, float)):
-                return f"RM {value:,.2f}"
-            elif isinstance(value, str):
-                # Remove currency symbols and convert to float
-                cleaned = value.replace('RM', '').replace('$', '').replace(',', '').strip()
-                try:
-                    return f"RM {float(cleaned):,.2f}"
-                except ValueError:
-                    return str(value)
-        except (ValueError, TypeError):
-            pass
-        
-        return str(value)
+        amount = to_amount(value)
+        return str(value) if amount is None else f"RM {amount:,.2f}"
     
     def calculate_price_summary(self):
         """Calculate price summary with detailed breakdown"""
         price_items = []
+        price = self.quote
+        unit = self.pricing.unit
+        
+        if self.pricing.unit_price is not None:
+            if price.quantity > 1:
+                single_unit = self.get_unit_label(1)
+                price_items.append((f"Unit Price ({single_unit})", f"RM {price.unit_price:,.2f}"))
+                price_items.append((f"× {price.quantity} {unit}", f"RM {price.subtotal:,.2f}"))
+            else:
+                price_items.append((f"{unit} Price", f"RM {price.unit_price:,.2f}"))
         
-        # Get base price and quantity from data
-        base_price = self.get_base_price()
-        quantity = self.get_quantity()
-        unit_label = self.get_unit_label()
-        
-        # FLIGHT BOOKING SPECIAL HANDLING
-        if self.is_flight_booking:
-            # Use flight-specific fields
-            unit_price_per_passenger = self.booking_data.get('unit_price_per_passenger', base_price)
-            passenger_count = self.booking_data.get('passenger_count', quantity)
-            total_amount = self.booking_data.get('total_amount', 
-                                               self.booking_data.get('total_price', 0))
-            
-            # Ensure we have the right values
-            if unit_price_per_passenger is None:
-                unit_price_per_passenger = base_price
-            
-            if passenger_count is None:
-                passenger_count = quantity
-            
-            # Calculate total if not provided
-            if total_amount == 0 and unit_price_per_passenger and passenger_count:
-                total_amount = unit_price_per_passenger * passenger_count
-            
-            # Format prices
-            try:
-                unit_price_per_passenger = float(unit_price_per_passenger)
-                passenger_count = int(passenger_count)
-                total_amount = float(total_amount)
-            except (ValueError, TypeError):
-                unit_price_per_passenger = 0
-                passenger_count = 0
-                total_amount = 0
-            
-            # Show calculation breakdown
-            price_items.append(("Unit Price (Passenger)", f"RM {unit_price_per_passenger:,.2f}"))
-            
-            if passenger_count > 1:
-                subtotal = unit_price_per_passenger * passenger_count
-                price_items.append((f"x {passenger_count} Passenger", f"RM {subtotal:,.2f}"))
-        
-        # Non-flight booking or fallback
-        elif base_price is not None and quantity is not None and quantity > 1:
-            subtotal = base_price * quantity
-            price_items.append((f"Unit Price ({unit_label})", f"RM {base_price:.2f}"))
-            price_items.append((f"× {quantity} {unit_label}", f"RM {subtotal:.2f}"))
-        elif base_price is not None:
-            price_items.append((f"{unit_label} Price", f"RM {base_price:.2f}"))
-        
-        # Add taxes and fees from data
-        taxes_fees = self.get_taxes_and_fees()
-        if taxes_fees > 0:
-            price_items.append(("Taxes & Fees", f"RM {taxes_fees:.2f}"))
-        
-        # Add discounts if any
-        discount = self.get_discount_amount()
-        if discount > 0:
-            price_items.append(("Discount", f"-RM {discount:.2f}"))
-        
-        return price_items
-    
-    def get_base_price(self):
-        """Extract base price from booking data"""
-        # For flight bookings, check flight-specific fields first
-        if self.is_flight_booking:
-            flight_price_fields = [
-                'unit_price_per_passenger', 'unit_price', 'ticket_price', 
-                'base_price', 'base_fare', 'fare'
-            ]
-            
-            for field in flight_price_fields:
-                if field in self.booking_data:
-                    try:
-                        value = self.booking_data[field]
-                        if isinstance(value, (int, float)):
-                            return float(value)
-                        elif isinstance(value, str):
-                            cleaned = value.replace('RM', '').replace('$', '').replace(',', '').strip()
-                            return float(cleaned)
-                    except (ValueError, TypeError):
-                        continue
-        
-        base_price_fields = [
-            'price', 'unit_price', 'ticket_price', 'room_rate', 
-            'base_fare', 'daily_rate', 'rate', 'cost', 'amount'
-        ]
-        
-        for field in base_price_fields:
-            if field in self.booking_data:
-                try:
-                    value = self.booking_data[field]
-                    if isinstance(value, (int, float)):
-                        return float(value)
-                    elif isinstance(value, str):
-                        cleaned = value.replace('RM', '').replace('$', '').replace(',', '').strip()
-                        return float(cleaned)
-                except (ValueError, TypeError):
-                    continue
-        
-        return None
-    
-    def get_quantity(self):
-        """Extract quantity from booking data"""
-        # For flight bookings, check flight-specific fields first
-        if self.is_flight_booking:
-            flight_quantity_fields = [
-                'passenger_count', 'tickets', 'passengers'
-            ]
-            
-            for field in flight_quantity_fields:
-                if field in self.booking_data:
-                    try:
-                        value = self.booking_data[field]
-                        if isinstance(value, (int, float)):
-                            return int(value)
-                        elif isinstance(value, str):
-                            return int(float(value))
-                    except (ValueError, TypeError):
-                        continue
-        
-        quantity_fields = [
-            'quantity', 'tickets', 'guests', 'passengers', 'rooms', 'nights', 'days', 'rental_days'
-        ]
+        if price.extras > 0:
+            price_items.append(("Extras", f"RM {price.extras:,.2f}"))
         
-        for field in quantity_fields:
-            if field in self.booking_data:
-                try:
-                    value = self.booking_data[field]
-                    if isinstance(value, (int, float)):
-                        return int(value)
-                    elif isinstance(value, str):
-                        return int(float(value))
-                except (ValueError, TypeError):
-                    continue
-        
-        # Default to 1 if not specified
-        return 1
-    
-    def get_unit_label(self):
-        """Get appropriate unit label based on booking type"""
-        # Use the actual booking type from data
-        actual_type = self.booking_data.get('booking_type', self.booking_type)
-        
-        if actual_type == "flight":
-            return "Passenger"
-        elif actual_type == "hotel":
-            nights = self.booking_data.get('nights', 1)
-            return "Night" if nights == 1 else "Nights"
-        elif actual_type == "car_rental":
-            days = self.booking_data.get('rental_days', 1)
-            return "Day" if days == 1 else "Days"
-        else:
-            return "Ticket" if actual_type == "attraction" else "Unit"
-    
-    def get_taxes_and_fees(self):
-        """Extract taxes and fees from booking data"""
-        tax_fields = ['tax', 'taxes', 'service_fee', 'booking_fee']
+        if price.taxes > 0:
+            price_items.append(("Taxes & Fees", f"RM {price.taxes:,.2f}"))
         
-        total_tax = 0.0
+        if price.discount > 0:
+            price_items.append(("Discount", f"-RM {price.discount:,.2f}"))
         
-        for field in tax_fields:
-            if field in self.booking_data:
-                try:
-                    value = self.booking_data[field]
-                    if isinstance(value, (int, float)):
-                        total_tax += float(value)
-                    elif isinstance(value, str):
-                        cleaned = value.replace('RM', '').replace('$', '').replace(',', '').strip()
-                        total_tax += float(cleaned)
-                except (ValueError, TypeError):
-                    continue
-        
-        return max(0, total_tax)
+        return price_items
     
-    def get_discount_amount(self):
-        """Extract discount amount from booking data"""
-        discount_fields = ['discount', 'discount_amount', 'promo_discount']
-        
-        for field in discount_fields:
-            if field in self.booking_data:
-                try:
-                    value = self.booking_data[field]
-                    if isinstance(value, (int, float)):
-                        return float(value)
-                    elif isinstance(value, str):
-                        cleaned = value.replace('RM', '').replace('$', '').replace(',', '').strip()
-                        return float(cleaned)
-                except (ValueError, TypeError):
-                    continue
-        
-        return 0.0
+    def get_unit_label(self, quantity=None):
+        """Name of what the unit price is charged per, e.g. Night or Tickets"""
+        if quantity is None:
+            return self.pricing.unit
+        return unit_label(self.booking_data.get('booking_type', self.booking_type), quantity)
     
     def get_total_amount(self):
-        """Get total amount as float with proper extraction"""
-        # FLIGHT BOOKING SPECIAL HANDLING
-        if self.is_flight_booking:
-            # Try flight-specific total fields first
-            flight_total_fields = ['total_amount', 'total_price']
-            
-            for field in flight_total_fields:
-                if field in self.booking_data:
-                    try:
-                        value = self.booking_data[field]
-                        if isinstance(value, (int, float)):
-                            return float(value)
-                        elif isinstance(value, str):
-                            cleaned = value.replace('RM', '').replace('$', '').replace(',', '').strip()
-                            return float(cleaned)
-                    except (ValueError, TypeError):
-                        continue
-            
-            # Calculate from unit price and passenger count if available
-            unit_price = self.get_base_price()
-            passenger_count = self.get_quantity()
-            
-            if unit_price is not None and passenger_count is not None:
-                return float(unit_price * passenger_count)
-        
-        # Original logic for non-flight bookings
-        if 'total_price' in self.booking_data:
-            total_str = self.booking_data['total_price']
-            try:
-                if isinstance(total_str, (int, float)):
-                    return float(total_str)
-                elif isinstance(total_str, str):
-                    cleaned = total_str.replace('RM', '').replace('$', '').replace(',', '').strip()
-                    return float(cleaned)
-            except (ValueError, TypeError):
-                pass
-        
-        return 0.00
+        """Total amount of the booking as a Decimal"""
+        return self.quote.total
     
     def get_item_name(self):
         """Get item name from booking data"""
@@ -1053,6 +826,7 @@ class BookingDetailApp:
             "booking_type": self.booking_data.get('booking_type', self.booking_type),
             "item_name": self.get_item_name(),
             "total_price": float(self.get_total_amount()),
+            "pricing": self.pricing.to_dict(),
             "status": "pending",
             "created_at": self.booking_data.get('created_at', datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
             "booking_data": self.booking_data,
@@ -1126,6 +900,7 @@ class BookingDetailApp:
             "booking_type": self.booking_data.get('booking_type', self.booking_type),
             "item_name": self.get_item_name(),
             "total_price": float(self.get_total_amount()),
+            "pricing": self.pricing.to_dict(),
             "status": "pending",
             "created_at": self.booking_data.get('created_at', datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
             "booking_data": self.booking_data,
@@ -1196,9 +971,7 @@ def show_booking_detail_window(booking_data, email="", booking_type="attraction"
         booking_type: Type of booking (attraction, hotel, flight, car_rental)
         callback: Callback function to execute after booking is complete
     """
-    root = tk.Tk()
-    app = BookingDetailApp(root, booking_data, email, booking_type, callback)
-    root.mainloop()
+    return BookingDetailApp(get_router().open_window(), booking_data, email, booking_type, callback)
 
 
 def main():
@@ -1221,9 +994,8 @@ def main():
             # Get email from data
             email = booking_data.get('user_email', booking_data.get('email', ''))
             
-            root = tk.Tk()
-            app = BookingDetailApp(root, booking_data, email, booking_type)
-            root.mainloop()
+            BookingDetailApp(get_router().open_window(), booking_data, email, booking_type)
+            get_router().run()
             
             # Clean up temp file
             try:
@@ -0,0 +1,207 @@
+import glob
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# Booking statuses, lower case as booking_detail.py displays them
+CONFIRMED = "confirmed"
+CANCELLED = "cancelled"
+
+
+class BookingLedger:
+    """Append-only SQLite ledger of every hotel, flight, attraction and car booking.
+
+    A booking is written once, as one row of bookings holding the booking
+    dict as JSON plus indexed columns for the booking id, customer email,
+    booking type and booking date. It is never rewritten afterwards: payment,
+    confirmation and cancellation are appended to booking_events with the
+    new status and whatever details came with it. get() replays those events
+    over the booking, so the latest status always wins, and history() keeps
+    the full trail.
+
+    This replaces bookings.json, which was read and rewritten whole for every
+    booking, and the loose bookings/booking_<id>.json files, which could
+    only be listed by scanning the directory.
+    """
+
+    def __init__(self, db_path=None, legacy_file=None, legacy_dir=None):
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        if db_path is None:
+            db_path = os.path.join(base_dir, "traney_bookings.db")
+        self.db_path = db_path
+        self.legacy_file = legacy_file or os.path.join(base_dir, "bookings.json")
+        self.legacy_dir = legacy_dir or os.path.join(base_dir, "bookings")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self.create_schema()
+
+    def create_schema(self):
+        with self._lock, self._conn:
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bookings'").fetchone()
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS bookings (
+                    booking_id   TEXT PRIMARY KEY,
+                    email        TEXT NOT NULL DEFAULT '',
+                    booking_type TEXT NOT NULL DEFAULT '',
+                    booking_date TEXT NOT NULL DEFAULT '',
+                    created_at   TEXT NOT NULL,
+                    data         TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS bookings_email ON bookings (email, booking_date);
+                CREATE INDEX IF NOT EXISTS bookings_type ON bookings (booking_type, booking_date);
+                CREATE INDEX IF NOT EXISTS bookings_date ON bookings (booking_date);
+                CREATE TABLE IF NOT EXISTS booking_events (
+                    event_id   INTEGER PRIMARY KEY,
+                    booking_id TEXT NOT NULL,
+                    status     TEXT NOT NULL,
+                    at         TEXT NOT NULL,
+                    details    TEXT NOT NULL DEFAULT '{}'
+                );
+                CREATE INDEX IF NOT EXISTS booking_events_booking ON booking_events (booking_id, event_id);
+            """)
+        if not exists:
+            self.import_legacy()
+
+    def close(self):
+        self._conn.close()
+
+    @staticmethod
+    def _now():
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def booking_id(booking):
+        return str(booking.get("booking_id") or booking.get("id") or "")
+
+    @staticmethod
+    def _columns(booking, booking_type=None):
+        """(email, booking_type, booking_date) of a booking dict from any of the pages"""
+        email = booking.get("email") or booking.get("customer_email") or booking.get("user_email") or ""
+        kind = booking_type or booking.get("booking_type") or booking.get("type") or ""
+        date = str(booking.get("booking_date") or datetime.now().strftime("%Y-%m-%d"))
+        return email, kind, date
+
+    # ==================== WRITING ====================
+    def record(self, booking, booking_type=None, status=CONFIRMED, details=None):
+        """Add a booking and its first status event; returns the booking id
+
+        Recording a booking id that is already in the ledger only appends the
+        status event, so a page can record a booking it created earlier.
+        """
+        booking_id = self.booking_id(booking)
+        if not booking_id:
+            raise ValueError("A booking needs a booking_id")
+        email, kind, date = self._columns(booking, booking_type)
+        now = self._now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO bookings (booking_id, email, booking_type, booking_date, created_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (booking_id, email, kind, date, now, json.dumps(booking, ensure_ascii=False, default=str)))
+            self._append_event(booking_id, status, now, details)
+        return booking_id
+
+    def update_status(self, booking_id, status, **details):
+        """Record a status change (cancelled, refunded, ...) for an existing booking"""
+        with self._lock, self._conn:
+            known = self._conn.execute("SELECT 1 FROM bookings WHERE booking_id = ?",
+                                       (booking_id,)).fetchone()
+            if not known:
+                return False
+            self._append_event(booking_id, status, self._now(), details)
+        return True
+
+    def _append_event(self, booking_id, status, at, details):
+        self._conn.execute(
+            "INSERT INTO booking_events (booking_id, status, at, details) VALUES (?, ?, ?, ?)",
+            (booking_id, status, at, json.dumps(details or {}, ensure_ascii=False, default=str)))
+
+    def import_legacy(self):
+        """Copy bookings.json and bookings/booking_*.json into the ledger"""
+        bookings = []
+        try:
+            if os.path.exists(self.legacy_file) and os.path.getsize(self.legacy_file):
+                with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                    bookings.extend(json.load(f))
+            for path in sorted(glob.glob(os.path.join(self.legacy_dir, "booking_*.json"))):
+                with open(path, 'r', encoding='utf-8') as f:
+                    bookings.append(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Error reading legacy bookings: {e}")
+
+        imported = 0
+        for booking in bookings:
+            if isinstance(booking, dict) and self.booking_id(booking):
+                self.record(booking, status=str(booking.get("status") or CONFIRMED).lower())
+                imported += 1
+        return imported
+
+    # ==================== READING ====================
+    def _select(self, where, params, order="booking_date, created_at", limit=None):
+        """Booking dicts matching where, with their status events applied"""
+        selected = f"SELECT booking_id, data FROM bookings WHERE {where} ORDER BY {order}"
+        if limit is not None:
+            selected += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn.execute(selected, params).fetchall()
+            if not rows:
+                return []
+            events = self._conn.execute(
+                f"SELECT booking_id, status, at, details FROM booking_events "
+                f"WHERE booking_id IN (SELECT booking_id FROM ({selected})) ORDER BY event_id",
+                params).fetchall()
+
+        bookings = {booking_id: json.loads(data) for booking_id, data in rows}
+        for booking_id, status, at, details in events:
+            booking = bookings.get(booking_id)
+            if booking is None:
+                # Booked by another process between the two reads
+                continue
+            booking.update(json.loads(details))
+            booking["status"] = status
+            booking["status_updated_at"] = at
+        return [bookings[booking_id] for booking_id, _ in rows]
+
+    def get(self, booking_id):
+        """Current state of one booking, or None"""
+        bookings = self._select("booking_id = ?", [booking_id])
+        return bookings[0] if bookings else None
+
+    def history(self, booking_id):
+        """Status events of a booking, oldest first, as (status, at, details)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, at, details FROM booking_events WHERE booking_id = ? ORDER BY event_id",
+                (booking_id,)).fetchall()
+        return [(status, at, json.loads(details)) for status, at, details in rows]
+
+    def for_customer(self, email, booking_type=None, limit=None):
+        """A customer's bookings, most recent booking date first"""
+        where, params = "email = ?", [email]
+        if booking_type is not None:
+            where += " AND booking_type = ?"
+            params.append(booking_type)
+        return self._select(where, params, "booking_date DESC, created_at DESC", limit)
+
+    def between(self, start_date, end_date, booking_type=None):
+        """Bookings made between two YYYY-MM-DD dates (inclusive)"""
+        where, params = "booking_date BETWEEN ? AND ?", [start_date, end_date]
+        if booking_type is not None:
+            where += " AND booking_type = ?"
+            params.append(booking_type)
+        return self._select(where, params)
+
+
+_ledger = None
+
+
+def get_booking_ledger():
+    """Return the shared BookingLedger instance"""
+    global _ledger
+    if _ledger is None:
+        _ledger = BookingLedger()
+    return _ledger
@@ -0,0 +1,191 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import NamedTuple
+
+CENTS = Decimal("0.01")
+ZERO = Decimal("0")
+
+# Payment page surcharges on the booking total
+PAYMENT_TAX_RATE = Decimal("0.06")
+SERVICE_FEE_SMALL = Decimal("5.00")
+SERVICE_FEE_LARGE = Decimal("10.00")
+SERVICE_FEE_THRESHOLD = Decimal("500")
+
+# booking_type -> (singular, plural) name of what the unit price is charged per
+UNITS = {
+    "flight": ("Passenger", "Passengers"),
+    "hotel": ("Night", "Nights"),
+    "car_rental": ("Day", "Days"),
+    "attraction": ("Ticket", "Tickets"),
+}
+
+# Candidate keys of bookings written before "pricing" existed, checked in order
+LEGACY_FLIGHT_PRICE_FIELDS = ['unit_price_per_passenger', 'unit_price', 'ticket_price',
+                              'base_price', 'base_fare', 'fare']
+LEGACY_PRICE_FIELDS = ['price', 'unit_price', 'ticket_price', 'room_rate',
+                       'base_fare', 'daily_rate', 'rate', 'cost', 'amount']
+LEGACY_FLIGHT_QUANTITY_FIELDS = ['passenger_count', 'tickets', 'passengers']
+LEGACY_QUANTITY_FIELDS = ['quantity', 'tickets', 'guests', 'passengers', 'rooms',
+                          'nights', 'days', 'rental_days']
+LEGACY_TAX_FIELDS = ['tax', 'taxes', 'service_fee', 'booking_fee', 'tax_fee', 'service_charge']
+LEGACY_DISCOUNT_FIELDS = ['discount', 'discount_amount', 'promo_discount']
+
+
+def to_amount(value):
+    """Decimal for a price given as a number or text such as "RM 1,250.00"; None if it is not one"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, Decimal):
+        amount = value
+    elif isinstance(value, int):
+        amount = Decimal(value)
+    elif isinstance(value, float):
+        amount = Decimal(repr(value))
+    else:
+        text = str(value).replace('RM', '').replace('$', '').replace(',', '').strip()
+        try:
+            amount = Decimal(text)
+        except InvalidOperation:
+            return None
+    return amount if amount.is_finite() else None
+
+
+def to_count(value):
+    """int for a count given as a number or numeric text; None if it is not one"""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def unit_label(booking_type, quantity=1):
+    singular, plural = UNITS.get(booking_type, ("Unit", "Units"))
+    return singular if quantity == 1 else plural
+
+
+class BookingRecord:
+    """The priced part of a booking, with every amount a Decimal.
+
+    The page that creates a booking builds one from the numbers it already
+    has and stores to_dict() under the booking's "pricing" key, so the
+    confirmation and payment pages read exact amounts instead of probing
+    a dozen differently formatted price fields. unit_price may be None when
+    only a total is known; total may be None to have quote() derive it.
+    """
+    __slots__ = ("booking_type", "unit_price", "quantity", "unit", "extras",
+                 "taxes", "discount", "total", "currency")
+
+    def __init__(self, booking_type, unit_price=None, quantity=1, unit=None, extras=ZERO,
+                 taxes=ZERO, discount=ZERO, total=None, currency="RM"):
+        self.booking_type = booking_type
+        self.unit_price = to_amount(unit_price)
+        self.quantity = max(1, to_count(quantity) or 1)
+        self.unit = unit or unit_label(booking_type, self.quantity)
+        self.extras = to_amount(extras) or ZERO
+        self.taxes = to_amount(taxes) or ZERO
+        self.discount = to_amount(discount) or ZERO
+        self.total = to_amount(total)
+        self.currency = currency or "RM"
+
+    def __repr__(self):
+        return (f"BookingRecord({self.booking_type!r}, unit_price={self.unit_price}, "
+                f"quantity={self.quantity}, total={self.total})")
+
+    def to_dict(self):
+        """JSON-safe form, amounts as exact strings"""
+        def text(amount):
+            return None if amount is None else str(amount.quantize(CENTS, ROUND_HALF_UP))
+        return {
+            "booking_type": self.booking_type,
+            "unit_price": text(self.unit_price),
+            "quantity": self.quantity,
+            "unit": self.unit,
+            "extras": text(self.extras),
+            "taxes": text(self.taxes),
+            "discount": text(self.discount),
+            "total": text(self.total),
+            "currency": self.currency,
+        }
+
+    @classmethod
+    def from_dict(cls, pricing):
+        return cls(pricing.get("booking_type", ""), pricing.get("unit_price"),
+                   pricing.get("quantity", 1), pricing.get("unit"), pricing.get("extras"),
+                   pricing.get("taxes"), pricing.get("discount"), pricing.get("total"),
+                   pricing.get("currency", "RM"))
+
+    @classmethod
+    def from_booking(cls, booking, booking_type=None):
+        """Record for a booking dict: its "pricing" if present, else read from legacy fields once"""
+        booking_type = booking.get("booking_type") or booking_type
+        if isinstance(booking.get("pricing"), dict):
+            record = cls.from_dict(booking["pricing"])
+            record.booking_type = booking_type or record.booking_type
+            return record
+        booking_type = booking_type or ""
+
+        def first(fields, convert):
+            for field in fields:
+                if field in booking:
+                    value = convert(booking[field])
+                    if value is not None:
+                        return value
+            return None
+
+        is_flight = booking_type == "flight"
+        unit_price = first(LEGACY_FLIGHT_PRICE_FIELDS, to_amount) if is_flight else None
+        if unit_price is None:
+            unit_price = first(LEGACY_PRICE_FIELDS, to_amount)
+        quantity = first(LEGACY_FLIGHT_QUANTITY_FIELDS, to_count) if is_flight else None
+        if quantity is None:
+            quantity = first(LEGACY_QUANTITY_FIELDS, to_count)
+        total_fields = ['total_amount', 'total_price'] if is_flight else ['total_price']
+
+        return cls(
+            booking_type, unit_price, quantity or 1,
+            taxes=sum((to_amount(booking[field]) or ZERO for field in LEGACY_TAX_FIELDS if field in booking), ZERO),
+            discount=first(LEGACY_DISCOUNT_FIELDS, to_amount),
+            total=first(total_fields, to_amount),
+            currency=booking.get("currency") or "RM",
+        )
+
+
+class Quote(NamedTuple):
+    unit_price: Decimal
+    quantity: int
+    subtotal: Decimal
+    extras: Decimal
+    taxes: Decimal
+    discount: Decimal
+    total: Decimal
+
+
+def quote(record):
+    """Price breakdown of a record
+
+    The total is the one the booking page charged when it set one, otherwise
+    unit price x quantity + extras + taxes - discount.
+    """
+    unit_price = record.unit_price if record.unit_price is not None else ZERO
+    subtotal = unit_price * record.quantity
+    total = record.total
+    if total is None:
+        total = subtotal + record.extras + record.taxes - record.discount
+    return Quote(unit_price, record.quantity, subtotal, record.extras, record.taxes,
+                 max(ZERO, record.discount), max(ZERO, total))
+
+
+class Checkout(NamedTuple):
+    subtotal: Decimal
+    tax: Decimal
+    service_fee: Decimal
+    total: Decimal
+
+
+def checkout_totals(amount):
+    """What the payment page charges for a booking total: 6% tax and a flat service fee"""
+    subtotal = to_amount(amount) or ZERO
+    tax = (subtotal * PAYMENT_TAX_RATE).quantize(CENTS, ROUND_HALF_UP)
+    service_fee = SERVICE_FEE_SMALL if subtotal < SERVICE_FEE_THRESHOLD else SERVICE_FEE_LARGE
+    return Checkout(subtotal, tax, service_fee, subtotal + tax + service_fee)
@@ -5,6 +5,10 @@ import io
 from datetime import datetime, timedelta
 import os
 import random
+from booking_dates import normalize_dates
+from booking_record import BookingRecord
+from image_service import get_image_service, load_photo
+from page_router import get_router
 
 class CarDetailApp:
     def __init__(self, root, vehicle, email):
@@ -42,9 +46,6 @@ class CarDetailApp:
             "premium": "#d69e2e",
         }
         
-        # Image cache
-        self.image_cache = {}
-        
         # Ensure vehicle has all required fields
         self.ensure_vehicle_fields()
         
@@ -242,43 +243,18 @@ class CarDetailApp:
         type_badge.place(relx=0.95, rely=0.5, anchor="e")
     
     def get_vehicle_image(self, car_data, size):
-        """Get vehicle image from local files"""
-        car_name = car_data.get('name', '')
-        cache_key = f"{car_name}_{size[0]}_{size[1]}"
-        
-        if cache_key in self.image_cache:
-            return self.image_cache[cache_key]
-        
+        """Get vehicle image from the shared image service"""
         filename = car_data.get('image_file', 'car.jpg')
-        image_path = os.path.join("images/cars", filename)
-        
-        # Check if file exists in cars folder
-        if not os.path.exists(image_path):
-            # Try to find generic car images
-            generic_files = ["car.jpg", "car1.jpg", "car2.jpg", "car3.jpg", "car4.jpg"]
-            for file in generic_files:
-                alt_path = os.path.join("images/cars", file)
-                if os.path.exists(alt_path):
-                    image_path = alt_path
-                    break
-            else:
-                # If still not found, try images folder directly
-                for file in generic_files:
-                    alt_path = os.path.join("images", file)
-                    if os.path.exists(alt_path):
-                        image_path = alt_path
-                        break
+        candidates = [os.path.join("images/cars", filename), filename]
         
-        try:
-            # Load from local file
-            img = Image.open(image_path)
-            img = img.resize(size, Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            self.image_cache[cache_key] = photo
-            return photo
-        except Exception as e:
-            print(f"Error loading image {image_path}: {e}")
-            return self.create_vehicle_placeholder_image(size)
+        # Fall back to generic car images in the cars folder, then the images folder
+        generic_files = ["car.jpg", "car1.jpg", "car2.jpg", "car3.jpg", "car4.jpg"]
+        candidates += [os.path.join("images/cars", file) for file in generic_files]
+        candidates += [os.path.join("images", file) for file in generic_files]
+        
+        image_path = get_image_service().find_image(candidates)
+        photo = load_photo(image_path, size) if image_path else None
+        return photo or self.create_vehicle_placeholder_image(size)
     
     def create_vehicle_placeholder_image(self, size):
         """Create a placeholder image for vehicles when image is not available"""
@@ -1174,6 +1150,8 @@ class CarDetailApp:
                 "extras": extras_list,
                 "extras_price": str(extras_price),
                 "total_price": str(total_price),
+                "pricing": BookingRecord("car_rental", daily_price, days, extras=extras_price,
+                                         total=total_price).to_dict(),
                 "image_file": self.vehicle.get("image_file", ""),
                 "transmission": self.vehicle.get("transmission", ""),
                 "fuel_type": self.vehicle.get("fuel_type", ""),
@@ -1184,21 +1162,18 @@ class CarDetailApp:
                 "phone": "",  # Will be filled in booking form
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
+            normalize_dates(booking_details, "car_rental")
             
-            # Close current window and open booking detail
-            self.root.destroy()
-            
-            # Import and create booking detail window
+            # Open the booking detail window over this page
             try:
                 import booking_detail
-                booking_root = tk.Tk()
-                booking_root.title("Booking Confirmation - Traney")
-                booking_root.geometry("900x700")
-                booking_root.configure(bg="#f8fafc")
+                booking_window = tk.Toplevel(self.root)
+                booking_window.title("Booking Confirmation - Traney")
+                booking_window.geometry("900x700")
+                booking_window.configure(bg="#f8fafc")
                 
                 # Create booking detail app
-                booking_detail.BookingDetailApp(booking_root, booking_details, self.email)
-                booking_root.mainloop()
+                booking_detail.BookingDetailApp(booking_window, booking_details, self.email)
             except ImportError:
                 messagebox.showerror("Error", "Booking module not found!")
                 self.go_back()
@@ -1210,49 +1185,9 @@ class CarDetailApp:
     
     def go_back(self):
         """Go back to car_rental.py page"""
-        self.root.destroy()
         try:
-            # Import car_rental module
-            import car_rental
-            
-            # Create new root window for car rental
-            root = tk.Tk()
-            root.title("Traney - Car Rentals")
-            root.attributes('-fullscreen', True)
-            
-            # Initialize CarRentalApp
-            app = car_rental.CarRentalApp(root, self.email)
-            
-            # Start the mainloop
-            root.mainloop()
-            
-        except ImportError as e:
-            # Handle import error
-            print(f"Error importing car_rental: {e}")
-            messagebox.showerror("Error", "Cannot load car rental module. Please check if car_rental.py exists.")
-        except AttributeError as e:
-            # Handle wrong class name
-            print(f"Error initializing CarRentalApp: {e}")
-            try:
-                # Try alternative class names
-                import car_rental
-                root = tk.Tk()
-                root.attributes('-fullscreen', True)
-                
-                # Try different class names
-                if hasattr(car_rental, 'CarApp'):
-                    app = car_rental.CarApp(root, self.email)
-                elif hasattr(car_rental, 'CarRental'):
-                    app = car_rental.CarRental(root, self.email)
-                else:
-                    # List available classes
-                    classes = [attr for attr in dir(car_rental) if not attr.startswith('_')]
-                    print(f"Available classes in car_rental: {classes}")
-                    raise Exception(f"No suitable class found in car_rental.py")
-                    
-                root.mainloop()
-            except Exception as e2:
-                messagebox.showerror("Error", f"Cannot load car rental application: {str(e2)}")
+            # Resumes the suspended car rental page instead of rebuilding it
+            get_router().show("car_rental", self.email)
         except Exception as e:
             # Generic error handling
             print(f"Unexpected error: {e}")
@@ -3,12 +3,17 @@ from tkinter import ttk, messagebox, font as tkFont
 from PIL import Image, ImageTk, ImageDraw
 import random
 import os
-import json
-import subprocess
 import sys
 from datetime import datetime
 from typing import List, Dict
 from profile import Profile
+from image_service import get_image_service, load_photo, load_photo_async
+from virtual_grid import VirtualGrid
+from catalog_index import CatalogIndex
+from search_index import SearchIndex
+from catalog_store import load_catalog
+from session import get_session
+from page_router import SCRIPTS, get_router, navigate, run
 
 class CarRentalApp:
     def __init__(self, root, email):
@@ -24,8 +29,9 @@ class CarRentalApp:
         # Profile menu status
         self.is_menu_open = False
         
-        # Image cache
-        self.image_cache = {}
+        # Card placeholder image (real pictures come from the shared image service)
+        self.placeholder_photo = None
+        self.all_cars_grid = None
         
         # Create custom fonts
         self.create_custom_fonts()
@@ -53,6 +59,8 @@ class CarRentalApp:
         
         # Data
         self.cars = self.load_cars()
+        self.car_index = self.build_car_index()
+        self.car_search = self.build_car_search()
         self.filtered_cars = self.cars.copy()
         
         # Filter variables
@@ -78,23 +86,17 @@ class CarRentalApp:
         self.menu_bold_font = tkFont.Font(family="Arial", size=11, weight="bold")
 
     def load_user_session(self):
-        """Load user information from session file"""
-        session_file = 'user_session.json'
-        if os.path.exists(session_file):
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                    self.email = session_data.get('email', 'user@example.com')
-                    self.user_name = session_data.get('user_name', 'Guest User')
-            except:
-                self.email = 'user@example.com'
-                self.user_name = 'Guest User'
-        else:
-            self.email = 'user@example.com'
-            self.user_name = 'Guest User'
+        """Fill in user information that was not passed in from the current session"""
+        session = get_session()
+        self.email = self.email or session.email or 'user@example.com'
+        self.user_name = getattr(self, 'user_name', None) or session.user_name or 'Guest User'
 
     def load_cars(self) -> List[Dict]:
-        """Load car rental data"""
+        """Load car rental data from the local catalog store"""
+        return load_catalog("car", 1, self.default_cars)
+
+    def default_cars(self) -> List[Dict]:
+        """Default car rental data"""
         cars = [
             {
                 "id": 1,
@@ -529,6 +531,11 @@ class CarRentalApp:
             self.profile_menu = None
         self.is_menu_open = False
 
+    def suspend(self):
+        """Called by the page router when another page replaces this one"""
+        if self.is_menu_open:
+            self.hide_profile_menu()
+
     def check_click_outside(self, event):
         """Check if clicked outside menu"""
         if self.is_menu_open and hasattr(self, 'profile_menu') and self.profile_menu:
@@ -711,7 +718,7 @@ class CarRentalApp:
         
         all_frame = tk.Frame(notebook, bg=self.colors["light"])
         notebook.add(all_frame, text="🚗 All Cars")
-        self.create_cars_grid(all_frame, self.filtered_cars)
+        self.all_cars_grid = self.create_cars_grid(all_frame, self.filtered_cars)
         
         economy_frame = tk.Frame(notebook, bg=self.colors["light"])
         notebook.add(economy_frame, text="💰 Economy")
@@ -734,73 +741,73 @@ class CarRentalApp:
         self.create_cars_grid(luxury_frame, luxury)
     
     def create_cars_grid(self, parent, cars):
-        """Create grid of car cards"""
+        """Create virtualized grid of car cards"""
         header = tk.Frame(parent, bg=self.colors["light"])
         header.pack(fill="x", pady=(0, 20))
         
-        tk.Label(header, text=f"{len(cars)} Cars Available",
-                font=("Segoe UI", 16, "bold"),
-                bg=self.colors["light"], fg=self.colors["primary"]).pack(side="left")
-        
-        grid_frame = tk.Frame(parent, bg=self.colors["light"])
-        grid_frame.pack(fill="both", expand=True)
-        
-        if not cars:
-            tk.Label(grid_frame, text="No cars found",
-                    font=("Segoe UI", 14),
-                    bg=self.colors["light"], fg=self.colors["text_light"]).pack(expand=True)
+        count_label = tk.Label(header, text=f"{len(cars)} Cars Available",
+                              font=("Segoe UI", 16, "bold"),
+                              bg=self.colors["light"], fg=self.colors["primary"])
+        count_label.pack(side="left")
+        
+        # Only the rows in view get card widgets
+        grid = VirtualGrid(parent, self.build_car_card, self.fill_car_card,
+                           columns=3, row_height=470, padx=10, pady=10,
+                           bg=self.colors["light"], height=self.get_grid_height(),
+                           empty_text="No cars found", empty_fg=self.colors["text_light"])
+        grid.pack(fill="both", expand=True)
+        grid.count_label = count_label
+        grid.set_items(cars)
+        return grid
+    
+    def update_cars_grid(self):
+        """Show filtered_cars in the existing All tab, reusing its cards"""
+        grid = self.all_cars_grid
+        if grid is None or not grid.canvas.winfo_exists():
+            self.show_car_rental_page()
             return
-        
-        row, col = 0, 0
-        for car in cars:
-            card = self.create_car_card(grid_frame, car)
-            card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-            grid_frame.grid_columnconfigure(col, weight=1)
-            
-            col += 1
-            if col == 3:
-                col = 0
-                row += 1
-        
-        for i in range(row + 1):
-            grid_frame.grid_rowconfigure(i, weight=0)
+        grid.count_label.config(text=f"{len(self.filtered_cars)} Cars Available")
+        grid.set_items(self.filtered_cars)
+    
+    def get_grid_height(self):
+        """Height of the card viewport inside the scrolling page"""
+        return max(500, self.root.winfo_screenheight() - 260)
     
     def create_car_card(self, parent, car):
         """Create a single car card"""
+        card = self.build_car_card(parent)
+        self.fill_car_card(card, car)
+        return card
+    
+    def build_car_card(self, parent):
+        """Build an empty car card whose widgets are filled by fill_car_card"""
         card = tk.Frame(parent, bg="white",
                        highlightbackground=self.colors["border"],
                        highlightthickness=1)
         
-        photo = self.get_car_image(car)
-        img_label = tk.Label(card, image=photo, bg="white")
-        img_label.image = photo
-        img_label.pack(fill="x")
-        
-        if car.get("is_featured"):
-            tk.Label(card, text="⭐ Featured", font=("Segoe UI", 8, "bold"),
-                    bg=self.colors["warning"], fg="white", padx=6, pady=2).place(x=10, y=10)
-        
-        if car["is_electric"]:
-            tk.Label(card, text="⚡ Electric", font=("Segoe UI", 8, "bold"),
-                    bg=self.colors["electric"], fg="white", padx=6, pady=2).place(x=10, y=35)
-        
-        if car["discount"] > 0:
-            tk.Label(card, text=f"🔥 {car['discount']}% OFF", font=("Segoe UI", 8, "bold"),
-                    bg=self.colors["danger"], fg="white", padx=6, pady=2).place(x=280, y=10)
+        card.image_label = tk.Label(card, bg="white")
+        card.image_label.pack(fill="x")
         
-        availability_color = self.colors["success"] if car["available"] > 0 else self.colors["danger"]
-        availability_text = f"{car['available']} Available" if car["available"] > 0 else "Sold Out"
-        tk.Label(card, text=availability_text, font=("Segoe UI", 9, "bold"),
-                bg="white", fg=availability_color).place(x=280, y=35)
+        # Badges (placed when needed)
+        card.featured_badge = tk.Label(card, text="⭐ Featured", font=("Segoe UI", 8, "bold"),
+                                       bg=self.colors["warning"], fg="white", padx=6, pady=2)
+        card.electric_badge = tk.Label(card, text="⚡ Electric", font=("Segoe UI", 8, "bold"),
+                                       bg=self.colors["electric"], fg="white", padx=6, pady=2)
+        card.discount_badge = tk.Label(card, font=("Segoe UI", 8, "bold"),
+                                       bg=self.colors["danger"], fg="white", padx=6, pady=2)
+        card.availability_label = tk.Label(card, font=("Segoe UI", 9, "bold"), bg="white")
+        card.availability_label.place(x=280, y=35)
         
         content = tk.Frame(card, bg="white", padx=15, pady=15)
         content.pack(fill="both", expand=True)
         
-        tk.Label(content, text=car["name"], font=("Segoe UI", 14, "bold"),
-                bg="white", fg=self.colors["dark"], wraplength=280).pack(anchor="w")
+        card.name_label = tk.Label(content, font=("Segoe UI", 14, "bold"),
+                                   bg="white", fg=self.colors["dark"], wraplength=280)
+        card.name_label.pack(anchor="w")
         
-        tk.Label(content, text=car["model"], font=("Segoe UI", 10),
-                bg="white", fg=self.colors["text_light"]).pack(anchor="w", pady=(2, 10))
+        card.model_label = tk.Label(content, font=("Segoe UI", 10),
+                                    bg="white", fg=self.colors["text_light"])
+        card.model_label.pack(anchor="w", pady=(2, 10))
         
         rating_frame = tk.Frame(content, bg="white")
         rating_frame.pack(anchor="w", pady=(0, 10))
@@ -808,29 +815,87 @@ class CarRentalApp:
         stars_frame = tk.Frame(rating_frame, bg="white")
         stars_frame.pack(side="left")
         
-        rating = car["rating"]
+        card.star_labels = []
         for i in range(5):
-            star = "★" if i < int(rating) else "☆"
-            color = self.colors["secondary"] if i < int(rating) else "#e2e8f0"
-            tk.Label(stars_frame, text=star, font=("Segoe UI", 12),
-                    bg="white", fg=color).pack(side="left")
+            star = tk.Label(stars_frame, font=("Segoe UI", 12), bg="white")
+            star.pack(side="left")
+            card.star_labels.append(star)
         
-        tk.Label(rating_frame, text=f" {rating:.1f}", font=("Segoe UI", 11, "bold"),
-                bg="white", fg=self.colors["dark"]).pack(side="left", padx=(5, 10))
+        card.rating_label = tk.Label(rating_frame, font=("Segoe UI", 11, "bold"),
+                                     bg="white", fg=self.colors["dark"])
+        card.rating_label.pack(side="left", padx=(5, 10))
         
-        tk.Label(rating_frame, text=f"({car['reviews']:,})", font=("Segoe UI", 10),
-                bg="white", fg=self.colors["text_light"]).pack(side="left")
+        card.reviews_label = tk.Label(rating_frame, font=("Segoe UI", 10),
+                                      bg="white", fg=self.colors["text_light"])
+        card.reviews_label.pack(side="left")
         
         info_frame = tk.Frame(content, bg="white")
         info_frame.pack(fill="x", pady=(10, 0))
         
+        card.original_label = tk.Label(info_frame, font=("Segoe UI", 11, "overstrike"),
+                                       bg="white", fg=self.colors["text_light"])
+        card.rate_label = tk.Label(info_frame, font=("Segoe UI", 16, "bold"),
+                                   bg="white", fg=self.colors["secondary"])
+        card.rate_label.pack(side="left")
+        
+        card.category_label = tk.Label(info_frame, font=("Segoe UI", 14),
+                                       bg="white", fg=self.colors["primary"])
+        card.category_label.pack(side="right")
+        
+        card.details_button = tk.Button(content, text="View Details",
+                                        font=("Segoe UI", 11),
+                                        bg=self.colors["secondary"], fg=self.colors["light"],
+                                        relief="flat", cursor="hand2",
+                                        padx=15, pady=8)
+        card.details_button.pack(fill="x", pady=(15, 0))
+        
+        return card
+    
+    def fill_car_card(self, card, car):
+        """Show car in an existing car card"""
+        # Placeholder first, the real picture is decoded in the background
+        photo = self.create_car_placeholder_image()
+        card.image_label.config(image=photo)
+        card.image_label.image = photo
+        load_photo_async(card.image_label, self.get_car_image_path(car), (350, 180))
+        
+        if car.get("is_featured"):
+            card.featured_badge.place(x=10, y=10)
+        else:
+            card.featured_badge.place_forget()
+        
+        if car["is_electric"]:
+            card.electric_badge.place(x=10, y=35)
+        else:
+            card.electric_badge.place_forget()
+        
         if car["discount"] > 0:
-            tk.Label(info_frame, text=f"RM {car['original_rate']}", 
-                    font=("Segoe UI", 11, "overstrike"),
-                    bg="white", fg=self.colors["text_light"]).pack(side="left", padx=(0, 5))
+            card.discount_badge.config(text=f"🔥 {car['discount']}% OFF")
+            card.discount_badge.place(x=280, y=10)
+        else:
+            card.discount_badge.place_forget()
         
-        tk.Label(info_frame, text=f"RM {car['daily_rate']}/day", font=("Segoe UI", 16, "bold"),
-                bg="white", fg=self.colors["secondary"]).pack(side="left")
+        availability_color = self.colors["success"] if car["available"] > 0 else self.colors["danger"]
+        availability_text = f"{car['available']} Available" if car["available"] > 0 else "Sold Out"
+        card.availability_label.config(text=availability_text, fg=availability_color)
+        
+        card.name_label.config(text=car["name"])
+        card.model_label.config(text=car["model"])
+        
+        rating = car["rating"]
+        for i, star in enumerate(card.star_labels):
+            filled = i < int(rating)
+            star.config(text="★" if filled else "☆",
+                        fg=self.colors["secondary"] if filled else "#e2e8f0")
+        card.rating_label.config(text=f" {rating:.1f}")
+        card.reviews_label.config(text=f"({car['reviews']:,})")
+        
+        if car["discount"] > 0:
+            card.original_label.config(text=f"RM {car['original_rate']}")
+            card.original_label.pack(side="left", padx=(0, 5), before=card.rate_label)
+        else:
+            card.original_label.pack_forget()
+        card.rate_label.config(text=f"RM {car['daily_rate']}/day")
         
         category_icons = {
             "Economy": "💰",
@@ -838,58 +903,31 @@ class CarRentalApp:
             "Luxury": "💎",
             "Electric": "⚡"
         }
-        tk.Label(info_frame, text=category_icons.get(car["category"], "🚗"),
-                font=("Segoe UI", 14),
-                bg="white", fg=self.colors["primary"]).pack(side="right")
-        
-        tk.Button(content, text="View Details",
-                 font=("Segoe UI", 11),
-                 bg=self.colors["secondary"], fg=self.colors["light"],
-                 relief="flat", cursor="hand2",
-                 command=lambda c=car: self.show_detail_page(c),
-                 padx=15, pady=8).pack(fill="x", pady=(15, 0))
-        
-        return card
+        card.category_label.config(text=category_icons.get(car["category"], "🚗"))
+        card.details_button.config(command=lambda c=car: self.show_detail_page(c))
     
-    def get_car_image(self, car_data):
-        """Get car image with caching"""
-        if not hasattr(self, 'image_cache'):
-            self.image_cache = {}
-        
-        car_name = car_data.get('name', '')
-        cache_key = car_name
-        
-        if cache_key in self.image_cache:
-            return self.image_cache[cache_key]
-        
+    def get_car_image_path(self, car_data):
+        """Resolve the image file for a car, or None if there is none"""
         filename = car_data.get('image_file', 'car.jpg')
-        image_path = os.path.join("images/cars", filename)
+        candidates = [os.path.join("images/cars", filename), filename]
         
-        if not os.path.exists(image_path):
-            generic_files = ["car.jpg", "car1.jpg", "car2.jpg", "car3.jpg", "car4.jpg"]
-            for file in generic_files:
-                alt_path = os.path.join("images/cars", file)
-                if os.path.exists(alt_path):
-                    image_path = alt_path
-                    break
-            else:
-                for file in generic_files:
-                    alt_path = os.path.join("images", file)
-                    if os.path.exists(alt_path):
-                        image_path = alt_path
-                        break
+        generic_files = ["car.jpg", "car1.jpg", "car2.jpg", "car3.jpg", "car4.jpg"]
+        candidates += [os.path.join("images/cars", file) for file in generic_files]
+        candidates += [os.path.join("images", file) for file in generic_files]
         
-        try:
-            img = Image.open(image_path)
-            img = img.resize((350, 180), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            self.image_cache[cache_key] = photo
-            return photo
-        except Exception as e:
-            return self.create_car_placeholder_image()
+        return get_image_service().find_image(candidates)
+    
+    def get_car_image(self, car_data):
+        """Get car image from the shared image service"""
+        image_path = self.get_car_image_path(car_data)
+        photo = load_photo(image_path, (350, 180)) if image_path else None
+        return photo or self.create_car_placeholder_image()
     
     def create_car_placeholder_image(self):
         """Create a placeholder image for cars when image is not available"""
+        if self.placeholder_photo is not None:
+            return self.placeholder_photo
+        
         img = Image.new('RGB', (350, 180), color='#3498db')
         draw = ImageDraw.Draw(img)
         
@@ -908,7 +946,8 @@ class CarRentalApp:
         except:
             draw.text((175, 140), "Car Image", fill='white', anchor="mm")
         
-        return ImageTk.PhotoImage(img)
+        self.placeholder_photo = ImageTk.PhotoImage(img)
+        return self.placeholder_photo
     
     def on_price_change(self, value):
         """Handle price filter change"""
@@ -927,6 +966,27 @@ class CarRentalApp:
         self.rating_var.set(rating)
         self.filter_cars()
     
+    def build_car_index(self):
+        """Index the numeric car fields used by filters and sorting"""
+        return CatalogIndex(
+            self.cars,
+            columns={
+                "daily_rate": lambda c: c["daily_rate"],
+                "rating": lambda c: c["rating"],
+                "popularity": lambda c: c.get("popularity", 0),
+            },
+            sort_keys={"popularity": "popularity"},
+            groups={"category": lambda c: c["category"]},
+        )
+    
+    def build_car_search(self):
+        """Full-text index over the fields the search box looks at"""
+        return SearchIndex(self.cars, fields=[
+            (lambda c: c["name"], 3),
+            (lambda c: c["model"], 2),
+            (lambda c: c["category"], 2),
+        ])
+    
     def filter_cars(self, *args):
         """Filter cars based on criteria"""
         min_price = self.min_price_var.get()
@@ -935,30 +995,20 @@ class CarRentalApp:
         min_rating = self.rating_var.get()
         search_text = self.search_entry.get().lower()
         
-        filtered = []
-        for car in self.cars:
-            if not (min_price <= car["daily_rate"] <= max_price):
-                continue
-            
-            if car_type != "all" and car["category"] != car_type:
-                continue
-            
-            if car["rating"] < min_rating:
-                continue
-            
-            if search_text and search_text != "search cars...":
-                search_match = (search_text in car["name"].lower() or
-                              search_text in car["model"].lower() or
-                              search_text in car["category"].lower())
-                if not search_match:
-                    continue
-            
-            filtered.append(car)
+        matches = None
+        if search_text != "search cars...":
+            matches = self.car_search.positions(search_text)
         
-        filtered.sort(key=lambda x: x.get("popularity", 0), reverse=True)
+        filtered = self.car_index.select(
+            ranges={"daily_rate": (min_price, max_price), "rating": (min_rating, None)},
+            equals={"category": {car_type}} if car_type != "all" else None,
+            within=matches,
+            sort_by="popularity",
+            reverse=True,
+        )
         
         self.filtered_cars = filtered
-        self.show_car_rental_page()
+        self.update_cars_grid()
         
         self.set_status(f"Found {len(filtered)} cars", "success")
         self.count_label.config(text=f"{len(filtered)} items")
@@ -990,24 +1040,15 @@ class CarRentalApp:
     def show_detail_page(self, car):
         """Open car_detail.py when clicking View Details"""
         try:
-            self.root.destroy()
-            
-            import car_detail
-            root = tk.Tk()
-            app = car_detail.CarDetailApp(root, car, self.email)
-            root.mainloop()
+            get_router().show("car_detail", car, self.email)
             
         except ImportError:
+            # The detail page is missing; create it and stay on this page
             self.create_car_detail_module()
             
-            root = tk.Tk()
-            app = CarRentalApp(root, self.email)
-            root.mainloop()
-            
         except Exception as e:
-            root = tk.Tk()
-            app = CarRentalApp(root, self.email)
-            root.mainloop()
+            print(f"Error opening detail page: {e}")
+            get_router().show("car_rental", self.email)
     
     def create_car_detail_module(self):
         """Create car_detail.py file if it doesn't exist"""
@@ -1174,17 +1215,9 @@ class CarDetailApp:
         if script_file == "rental.py":
             return
         
-        if os.path.exists(script_file):
+        if script_file in SCRIPTS:
             try:
-                session_data = {
-                    'email': self.email,
-                    'user_name': self.user_name
-                }
-                with open('user_session.json', 'w') as f:
-                    json.dump(session_data, f)
-                
-                self.root.destroy()
-                subprocess.Popen(["python", script_file])
+                navigate(script_file, self.email, self.user_name)
             except Exception as e:
                 messagebox.showerror("Error", f"Cannot open {script_file}: {str(e)}")
         else:
@@ -1201,24 +1234,28 @@ class CarDetailApp:
         return "break"
     
     def on_mousewheel(self, event):
+        canvas = self.canvas
+        widget = self.root.winfo_containing(event.x_root, event.y_root)
+        while widget is not None:
+            if isinstance(widget, tk.Canvas):
+                canvas = widget
+                break
+            widget = widget.master
+        
         if event.delta > 0:
-            self.canvas.yview_scroll(-1, "units")
+            canvas.yview_scroll(-1, "units")
         else:
-            self.canvas.yview_scroll(1, "units")
+            canvas.yview_scroll(1, "units")
 
 
 def main():
     """Main function for independent execution"""
-    root = tk.Tk()
-    
     if len(sys.argv) > 2:
         email = sys.argv[1]
         user_name = sys.argv[2]
-        app = CarRentalApp(root, email)
+        run("car_rental", email)
     else:
-        app = CarRentalApp(root, "user@example.com")
-    
-    root.mainloop()
+        run("car_rental", "user@example.com")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,144 @@
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class CatalogIndex:
+    """Column-oriented index over a list of catalog items (hotels, cars, ...).
+
+    Numeric fields are extracted once when the index is built and stored in
+    compact arrays, so filters never re-parse strings such as "RM 1,250" or
+    "★★★★". Each column also keeps its item positions sorted by value, which
+    turns a range filter into two bisects, and group fields (category, type)
+    map each value to its positions. Sort keys get a presorted permutation
+    and a rank array per direction, so ordering a filtered result compares
+    plain integers instead of re-evaluating the sort key.
+
+    Values that cannot be extracted are stored as NaN and never match a range
+    unless the caller asks for them with keep_missing.
+    """
+
+    def __init__(self, items, columns, sort_keys=None, groups=None):
+        self.items = list(items)
+        size = len(self.items)
+
+        self.columns = {}
+        self._sorted = {}    # column -> (positions sorted by value, sorted values)
+        self._missing = {}   # column -> positions without a value
+        for name, extract in columns.items():
+            values = array('d', (self._number(extract, item) for item in self.items))
+            present = [i for i in range(size) if not math.isnan(values[i])]
+            present.sort(key=values.__getitem__)
+            self.columns[name] = values
+            self._sorted[name] = (array('l', present), array('d', (values[i] for i in present)))
+            self._missing[name] = array('l', (i for i in range(size) if math.isnan(values[i])))
+
+        self.groups = {}     # group field -> {value: positions}
+        for name, extract in (groups or {}).items():
+            buckets = {}
+            for index, item in enumerate(self.items):
+                buckets.setdefault(extract(item), array('l')).append(index)
+            self.groups[name] = buckets
+
+        self._orders = {}    # (sort key, reverse) -> permutation
+        self._ranks = {}     # (sort key, reverse) -> position of each item in that permutation
+        for name, key in (sort_keys or {}).items():
+            if isinstance(key, str):
+                keys = [self._sort_value(v) for v in self.columns[key]]
+            else:
+                keys = [key(item) for item in self.items]
+            for reverse in (False, True):
+                order = array('l', sorted(range(size), key=keys.__getitem__, reverse=reverse))
+                rank = array('l', bytes(order.itemsize * size))
+                for position, index in enumerate(order):
+                    rank[index] = position
+                self._orders[(name, reverse)] = order
+                self._ranks[(name, reverse)] = rank
+
+    def __len__(self):
+        return len(self.items)
+
+    @staticmethod
+    def _number(extract, item):
+        try:
+            return float(extract(item))
+        except (TypeError, ValueError, KeyError, AttributeError, IndexError):
+            return math.nan
+
+    @staticmethod
+    def _sort_value(value):
+        return -math.inf if math.isnan(value) else value
+
+    # ==================== FILTERING ====================
+    def range_positions(self, name, low=None, high=None):
+        """Positions whose column value lies in [low, high]; None leaves a side open"""
+        positions, values = self._sorted[name]
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return positions[start:end]
+
+    def group_positions(self, name, values):
+        """Positions whose group field equals one of values"""
+        buckets = self.groups[name]
+        if len(values) == 1:
+            return buckets.get(next(iter(values)), array('l'))
+        positions = array('l')
+        for value in values:
+            positions.extend(buckets.get(value, ()))
+        return positions
+
+    def select_positions(self, ranges=None, where=None, keep_missing=(), equals=None, within=None):
+        """Positions matching every (low, high) range, every equals group and where(item)
+
+        within optionally restricts the result to a set of positions, such as
+        the matches of a SearchIndex built over the same item list.
+        """
+        size = len(self.items)
+        candidates = []
+        for name, bounds in (ranges or {}).items():
+            if bounds is None or bounds == (None, None):
+                continue
+            positions = self.range_positions(name, *bounds)
+            if name in keep_missing:
+                positions = positions + self._missing[name]
+            if len(positions) < size:
+                candidates.append(positions)
+        for name, values in (equals or {}).items():
+            if values is not None:
+                candidates.append(self.group_positions(name, values))
+        if within is not None:
+            candidates.append(within)
+
+        if not candidates:
+            selected = range(size)
+        else:
+            # Intersect from the narrowest candidate list upwards
+            candidates.sort(key=len)
+            selected = set(candidates[0])
+            for positions in candidates[1:]:
+                if not selected:
+                    break
+                selected.intersection_update(positions)
+
+        if where is not None:
+            items = self.items
+            selected = [i for i in selected if where(items[i])]
+        return selected
+
+    # ==================== ORDERING ====================
+    def order_positions(self, positions, sort_by=None, reverse=False):
+        """Return positions in sort_by order (catalog order when sort_by is None)"""
+        size = len(self.items)
+        if sort_by is None:
+            return positions if isinstance(positions, range) else sorted(positions)
+
+        if len(positions) == size:
+            return self._orders[(sort_by, reverse)]
+        return sorted(positions, key=self._ranks[(sort_by, reverse)].__getitem__)
+
+    def select(self, ranges=None, where=None, sort_by=None, reverse=False,
+               keep_missing=(), equals=None, within=None):
+        """Filter and sort in one call, returning the matching items"""
+        positions = self.select_positions(ranges, where, keep_missing, equals, within)
+        items = self.items
+        return [items[i] for i in self.order_positions(positions, sort_by, reverse)]
@@ -0,0 +1,249 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+AMOUNT_PATTERN = re.compile(r"(\d[\d,]*(?:\.\d+)?)")
+
+
+def parse_amount(value):
+    """Split a display price such as "RM 1,250" or "¥ 1,000-3,000" into (currency, amount)
+
+    Ranges yield their lower bound. Returns ("", None) when there is no number.
+    """
+    if isinstance(value, (int, float)):
+        return "", float(value)
+    text = str(value or "")
+    match = AMOUNT_PATTERN.search(text)
+    if not match:
+        return "", None
+    currency = text[:match.start()].strip()
+    return currency, float(match.group(1).replace(",", ""))
+
+
+class CatalogRecord(NamedTuple):
+    """One catalog item with its searchable fields typed and the full item in data"""
+    kind: str
+    item_id: str
+    name: str
+    city: str
+    category: str
+    price: Optional[float]
+    currency: str
+    rating: Optional[float]
+    position: int
+    data: Dict
+
+    @classmethod
+    def from_item(cls, kind, item, position, city=None, category=None, price=None):
+        """Build a record from a page's item dict, deriving the typed columns"""
+        if price is None:
+            for field in ("price", "daily_rate", "price_per_day", "price_range"):
+                if field in item:
+                    price = item[field]
+                    break
+        currency, amount = parse_amount(price)
+        try:
+            rating = float(item.get("rating"))
+        except (TypeError, ValueError):
+            rating = None
+        return cls(
+            kind=kind,
+            item_id=str(item.get("id", position)),
+            name=str(item.get("name", "")),
+            city=city if city is not None else str(item.get("city", item.get("location", ""))),
+            category=category if category is not None else str(item.get("category", "")),
+            price=amount,
+            currency=item["currency"] if isinstance(item.get("currency"), str) else currency,
+            rating=rating,
+            position=position,
+            data=item,
+        )
+
+
+class CatalogStore:
+    """Local SQLite store for the hotel, flight, attraction and car catalogs.
+
+    Every item is one row: the fields used for lookups (city, category,
+    numeric price, rating) are real columns with indexes, and the item dict
+    the pages work with is kept as JSON next to them. Pages read their
+    catalog with load_or_seed(): the first run (or a bumped version) writes
+    the built-in defaults, later runs only read the database. Large catalogs
+    can be imported with replace() and browsed with page(), which filters and
+    pages in SQL instead of loading every row.
+    """
+
+    ORDER_COLUMNS = {"position", "price", "rating", "name"}
+
+    def __init__(self, db_path=None):
+        if db_path is None:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            db_path = os.path.join(base_dir, "traney_catalog.db")
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.create_schema()
+
+    def create_schema(self):
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS catalog (
+                    row_id   INTEGER PRIMARY KEY,
+                    kind     TEXT NOT NULL,
+                    item_id  TEXT NOT NULL,
+                    name     TEXT NOT NULL DEFAULT '',
+                    city     TEXT NOT NULL DEFAULT '',
+                    category TEXT NOT NULL DEFAULT '',
+                    price    REAL,
+                    currency TEXT NOT NULL DEFAULT '',
+                    rating   REAL,
+                    position INTEGER NOT NULL,
+                    data     TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS catalog_kind_position ON catalog (kind, position);
+                CREATE INDEX IF NOT EXISTS catalog_kind_city ON catalog (kind, city, position);
+                CREATE INDEX IF NOT EXISTS catalog_kind_category ON catalog (kind, category, position);
+                CREATE INDEX IF NOT EXISTS catalog_kind_price ON catalog (kind, price);
+                CREATE TABLE IF NOT EXISTS catalog_versions (
+                    kind    TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL
+                );
+            """)
+
+    def close(self):
+        self._conn.close()
+
+    # ==================== WRITING ====================
+    def version(self, kind):
+        """Version of the stored catalog for kind, or None if it was never written"""
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM catalog_versions WHERE kind = ?",
+                                     (kind,)).fetchone()
+        return row[0] if row else None
+
+    def replace(self, kind, records, version=1):
+        """Replace every row of kind with records in one transaction"""
+        rows = [(r.kind, r.item_id, r.name, r.city, r.category, r.price, r.currency,
+                 r.rating, r.position, json.dumps(r.data, ensure_ascii=False))
+                for r in records]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM catalog WHERE kind = ?", (kind,))
+            self._conn.executemany(
+                "INSERT INTO catalog (kind, item_id, name, city, category, price, currency, "
+                "rating, position, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("INSERT OR REPLACE INTO catalog_versions (kind, version) VALUES (?, ?)",
+                               (kind, version))
+
+    def load_or_seed(self, kind, version, seed):
+        """Return every record of kind, writing seed() first if the store is missing or outdated"""
+        if self.version(kind) != version:
+            self.replace(kind, seed(), version)
+        return self.query(kind)
+
+    # ==================== READING ====================
+    def _where(self, kind, city=None, category=None, min_price=None, max_price=None):
+        clauses, params = ["kind = ?"], [kind]
+        if city is not None:
+            clauses.append("city = ?")
+            params.append(city)
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        if min_price is not None:
+            clauses.append("price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            clauses.append("price <= ?")
+            params.append(max_price)
+        return " AND ".join(clauses), params
+
+    def query(self, kind, city=None, category=None, min_price=None, max_price=None,
+              order_by="position", descending=False, limit=None, offset=0) -> List[CatalogRecord]:
+        """Records of kind matching the filters, in order_by order"""
+        if order_by not in self.ORDER_COLUMNS:
+            raise ValueError(f"Cannot order catalog by {order_by!r}")
+        where, params = self._where(kind, city, category, min_price, max_price)
+        sql = (f"SELECT kind, item_id, name, city, category, price, currency, rating, position, data "
+               f"FROM catalog WHERE {where} ORDER BY {order_by} {'DESC' if descending else 'ASC'}, position")
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [CatalogRecord(*row[:9], json.loads(row[9])) for row in rows]
+
+    def count(self, kind, city=None, category=None, min_price=None, max_price=None):
+        """Number of records of kind matching the filters"""
+        where, params = self._where(kind, city, category, min_price, max_price)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM catalog WHERE {where}", params).fetchone()[0]
+
+    def page(self, kind, page=0, page_size=50, **filters):
+        """(records, total) for one page of a filtered catalog"""
+        order_by = filters.pop("order_by", "position")
+        descending = filters.pop("descending", False)
+        records = self.query(kind, order_by=order_by, descending=descending,
+                             limit=page_size, offset=page * page_size, **filters)
+        return records, self.count(kind, **filters)
+
+    def cities(self, kind, category=None):
+        """Distinct cities of kind in catalog order"""
+        where, params = self._where(kind, category=category)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT city FROM catalog WHERE {where} "
+                                      f"GROUP BY city ORDER BY MIN(position)", params).fetchall()
+        return [row[0] for row in rows]
+
+
+_store = None
+
+
+def get_catalog_store():
+    """Return the shared CatalogStore instance"""
+    global _store
+    if _store is None:
+        _store = CatalogStore()
+    return _store
+
+
+def load_records(kind, version, seed):
+    """Records of kind from the catalog store, written from seed() on first use
+
+    seed returns a list of CatalogRecords. If the database cannot be opened
+    the seed data is used directly, so a page still works from a read-only
+    install.
+    """
+    try:
+        return get_catalog_store().load_or_seed(kind, version, seed)
+    except sqlite3.Error as e:
+        print(f"Error reading catalog {kind}: {e}")
+        return seed()
+
+
+def load_catalog(kind, version, seed):
+    """Items of kind from the catalog store; seed returns the default item list"""
+    def records():
+        return [CatalogRecord.from_item(kind, item, position) for position, item in enumerate(seed())]
+
+    return [record.data for record in load_records(kind, version, records)]
+
+
+def load_city_catalog(kind, version, seed):
+    """Like load_catalog for catalogs grouped by city: seed returns {city: [items]}"""
+    def records():
+        position = 0
+        result = []
+        for city, items in seed().items():
+            for item in items:
+                result.append(CatalogRecord.from_item(kind, item, position, city=city))
+                position += 1
+        return result
+
+    stored = load_records(kind, version, records)
+
+    grouped = {}
+    for record in stored:
+        grouped.setdefault(record.city, []).append(record.data)
+    return grouped
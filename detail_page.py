@@ -8,6 +8,11 @@ import subprocess
 from datetime import datetime, timedelta
 import time
 import calendar as cal
+from booking_dates import normalize_dates
+from booking_record import BookingRecord
+from image_service import get_image_service, load_photo
+from json_store import write_json
+from page_router import get_router, run
 
 class DetailPage:
     def __init__(self, root, item_data, user_email=None, return_to_home=True):
@@ -50,7 +55,7 @@ class DetailPage:
             "electric": "#48bb78",
         }
         
-        # Image cache
+        # Placeholder cache (real images live in the shared image service)
         self.image_cache = {}
         
         # Initialize price label
@@ -925,11 +930,7 @@ class DetailPage:
             self.price_label.config(text="FREE")
     
     def load_image(self, filename: str, size: tuple = (300, 200)) -> ImageTk.PhotoImage:
-        """Load image from local file"""
-        cache_key = f"{filename}_{size[0]}_{size[1]}"
-        if cache_key in self.image_cache:
-            return self.image_cache[cache_key]
-        
+        """Load image from local file through the shared image service"""
         try:
             # Determine default image directory based on category
             category = self.item_data.get('category', 'general')
@@ -974,21 +975,11 @@ class DetailPage:
                 possible_paths.append(os.path.join("images", file))
             
             # Try all possible paths
-            image_path = None
-            for path in possible_paths:
-                if os.path.exists(path):
-                    image_path = path
-                    break
+            image_path = get_image_service().find_image(possible_paths)
+            photo = load_photo(image_path, size) if image_path else None
             
-            if image_path:
-                img = Image.open(image_path)
-                img = img.resize(size, Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                self.image_cache[cache_key] = photo
-                return photo
-            else:
-                # Create category-specific placeholder
-                return self.create_category_placeholder_image(size)
+            # Create category-specific placeholder if nothing could be loaded
+            return photo or self.create_category_placeholder_image(size)
                 
         except Exception as e:
             # Create category-specific placeholder
@@ -997,6 +988,9 @@ class DetailPage:
     def create_category_placeholder_image(self, size):
         """Create category-specific placeholder image"""
         category = self.item_data.get('category', 'general')
+        cache_key = f"placeholder_{category}_{size[0]}_{size[1]}"
+        if cache_key in self.image_cache:
+            return self.image_cache[cache_key]
         
         # Different colors for different categories
         category_colors = {
@@ -1072,7 +1066,6 @@ class DetailPage:
         photo = ImageTk.PhotoImage(img)
         
         # Cache placeholder image
-        cache_key = f"placeholder_{category}_{size[0]}_{size[1]}"
         self.image_cache[cache_key] = photo
         
         return photo
@@ -1234,12 +1227,20 @@ class DetailPage:
                     'best_time': self.item_data.get('best_time', '')
                 })
             
+            # Prices normalized once for the confirmation and payment pages
+            nights = booking_data.get('nights', 1) if category == 'hotel' else 1
+            booking_data['pricing'] = BookingRecord(
+                {'car': 'car_rental', 'general': 'attraction'}.get(category, category),
+                self.item_data.get('discount_price') or self.item_data.get('price', 0),
+                self.quantity_var.get() * nights,
+                total=booking_data['total_price'], currency=booking_data['currency']).to_dict()
+            normalize_dates(booking_data, 'detail')
+            
             # Save as temporary file
             temp_dir = tempfile.gettempdir()
             temp_file = os.path.join(temp_dir, f"traney_booking_{int(time.time())}.json")
             
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(booking_data, f, indent=2, ensure_ascii=False)
+            write_json(temp_file, booking_data, lock=False)
             
             print(f"Booking data saved to: {temp_file}")
             print(f"Data for booking_detail.py: {json.dumps(booking_data, indent=2)}")
@@ -1276,25 +1277,9 @@ class DetailPage:
             self.root.destroy()
     
     def return_to_home_app(self):
-        """Return to home.py"""
+        """Return to the home page in the same window"""
         try:
-            # Save return information
-            if not os.path.exists('temp'):
-                os.makedirs('temp')
-            
-            return_info = {
-                'from_detail': True,
-                'timestamp': 'returned_from_detail'
-            }
-            
-            return_file = os.path.join('temp', 'return_info.json')
-            with open(return_file, 'w', encoding='utf-8') as f:
-                json.dump(return_info, f, indent=2, ensure_ascii=False)
-            
-            # Close current window and launch home.py
-            self.root.destroy()
-            subprocess.Popen(["python", "home.py"])
-            
+            get_router().show("home", self.user_email)
         except Exception as e:
             print(f"Error returning to home: {e}")
             self.root.destroy()
@@ -1326,9 +1311,7 @@ def main():
         item_data = load_item_data_from_json(json_file)
         
         if item_data:
-            root = tk.Tk()
-            app = DetailPage(root, item_data, return_to_home=True)
-            root.mainloop()
+            run("detail", item_data, return_to_home=True)
         else:
             print("Failed to load item data.")
     else:
@@ -1,10 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from tkcalendar import Calendar
-import os, json, datetime, sys
+import os, json, datetime
 from flight_detail import FlightDetailPage
 from booking_detail import BookingDetailApp
 from profile import Profile
+from virtual_grid import VirtualGrid
+from catalog_index import CatalogIndex
+from booking_ledger import CONFIRMED, get_booking_ledger
+from session import get_session
+from catalog_store import CatalogRecord, load_records
+from page_router import navigate, run
 
 class Flight:
     """Main Flight Booking Application"""
@@ -13,11 +18,8 @@ class Flight:
         self.root = root
         self.email = email
         
-        # Try to load user information from session
-        if not email:
-            self.load_user_session()
-        else:
-            self.user_name = "Guest User"
+        # Fill in the user information from the session
+        self.load_user_session()
         
         self.root.title("Traney - Flight Booking")
         self.root.attributes('-fullscreen', True)
@@ -34,7 +36,7 @@ class Flight:
         
         # Load data
         self.user_data = self.load_user_data()
-        self.flight_data = self.get_default_flight_data()
+        self.flight_data = self.load_flight_data()
         
         # Current state variables
         self.current_page = "main"
@@ -106,20 +108,10 @@ class Flight:
         return color
 
     def load_user_session(self):
-        """Load user information from session file"""
-        session_file = 'user_session.json'
-        if os.path.exists(session_file):
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                    self.email = session_data.get('email', 'user@example.com')
-                    self.user_name = session_data.get('user_name', 'Guest User')
-            except:
-                self.email = 'user@example.com'
-                self.user_name = 'Guest User'
-        else:
-            self.email = 'user@example.com'
-            self.user_name = 'Guest User'
+        """Fill in user information that was not passed in from the current session"""
+        session = get_session()
+        self.email = self.email or session.email or 'user@example.com'
+        self.user_name = getattr(self, 'user_name', None) or session.user_name or 'Guest User'
 
     def init_variables(self):
         """Initialize tkinter variables"""
@@ -141,6 +133,8 @@ class Flight:
         self.cities = self.flight_data.get("cities", ["Select destination", "Singapore", "Bangkok", "Tokyo", "Seoul"])
         
         self.current_displayed_flights = []
+        self.flight_index = None
+        self.flight_index_source = None
 
     def parse_price(self, price_str):
         """Parse price string to float"""
@@ -149,6 +143,44 @@ class Flight:
         except:
             return 0.0
 
+    def load_flight_data(self):
+        """Load the flight catalog from the local catalog store
+        
+        Rows are stored with the section they belong to as category
+        ("recommended", "destination" or a category_flights key) and the
+        destination city, and regrouped into the flight_data layout here.
+        """
+        records = load_records("flight", 1, self.default_flight_records)
+        
+        flight_data = {"cities": [], "recommended_flights": [],
+                       "destination_flights": {}, "category_flights": {}}
+        for record in records:
+            if record.category == "recommended":
+                flight_data["recommended_flights"].append(record.data)
+            elif record.category == "destination":
+                flight_data["destination_flights"].setdefault(record.city, []).append(record.data)
+            else:
+                flight_data["category_flights"].setdefault(record.category, []).append(record.data)
+        flight_data["cities"] = list(flight_data["destination_flights"])
+        return flight_data
+
+    def default_flight_records(self):
+        """Catalog records for the default flight data"""
+        flight_data = self.get_default_flight_data()
+        sections = [("recommended", None, flight_data["recommended_flights"])]
+        sections += [("destination", city, flights)
+                     for city, flights in flight_data["destination_flights"].items()]
+        sections += [(category, None, flights)
+                     for category, flights in flight_data["category_flights"].items()]
+        
+        records = []
+        for category, city, flights in sections:
+            for flight in flights:
+                destination = city or flight["route"].split("→")[-1].split(",")[0].strip()
+                records.append(CatalogRecord.from_item("flight", flight, len(records),
+                                                       city=destination, category=category))
+        return records
+
     def get_default_flight_data(self):
         """Return optimized flight data structure"""
         # Base flight template for all flights
@@ -480,6 +512,11 @@ class Flight:
             self.profile_menu = None
         self.is_menu_open = False
 
+    def suspend(self):
+        """Called by the page router when another page replaces this one"""
+        if self.is_menu_open:
+            self.hide_profile_menu()
+
     def check_click_outside(self, event):
         """Check if click is outside menu"""
         if self.is_menu_open and self.profile_menu:
@@ -828,21 +865,15 @@ class Flight:
         self.sort_combo.pack(side="left")
         self.sort_combo.bind("<<ComboboxSelected>>", lambda e: self.apply_filters())
         
-        # Scrollable flight list
-        self.canvas = tk.Canvas(parent, bg=self.colors["light"], highlightthickness=0)
-        scrollbar = tk.Scrollbar(parent, orient="vertical", command=self.canvas.yview)
-        
-        self.scrollable_frame = tk.Frame(self.canvas, bg=self.colors["light"])
-        self.scrollable_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
-        
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
-        
-        self.grid_frame = self.scrollable_frame
+        # Virtualized flight list: only the cards in view are built
+        self.flight_grid = VirtualGrid(parent, self.build_flight_card, self.fill_flight_card,
+                                       columns=1, row_height=380, padx=0, pady=10,
+                                       bg=self.colors["light"],
+                                       empty_text="No flights found matching your criteria.",
+                                       empty_fg=self.colors["text_light"])
+        self.flight_grid.pack(fill="both", expand=True, padx=(0, 5))
+        self.canvas = self.flight_grid.canvas
         self.show_recommended_flights()
-        
-        self.canvas.pack(side="left", fill="both", expand=True, padx=(0, 5))
-        scrollbar.pack(side="right", fill="y")
 
     def create_flight_section(self, parent, data_key, title, parent_key="flight_data"):
         """Create a generic flight section"""
@@ -864,28 +895,21 @@ class Flight:
                     fg=self.colors["text_light"]).pack(pady=50)
             return
         
-        # Create scrollable flight list
-        canvas_frame = tk.Frame(container, bg=self.colors["light"])
-        canvas_frame.pack(fill="both", expand=True)
-        
-        canvas = tk.Canvas(canvas_frame, bg=self.colors["light"], highlightthickness=0)
-        scrollbar = tk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        
-        scrollable_frame = tk.Frame(canvas, bg=self.colors["light"])
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        for flight in flights:
-            card = self.create_flight_card(scrollable_frame, flight)
-            card.pack(fill="x", pady=10)
-        
-        canvas.pack(side="left", fill="both", expand=True, padx=(0, 5))
-        scrollbar.pack(side="right", fill="y")
+        # Virtualized flight list
+        flight_grid = VirtualGrid(container, self.build_flight_card, self.fill_flight_card,
+                                  columns=1, row_height=380, padx=0, pady=10,
+                                  bg=self.colors["light"])
+        flight_grid.pack(fill="both", expand=True, padx=(0, 5))
+        flight_grid.set_items(flights)
 
     def create_flight_card(self, parent, flight_data, is_promo=False):
         """Create a flight card for display"""
+        card = self.build_flight_card(parent, is_promo)
+        self.fill_flight_card(card, flight_data)
+        return card
+
+    def build_flight_card(self, parent, is_promo=False):
+        """Build an empty flight card whose widgets are filled by fill_flight_card"""
         card_bg = "#ffffff" if not is_promo else "#f8f9ff"
         card = tk.Frame(parent, bg=card_bg, relief="flat",
                        highlightbackground=self.colors["border"], highlightthickness=1,
@@ -899,50 +923,28 @@ class Flight:
         airline_frame = tk.Frame(top_frame, bg=card_bg)
         airline_frame.pack(side="left")
         
-        # Get airline icon
-        airline_icons = {
-            "Malaysia": "🇲🇾", "Singapore": "🇸🇬", "AirAsia": "🔴",
-            "Thai": "🇹🇭", "Japan": "🇯🇵", "Cathay": "🇭🇰"
-        }
-        icon = "✈️"
-        for key in airline_icons:
-            if key in flight_data['airline']:
-                icon = airline_icons[key]
-                break
-        
-        tk.Label(airline_frame, text=icon, font=("Arial", 16),
-                bg=card_bg, fg=self.colors["primary"]).pack(side="left", padx=(0, 8))
-        tk.Label(airline_frame, text=flight_data['airline'], font=("Arial", 14, "bold"),
-                bg=card_bg, fg=self.colors["primary"]).pack(side="left")
+        card.icon_label = tk.Label(airline_frame, font=("Arial", 16),
+                                   bg=card_bg, fg=self.colors["primary"])
+        card.icon_label.pack(side="left", padx=(0, 8))
+        card.airline_label = tk.Label(airline_frame, font=("Arial", 14, "bold"),
+                                      bg=card_bg, fg=self.colors["primary"])
+        card.airline_label.pack(side="left")
         
         # Right side: Rating and deal badge
         right_frame = tk.Frame(top_frame, bg=card_bg)
         right_frame.pack(side="right")
         
-        if flight_data.get('deal'):
-            deal_colors = {
-                "Best": "#e74c3c", "Popular": "#3498db", "Cheapest": "#27ae60",
-                "Premium": "#9b59b6", "Morning": "#f39c12"
-            }
-            deal_color = "#e74c3c"
-            for key in deal_colors:
-                if key in flight_data['deal']:
-                    deal_color = deal_colors[key]
-                    break
-            
-            tk.Label(right_frame, text=flight_data['deal'], font=("Arial", 9, "bold"),
-                    bg=deal_color, fg="white", padx=8, pady=3).pack(side="right", padx=(5, 0))
+        card.deal_label = tk.Label(right_frame, font=("Arial", 9, "bold"),
+                                   fg="white", padx=8, pady=3)
         
-        rating_frame = tk.Frame(right_frame, bg=card_bg)
-        rating_frame.pack(side="right")
-        tk.Label(rating_frame, text="⭐", font=("Arial", 12), bg=card_bg).pack(side="left")
-        tk.Label(rating_frame, text=flight_data['rating'], font=("Arial", 12, "bold"),
-                bg=card_bg, fg=self.colors["secondary"]).pack(side="left", padx=2)
+        card.rating_frame = tk.Frame(right_frame, bg=card_bg)
+        card.rating_frame.pack(side="right")
+        tk.Label(card.rating_frame, text="⭐", font=("Arial", 12), bg=card_bg).pack(side="left")
+        card.rating_label = tk.Label(card.rating_frame, font=("Arial", 12, "bold"),
+                                     bg=card_bg, fg=self.colors["secondary"])
+        card.rating_label.pack(side="left", padx=2)
         
         # Route and times
-        time_str = flight_data['time'].split(' - ')
-        departure_time, arrival_time = time_str[0] if time_str else "08:00", time_str[1] if len(time_str) > 1 else "16:00"
-        
         route_frame = tk.Frame(card, bg=card_bg)
         route_frame.pack(fill="x", pady=(0, 15))
         
@@ -950,7 +952,7 @@ class Flight:
         route_main.pack(fill="x", pady=(5, 0))
         
         # Departure
-        self.create_time_display(route_main, departure_time, "Departure", side="left", padx=10)
+        card.departure_label = self.create_time_display(route_main, "", "Departure", side="left", padx=10)
         
         # Middle flight path
         middle_frame = tk.Frame(route_main, bg=card_bg)
@@ -962,28 +964,26 @@ class Flight:
         canvas.create_line(0, 15, width, 15, fill=self.colors["border"], dash=(5, 3))
         canvas.create_text(width/2, 15, text="✈️", font=("Arial", 12))
         
-        tk.Label(middle_frame, text=f"⏱️ {flight_data['duration']}", font=("Arial", 11),
-                bg=card_bg, fg=self.colors["dark"]).pack()
+        card.duration_label = tk.Label(middle_frame, font=("Arial", 11),
+                                       bg=card_bg, fg=self.colors["dark"])
+        card.duration_label.pack()
         
         # Arrival
-        self.create_time_display(route_main, arrival_time, "Arrival", side="left", padx=10)
-        
-        # Flight details (removed passenger info)
-        details = [
-            ("🛫", f"Stops: {flight_data['stops']}", 
-             self.colors["success"] if "Non-stop" in flight_data['stops'] else self.colors["warning"]),
-            ("✈️", f"Aircraft: {flight_data['aircraft']}", self.colors["text_light"]),
-            ("🎫", f"Class: {self.class_var.get()}", self.colors["accent"]),
-        ]
+        card.arrival_label = self.create_time_display(route_main, "", "Arrival", side="left", padx=10)
         
+        # Flight details (stops, aircraft, class)
         info_frame = tk.Frame(card, bg=card_bg)
         info_frame.pack(fill="x", pady=(15, 20))
         
-        for i, (icon, text, color) in enumerate(details):
+        card.detail_labels = []
+        for i, icon in enumerate(["🛫", "✈️", "🎫"]):
             frame = tk.Frame(info_frame, bg=card_bg)
             frame.grid(row=i//2, column=i%2, padx=10, pady=5, sticky="w")
-            tk.Label(frame, text=icon, font=("Arial", 12), bg=card_bg, fg=color).pack(side="left", padx=(0, 5))
-            tk.Label(frame, text=text, font=("Arial", 11), bg=card_bg, fg=self.colors["dark"]).pack(side="left")
+            icon_label = tk.Label(frame, text=icon, font=("Arial", 12), bg=card_bg)
+            icon_label.pack(side="left", padx=(0, 5))
+            text_label = tk.Label(frame, font=("Arial", 11), bg=card_bg, fg=self.colors["dark"])
+            text_label.pack(side="left")
+            card.detail_labels.append((icon_label, text_label))
         
         # Bottom section: Price and button
         bottom_frame = tk.Frame(card, bg=card_bg)
@@ -993,54 +993,123 @@ class Flight:
         price_frame.pack(side="left")
         
         # Original price if discounted
+        card.original_frame = tk.Frame(price_frame, bg=card_bg)
+        card.original_label = tk.Label(card.original_frame, font=("Arial", 12),
+                                       bg=card_bg, fg=self.colors["text_light"])
+        card.original_label.pack(side="left")
+        card.discount_label = tk.Label(card.original_frame, font=("Arial", 10, "bold"),
+                                       bg=self.colors["success"], fg="white", padx=5, pady=1)
+        card.discount_label.pack(side="left", padx=5)
+        
+        # Current price
+        card.price_label = tk.Label(price_frame, font=("Arial", 24, "bold"),
+                                    bg=card_bg, fg=self.colors["secondary"])
+        card.price_label.pack(anchor="w")
+        
+        # Price per person
+        card.per_person_label = tk.Label(price_frame, font=("Arial", 10),
+                                         bg=card_bg, fg=self.colors["text_light"])
+        card.per_person_label.pack(anchor="w", pady=(2, 0))
+        
+        # Action button
+        button_frame = tk.Frame(bottom_frame, bg=card_bg)
+        button_frame.pack(side="right")
+        
+        card.details_button = tk.Button(button_frame, text="View Details →", font=("Arial", 12, "bold"),
+                                        bg=self.colors["primary"], fg="white", relief="flat", cursor="hand2",
+                                        padx=25, pady=10)
+        card.details_button.pack()
+        
+        return card
+
+    def fill_flight_card(self, card, flight_data):
+        """Show flight_data in an existing flight card"""
+        # Get airline icon
+        airline_icons = {
+            "Malaysia": "🇲🇾", "Singapore": "🇸🇬", "AirAsia": "🔴",
+            "Thai": "🇹🇭", "Japan": "🇯🇵", "Cathay": "🇭🇰"
+        }
+        icon = "✈️"
+        for key in airline_icons:
+            if key in flight_data['airline']:
+                icon = airline_icons[key]
+                break
+        
+        card.icon_label.config(text=icon)
+        card.airline_label.config(text=flight_data['airline'])
+        
+        if flight_data.get('deal'):
+            deal_colors = {
+                "Best": "#e74c3c", "Popular": "#3498db", "Cheapest": "#27ae60",
+                "Premium": "#9b59b6", "Morning": "#f39c12"
+            }
+            deal_color = "#e74c3c"
+            for key in deal_colors:
+                if key in flight_data['deal']:
+                    deal_color = deal_colors[key]
+                    break
+            
+            card.deal_label.config(text=flight_data['deal'], bg=deal_color)
+            card.deal_label.pack(side="right", padx=(5, 0), before=card.rating_frame)
+        else:
+            card.deal_label.pack_forget()
+        
+        card.rating_label.config(text=flight_data['rating'])
+        
+        # Route and times
+        time_str = flight_data['time'].split(' - ')
+        departure_time, arrival_time = time_str[0] if time_str else "08:00", time_str[1] if len(time_str) > 1 else "16:00"
+        card.departure_label.config(text=departure_time)
+        card.arrival_label.config(text=arrival_time)
+        card.duration_label.config(text=f"⏱️ {flight_data['duration']}")
+        
+        # Flight details (removed passenger info)
+        details = [
+            (f"Stops: {flight_data['stops']}", 
+             self.colors["success"] if "Non-stop" in flight_data['stops'] else self.colors["warning"]),
+            (f"Aircraft: {flight_data['aircraft']}", self.colors["text_light"]),
+            (f"Class: {self.class_var.get()}", self.colors["accent"]),
+        ]
+        for (icon_label, text_label), (text, color) in zip(card.detail_labels, details):
+            icon_label.config(fg=color)
+            text_label.config(text=text)
+        
+        # Original price if discounted
+        card.original_frame.pack_forget()
         if flight_data.get('original_price') and flight_data['price'] != flight_data['original_price']:
             original = flight_data['original_price'].replace('RM ', '').replace(',', '')
             current = flight_data['price'].replace('RM ', '').replace(',', '')
             try:
                 discount = int((1 - float(current) / float(original)) * 100)
-                
-                original_frame = tk.Frame(price_frame, bg=card_bg)
-                original_frame.pack(anchor="w", pady=(0, 2))
-                
-                tk.Label(original_frame, text=f"RM {original}", font=("Arial", 12),
-                        bg=card_bg, fg=self.colors["text_light"]).pack(side="left")
-                
-                tk.Label(original_frame, text=f"-{discount}%", font=("Arial", 10, "bold"),
-                        bg=self.colors["success"], fg="white", padx=5, pady=1).pack(side="left", padx=5)
+                card.original_label.config(text=f"RM {original}")
+                card.discount_label.config(text=f"-{discount}%")
+                card.original_frame.pack(anchor="w", pady=(0, 2), before=card.price_label)
             except:
                 pass
         
         # Current price
-        tk.Label(price_frame, text=flight_data['price'], font=("Arial", 24, "bold"),
-                bg=card_bg, fg=self.colors["secondary"]).pack(anchor="w")
+        card.price_label.config(text=flight_data['price'])
         
         # Price per person
         try:
             per_person = self.parse_price(flight_data['price']) / self.adult_count
-            tk.Label(price_frame, text=f"≈ RM {per_person:.0f} per person", font=("Arial", 10),
-                    bg=card_bg, fg=self.colors["text_light"]).pack(anchor="w", pady=(2, 0))
+            card.per_person_label.config(text=f"≈ RM {per_person:.0f} per person")
         except:
-            pass
-        
-        # Action button
-        button_frame = tk.Frame(bottom_frame, bg=card_bg)
-        button_frame.pack(side="right")
+            card.per_person_label.config(text="")
         
-        tk.Button(button_frame, text="View Details →", font=("Arial", 12, "bold"),
-                 bg=self.colors["primary"], fg="white", relief="flat", cursor="hand2",
-                 padx=25, pady=10, command=lambda f=flight_data: self.show_flight_details(f)).pack()
-        
-        return card
+        card.details_button.config(command=lambda f=flight_data: self.show_flight_details(f))
 
     def create_time_display(self, parent, time, label, side="left", padx=0):
         """Create time display widget"""
         frame = tk.Frame(parent, bg=parent.cget("bg"))
         frame.pack(side=side, padx=padx)
         
-        tk.Label(frame, text=time, font=("Arial", 18, "bold"),
-                bg=frame.cget("bg"), fg=self.colors["dark"]).pack()
+        time_label = tk.Label(frame, text=time, font=("Arial", 18, "bold"),
+                              bg=frame.cget("bg"), fg=self.colors["dark"])
+        time_label.pack()
         tk.Label(frame, text=label, font=("Arial", 10),
                 bg=frame.cget("bg"), fg=self.colors["text_light"]).pack()
+        return time_label
 
     # Passenger counter methods
     def increase_adult(self):
@@ -1086,7 +1155,8 @@ class Flight:
         else:
             mindate = today
         
-        # Create calendar
+        # Create calendar; tkcalendar loads babel, so it is only imported once a picker opens
+        from tkcalendar import Calendar
         cal = Calendar(cal_window, selectmode='day', mindate=mindate, date_pattern='dd-mm-yyyy')
         cal.pack(pady=20, padx=10)
         
@@ -1156,53 +1226,60 @@ class Flight:
         self.price_label.config(text=f"Max: RM {self.price_range_var.get()}")
         self.apply_filters()
 
+    def get_flight_index(self):
+        """Index of the flights currently on screen, rebuilt when that list changes"""
+        if self.flight_index is None or self.flight_index_source is not self.current_displayed_flights:
+            self.flight_index = CatalogIndex(
+                self.current_displayed_flights,
+                columns={
+                    "price": lambda f: self.parse_price(f['price']),
+                    "duration": lambda f: self.parse_duration(f['duration']),
+                    "hour": lambda f: int(f['time'].split(' - ')[0].split(':')[0]),
+                },
+                sort_keys={"price": "price", "duration": "duration"},
+            )
+            self.flight_index_source = self.current_displayed_flights
+        return self.flight_index
+
     def apply_filters(self):
         if not self.current_displayed_flights:
             return
         
-        filtered_flights = []
-        for flight in self.current_displayed_flights:
-            # Airline filter
-            if self.airline_var.get() != "All" and self.airline_var.get() not in flight['airline']:
-                continue
-            
-            # Stops filter
-            if self.stops_var.get() != "All" and self.stops_var.get() not in flight['stops']:
-                continue
-            
-            # Price filter
-            price = self.parse_price(flight['price'])
-            if price > self.price_range_var.get():
-                continue
-            
-            # Time filter
-            if self.time_var.get() != "All":
-                try:
-                    time_str = flight['time'].split(' - ')[0]
-                    hour = int(time_str.split(':')[0])
-                    time_ranges = {
-                        "Morning (6am-12pm)": (6, 12),
-                        "Afternoon (12pm-6pm)": (12, 18),
-                        "Evening (6pm-12am)": (18, 24),
-                        "Night (12am-6am)": (0, 6)
-                    }
-                    if self.time_var.get() in time_ranges:
-                        start, end = time_ranges[self.time_var.get()]
-                        if not (start <= hour < end):
-                            continue
-                except:
-                    pass
-            
-            filtered_flights.append(flight)
+        # Airline and stops are substring matches, checked per flight
+        airline = self.airline_var.get()
+        stops = self.stops_var.get()
+        def matches(flight):
+            return ((airline == "All" or airline in flight['airline']) and
+                    (stops == "All" or stops in flight['stops']))
+        
+        # Time filter
+        time_ranges = {
+            "Morning (6am-12pm)": (6, 12),
+            "Afternoon (12pm-6pm)": (12, 18),
+            "Evening (6pm-12am)": (18, 24),
+            "Night (12am-6am)": (0, 6)
+        }
+        hours = None
+        if self.time_var.get() in time_ranges:
+            start, end = time_ranges[self.time_var.get()]
+            hours = (start, end - 1)
         
         # Sort filtered flights
         sort_by = self.sort_var.get()
+        sort_key, reverse = None, False
         if sort_by.startswith("Price"):
-            reverse = "High" in sort_by
-            filtered_flights.sort(key=lambda x: self.parse_price(x['price']), reverse=reverse)
+            sort_key, reverse = "price", "High" in sort_by
         elif sort_by.startswith("Duration"):
-            reverse = "Long" in sort_by
-            filtered_flights.sort(key=lambda x: self.parse_duration(x['duration']), reverse=reverse)
+            sort_key, reverse = "duration", "Long" in sort_by
+        
+        # Flights whose departure time cannot be read are kept, as before
+        filtered_flights = self.get_flight_index().select(
+            ranges={"price": (None, self.price_range_var.get()), "hour": hours},
+            where=matches if airline != "All" or stops != "All" else None,
+            sort_by=sort_key,
+            reverse=reverse,
+            keep_missing=("hour",),
+        )
         
         self.display_flights(filtered_flights)
 
@@ -1222,23 +1299,15 @@ class Flight:
             return 0
 
     def display_flights(self, flights):
-        if not hasattr(self, 'grid_frame'):
+        if not hasattr(self, 'flight_grid'):
             return
-            
-        for widget in self.grid_frame.winfo_children():
-            widget.destroy()
         
-        if not flights:
-            tk.Label(self.grid_frame, text="No flights found matching your criteria.",
-                    font=("Arial", 14), bg=self.colors["light"], fg=self.colors["text_light"]).pack(pady=50)
-            return
-        
-        if hasattr(self, 'results_label'):
+        if flights and hasattr(self, 'results_label'):
             self.results_label.config(text=f"Found {len(flights)} flight(s)")
         
-        for flight in flights:
-            card = self.create_flight_card(self.grid_frame, flight)
-            card.pack(fill="x", pady=10)
+        # Cards show the selected class and the per-person price for the
+        # current passenger count, so refill them even for the same flights
+        self.flight_grid.set_items(flights, refill=True)
 
     def show_recommended_flights(self):
         all_flights = self.get_all_flights()
@@ -1248,67 +1317,16 @@ class Flight:
             self.results_label.config(text="All Available Flights")
 
     def navigate_to_page(self, script_file):
-        """Navigate to other page - fixed version to ensure window closes"""
+        """Navigate to other page"""
         if script_file == "flight.py":
             return
         
         try:
-            # Save current user info to session
-            session_data = {
-                'email': self.email,
-                'user_name': self.user_name
-            }
-            with open('user_session.json', 'w') as f:
-                json.dump(session_data, f)
-            
-            # Immediately destroy all child widgets
-            for widget in self.root.winfo_children():
-                try:
-                    widget.destroy()
-                except:
-                    pass
-            
-            # Force close main window
-            self.root.quit()
-            self.root.destroy()
-            
-            # Check if target file exists
-            if not os.path.exists(script_file):
-                # Create new Tkinter instance to show error
-                error_root = tk.Tk()
-                error_root.withdraw()
-                messagebox.showerror("Error", f"File not found: {script_file}")
-                error_root.destroy()
-                # Restart flight app
-                os.system(f"python flight.py")
-                return
-            
-            # Use os.system to start new app (this runs in new process)
-            python_executable = sys.executable
-            
-            # Use different commands based on OS
-            if sys.platform == "win32":
-                # Windows: use start command to launch in new window
-                os.system(f'start "" "{python_executable}" "{script_file}"')
-            elif sys.platform == "darwin":
-                # macOS
-                os.system(f'open -a Terminal "{python_executable}" "{script_file}"')
-            else:
-                # Linux/Unix
-                os.system(f'"{python_executable}" "{script_file}" &')
-            
-            # Force exit current Python process
-            sys.exit(0)
+            # Switch to the other page in the same window
+            navigate(script_file, self.email, self.user_name)
             
         except Exception as e:
-            # If error occurs, create new error window
-            try:
-                error_root = tk.Tk()
-                error_root.withdraw()
-                messagebox.showerror("Error", f"Cannot open {script_file}: {str(e)}")
-                error_root.destroy()
-            except:
-                pass
+            messagebox.showerror("Error", f"Cannot open {script_file}: {str(e)}")
 
     def search_flights(self):
         """Validate and perform flight search"""
@@ -1477,15 +1495,8 @@ class Flight:
             messagebox.showerror("Error", f"Cannot open booking details: {str(e)}")
 
     def save_booking_to_file(self, booking_data):
-        """Save booking to JSON file"""
+        """Save booking to the booking ledger"""
         try:
-            bookings_file = "bookings.json"
-            bookings = []
-            
-            if os.path.exists(bookings_file):
-                with open(bookings_file, 'r', encoding='utf-8') as f:
-                    bookings = json.load(f)
-            
             flight_booking = {
                 "id": booking_data.get("booking_id", f"FL{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"),
                 "booking_type": "flight",
@@ -1498,17 +1509,14 @@ class Flight:
                 "tickets": booking_data["tickets"],
                 "class": booking_data["class"],
                 "seats": booking_data.get("seats", []),
-                "status": "Confirmed",
+                "status": CONFIRMED,
                 "price": self.parse_price(booking_data["total_price"]),
                 "booking_date": datetime.datetime.now().strftime("%Y-%m-%d"),
                 "email": booking_data.get("email", ""),
                 "user_name": booking_data.get("customer_name", "")
             }
             
-            bookings.append(flight_booking)
-            
-            with open(bookings_file, 'w', encoding='utf-8') as f:
-                json.dump(bookings, f, indent=2, ensure_ascii=False)
+            get_booking_ledger().record(flight_booking, booking_type="flight", status=CONFIRMED)
             
             return True
         except:
@@ -1536,17 +1544,4 @@ class Flight:
 
 
 if __name__ == "__main__":
-    session_file = 'user_session.json'
-    user_email = "user@example.com"
-    if os.path.exists(session_file):
-        try:
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
-                user_email = session_data.get('email', "user@example.com")
-        except:
-            pass
-    
-    root = tk.Tk()
-    root.attributes('-fullscreen', True)
-    app = Flight(root, user_email)
-    root.mainloop()
\ No newline at end of file
+    run("flight", get_session().email or "user@example.com")
\ No newline at end of file
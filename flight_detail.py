@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import datetime
 import random
+from booking_dates import normalize_dates
+from booking_record import BookingRecord
 
 class FlightDetailPage:
     """Flight details and seat selection page"""
@@ -717,10 +719,13 @@ class FlightDetailPage:
             
             "item_name": f"{self.flight_data.get('airline', 'Flight')} - {self.flight_data.get('route', '')}",
             "hotel_name": self.flight_data.get('airline', 'Flight'),
-            "price": total_price
+            "price": total_price,
+            
+            # Exact pricing for the confirmation and payment pages
+            "pricing": BookingRecord("flight", self.flight_data['price'], total_passengers).to_dict()
         }
         
-        return booking_data
+        return normalize_dates(booking_data, "flight")
 
     def _on_mousewheel(self, event):
         """Handle mousewheel scrolling"""
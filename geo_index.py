@@ -0,0 +1,198 @@
+import heapq
+import math
+from array import array
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def coordinates(item):
+    """(lat, lon) of a catalog item, or None when it has none"""
+    try:
+        return float(item["lat"]), float(item["lon"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def haversine_km(a, b):
+    """Great-circle distance between two (lat, lon) points in km"""
+    lat1, lon1 = map(math.radians, a)
+    lat2, lon2 = map(math.radians, b)
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _unit_vector(point):
+    lat, lon = map(math.radians, point)
+    return math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)
+
+
+def _chord(km):
+    """Straight-line distance through the unit sphere for a great-circle distance"""
+    return 2 * math.sin(min(math.pi, km / EARTH_RADIUS_KM) / 2)
+
+
+def _arc_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+class GeoIndex:
+    """k-d tree over catalog items with coordinates, for nearest and radius queries.
+
+    Points are stored as unit vectors, where straight-line distance grows
+    with great-circle distance, so the tree needs no special cases for the
+    antimeridian or the poles and search radii convert with one sin().
+    The tree is implicit: the item positions are reordered once so that
+    every subtree is a slice with its splitting point in the middle, and
+    the coordinates live in flat arrays. Items without coordinates are
+    skipped.
+    """
+
+    def __init__(self, items):
+        self.items = list(items)
+        located = []
+        for index, item in enumerate(self.items):
+            point = coordinates(item)
+            if point is not None:
+                located.append((index, _unit_vector(point)))
+
+        self._order = array('l', bytes(array('l').itemsize * len(located)))
+        self._coords = array('d', bytes(array('d').itemsize * 3 * len(located)))
+        self._axes = array('b', bytes(len(located)))
+        self._build(located, 0)
+
+    def __len__(self):
+        return len(self._order)
+
+    def _build(self, points, start):
+        """Lay points out in slice [start, start + len(points)), median first by axis"""
+        if not points:
+            return
+        # Split on the axis with the widest spread
+        axis = max(range(3), key=lambda a: max(p[1][a] for p in points) - min(p[1][a] for p in points))
+        points.sort(key=lambda p: p[1][axis])
+        middle = len(points) // 2
+        slot = start + middle
+        index, vector = points[middle]
+        self._order[slot] = index
+        self._coords[3 * slot:3 * slot + 3] = array('d', vector)
+        self._axes[slot] = axis
+        self._build(points[:middle], start)
+        self._build(points[middle + 1:], slot + 1)
+
+    def _search(self, target, start, stop, visit, bound):
+        """Walk slice [start, stop) nearest side first; visit(slot, chord) may shrink bound()"""
+        if start >= stop:
+            return
+        slot = (start + stop) // 2
+        base = 3 * slot
+        dx = target[0] - self._coords[base]
+        dy = target[1] - self._coords[base + 1]
+        dz = target[2] - self._coords[base + 2]
+        visit(slot, math.sqrt(dx * dx + dy * dy + dz * dz))
+        axis = self._axes[slot]
+        offset = target[axis] - self._coords[base + axis]
+        near, far = ((start, slot), (slot + 1, stop)) if offset < 0 else ((slot + 1, stop), (start, slot))
+        self._search(target, near[0], near[1], visit, bound)
+        if abs(offset) <= bound():
+            self._search(target, far[0], far[1], visit, bound)
+
+    def nearest(self, point, k=1, exclude=None):
+        """Up to k (distance_km, item index) pairs closest to point, nearest first
+
+        exclude is a set of item indexes to leave out.
+        """
+        if k <= 0 or not len(self):
+            return []
+        target = _unit_vector(point)
+        heap = []  # (-chord, index), the k best so far
+
+        def visit(slot, chord):
+            index = self._order[slot]
+            if exclude and index in exclude:
+                return
+            if len(heap) < k:
+                heapq.heappush(heap, (-chord, index))
+            elif chord < -heap[0][0]:
+                heapq.heapreplace(heap, (-chord, index))
+
+        def bound():
+            return -heap[0][0] if len(heap) == k else float("inf")
+
+        self._search(target, 0, len(self), visit, bound)
+        return [(_arc_km(-chord), index) for chord, index in sorted(heap, reverse=True)]
+
+    def within(self, point, radius_km):
+        """(distance_km, item index) pairs within radius_km of point, nearest first"""
+        target = _unit_vector(point)
+        radius = _chord(radius_km)
+        found = []
+
+        def visit(slot, chord):
+            if chord <= radius:
+                found.append((chord, self._order[slot]))
+
+        self._search(target, 0, len(self), visit, lambda: radius)
+        return [(_arc_km(chord), index) for chord, index in sorted(found)]
+
+    def clusters(self, size, seeds):
+        """Group every located item into clusters of at most size nearby items
+
+        seeds gives item indexes in the order clusters should be started
+        (e.g. best rated first); each cluster is its seed plus the seed's
+        nearest unclustered neighbours. Returns lists of item indexes.
+        """
+        assigned = set()
+        groups = []
+        for seed in seeds:
+            if seed in assigned:
+                continue
+            point = coordinates(self.items[seed])
+            if point is None:
+                continue
+            assigned.add(seed)
+            group = [seed] + [index for _, index in self.nearest(point, size - 1, exclude=assigned)]
+            assigned.update(group)
+            groups.append(group)
+        return groups
+
+
+def route(points, start=None):
+    """Visiting order (indexes into points) for a short tour through (lat, lon) points
+
+    Nearest-neighbour tour from start (or the first point), then 2-opt
+    moves until no reversal shortens it. The tour is open: it does not
+    return to where it began. Meant for the handful of stops in one day:
+    it compares every pair of points.
+    """
+    count = len(points)
+    if count < 3:
+        return list(range(count))
+    distance = [[haversine_km(a, b) for b in points] for a in points]
+
+    current = 0 if start is None else start
+    order, remaining = [current], set(range(count)) - {current}
+    while remaining:
+        current = min(remaining, key=distance[current].__getitem__)
+        order.append(current)
+        remaining.remove(current)
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, count - 1):
+            for j in range(i + 1, count):
+                a, b = order[i - 1], order[i]
+                c = order[j]
+                d = order[j + 1] if j + 1 < count else None
+                before = distance[a][b] + (distance[c][d] if d is not None else 0)
+                after = distance[a][c] + (distance[b][d] if d is not None else 0)
+                if after < before - 1e-9:
+                    order[i:j + 1] = reversed(order[i:j + 1])
+                    improved = True
+    return order
+
+
+def path_km(points):
+    """Length of the path through (lat, lon) points in order"""
+    return sum(haversine_km(a, b) for a, b in zip(points, points[1:]))
@@ -1,13 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
 import os
 from datetime import datetime
-import subprocess
 from PIL import Image, ImageTk
 import tkinter.font as tkFont
 import sys
 from profile import Profile
+from catalog_store import load_catalog
+from session import get_session
+from page_router import SCRIPTS, get_router, navigate, run
 
 class HomeApp:
     def __init__(self, root, email=None, user_name=None):
@@ -86,20 +87,10 @@ class HomeApp:
         self.root.bind('<F11>', lambda e: self.toggle_fullscreen())
 
     def load_user_session(self):
-        """Load user information from session file"""
-        session_file = 'user_session.json'
-        if os.path.exists(session_file):
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                    self.email = session_data.get('email', 'user@example.com')
-                    self.user_name = session_data.get('user_name', 'Guest User')
-            except:
-                self.email = 'user@example.com'
-                self.user_name = 'Guest User'
-        else:
-            self.email = 'user@example.com'
-            self.user_name = 'Guest User'
+        """Fill in user information that was not passed in from the current session"""
+        session = get_session()
+        self.email = self.email or session.email or 'user@example.com'
+        self.user_name = getattr(self, 'user_name', None) or session.user_name or 'Guest User'
 
     def create_custom_fonts(self):
         """Create custom fonts"""
@@ -383,6 +374,11 @@ class HomeApp:
             self.profile_menu = None
         self.is_menu_open = False
 
+    def suspend(self):
+        """Called by the page router when another page replaces this one"""
+        if self.is_menu_open:
+            self.hide_profile_menu()
+
     def check_click_outside(self, event):
         """Check if clicked outside menu"""
         if self.is_menu_open and self.profile_menu:
@@ -805,6 +801,23 @@ class HomeApp:
         for widget in self.recommendations_content.winfo_children():
             widget.destroy()
         
+        # Recommendations come from the local catalog store
+        all_recommendations = load_catalog("recommendation", 1, self.default_recommendations)
+        
+        # Create cards container
+        cards_frame = tk.Frame(self.recommendations_content, bg='#f0f8ff')
+        cards_frame.pack(fill='both', expand=True)
+        
+        # Create card for each recommendation
+        for i, item in enumerate(all_recommendations):
+            card = self.create_recommendation_card(cards_frame, item, i)
+            if i < len(all_recommendations) - 1:
+                card.pack(side='left', fill='both', expand=True, padx=(0, 20))
+            else:
+                card.pack(side='left', fill='both', expand=True)
+
+    def default_recommendations(self):
+        """Default recommendations for all 4 modules, written to the catalog store on first run"""
         # Hotel recommendation (1)
         hotels = [
             {
@@ -908,20 +921,7 @@ class HomeApp:
             }
         ]
         
-        # Combine all recommendations
-        all_recommendations = hotels + flights + cars + attractions
-        
-        # Create cards container
-        cards_frame = tk.Frame(self.recommendations_content, bg='#f0f8ff')
-        cards_frame.pack(fill='both', expand=True)
-        
-        # Create card for each recommendation
-        for i, item in enumerate(all_recommendations):
-            card = self.create_recommendation_card(cards_frame, item, i)
-            if i < len(all_recommendations) - 1:
-                card.pack(side='left', fill='both', expand=True, padx=(0, 20))
-            else:
-                card.pack(side='left', fill='both', expand=True)
+        return hotels + flights + cars + attractions
 
     def create_recommendation_card(self, parent, item_data, index):
         """Create recommendation card"""
@@ -1103,20 +1103,9 @@ class HomeApp:
             return None
 
     def open_detail_page(self, item_data):
-        """Open external detail page"""
-        # Save data to temp file
-        if not os.path.exists('temp'):
-            os.makedirs('temp')
-        
-        temp_file = os.path.join('temp', 'current_item.json')
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json.dump(item_data, f, indent=2, ensure_ascii=False)
-        
-        # Call external detail page
+        """Open detail page in the same window"""
         try:
-            # Close current window and open detail page
-            self.root.destroy()
-            subprocess.Popen(["python", "detail_page.py", temp_file])
+            get_router().show("detail", item_data, self.email)
         except Exception as e:
             print(f"Error opening detail page: {e}")
             # Show error message if cannot open detail page
@@ -1187,18 +1176,9 @@ class HomeApp:
         if script_file == "home.py":
             return
         
-        if os.path.exists(script_file):
+        if script_file in SCRIPTS:
             try:
-                # Save current user info to session
-                session_data = {
-                    'email': self.email,
-                    'user_name': self.user_name
-                }
-                with open('user_session.json', 'w') as f:
-                    json.dump(session_data, f)
-                
-                self.root.destroy()
-                subprocess.Popen(["python", script_file])
+                navigate(script_file, self.email, self.user_name)
             except Exception as e:
                 messagebox.showerror("Error", f"Cannot open {script_file}: {str(e)}")
         else:
@@ -1206,17 +1186,13 @@ class HomeApp:
 
 def main():
     """Main function for standalone run"""
-    root = tk.Tk()
-    
     # Get user info from command line arguments
     if len(sys.argv) > 2:
         email = sys.argv[1]
         user_name = sys.argv[2]
-        app = HomeApp(root, email=email, user_name=user_name)
+        run("home", email=email, user_name=user_name)
     else:
-        app = HomeApp(root)
-    
-    root.mainloop()
+        run("home")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,12 +2,17 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import os, datetime, json, re
 from PIL import Image, ImageTk, ImageDraw
-import subprocess
 import hashlib
 from datetime import datetime
 
 # Add Profile import
 from profile import Profile
+from image_service import get_image_service, load_photo, load_photo_async
+from virtual_grid import VirtualGrid
+from catalog_index import CatalogIndex
+from booking_ledger import CONFIRMED, get_booking_ledger
+from session import get_session
+from page_router import hide_packed, navigate, run, show_packed
 
 class Hotel:
     def __init__(self, root, email):
@@ -18,16 +23,8 @@ class Hotel:
         self.root.attributes('-fullscreen', True)
         self.root.configure(bg='#f0f8ff')
         
-        # Try to load username
-        self.user_name = "Guest User"
-        session_file = 'user_session.json'
-        if os.path.exists(session_file):
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                    self.user_name = session_data.get('user_name', 'Guest User')
-            except:
-                pass
+        # Username of the signed-in user
+        self.user_name = get_session().user_name or "Guest User"
         
         # Profile menu state
         self.is_menu_open = False
@@ -44,11 +41,16 @@ class Hotel:
         self.current_page = "main"
         self.selected_room_price = None
         self.current_hotel_data = None
-        self.image_cache = {}
+        self.placeholder_photo = None
         
         # Navigation history for back button functionality
         self.navigation_stack = ["main"]
         
+        # Views kept alive while another view is shown (see hide_packed)
+        self.browse_visible = False
+        self.hidden_browse = None
+        self.hidden_main = None
+        
         # UI color scheme - Use consistent color scheme with home.py
         self.colors = {
             "primary": "#1e3d59", "secondary": "#ff6e40", "accent": "#ff8c66",
@@ -62,6 +64,7 @@ class Hotel:
         # Load hotel data from JSON files
         self.city_hotels = self.load_hotels_from_json()
         self.hotels = self.load_all_hotels_from_json()
+        self.hotel_index = self.build_hotel_index()
         self.filtered_hotels = self.hotels.copy()
         
         # Filter variables
@@ -99,6 +102,9 @@ class Hotel:
     def init_main_page(self):
         """Initialize and show the main hotel browsing page"""
         self.current_page = "main"
+        self.browse_visible = False
+        self.hidden_browse = None
+        self.hidden_main = None
         
         # Clear any existing widgets
         for widget in self.root.winfo_children():
@@ -465,48 +471,46 @@ class Hotel:
         self.root.attributes('-fullscreen', self.fullscreen_state)
         return "break"
     
-    def get_hotel_image(self, hotel_data):
-        """Get hotel image from cache or load from file"""
-        if not hasattr(self, 'image_cache'):
-            self.image_cache = {}
-        
-        hotel_name = hotel_data.get('name', '')
-        cache_key = hotel_name
-        
-        if cache_key in self.image_cache:
-            return self.image_cache[cache_key]
-        
+    def get_hotel_image_path(self, hotel_data):
+        """Resolve the image file for a hotel, or None if there is none"""
         filename = hotel_data.get('_image_file', 'hotel.jpg')
-        image_path = os.path.join("images", filename)
+        candidates = [os.path.join("images", filename), filename]
         
-        if not os.path.exists(image_path):
-            generic_files = ["hotel.jpg", "hot1.jpg", "hot2.jpg", "hot3.jpg"]
-            for file in generic_files:
-                alt_path = os.path.join("images", file)
-                if os.path.exists(alt_path):
-                    image_path = alt_path
-                    filename = file
-                    break
+        generic_files = ["hotel.jpg", "hot1.jpg", "hot2.jpg", "hot3.jpg"]
+        candidates += [os.path.join("images", file) for file in generic_files]
         
-        try:
-            img = Image.open(image_path)
-            img = img.resize((300, 200), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            self.image_cache[cache_key] = photo
-            return photo
-        except:
-            return self.create_placeholder_image()
+        return get_image_service().find_image(candidates)
+    
+    def get_hotel_image(self, hotel_data):
+        """Get hotel image from the shared image service"""
+        image_path = self.get_hotel_image_path(hotel_data)
+        photo = load_photo(image_path, (300, 200)) if image_path else None
+        return photo or self.create_placeholder_image()
     
     def create_placeholder_image(self):
         """Create a placeholder image when hotel image is not available"""
+        if self.placeholder_photo is not None:
+            return self.placeholder_photo
+        
         img = Image.new('RGB', (300, 200), color='#3498db')
         draw = ImageDraw.Draw(img)
         draw.text((120, 80), "🏨", fill='white')
         draw.text((100, 150), "Hotel", fill='white')
-        return ImageTk.PhotoImage(img)
+        self.placeholder_photo = ImageTk.PhotoImage(img)
+        return self.placeholder_photo
     
     def show_hotels_page_optimized(self):
         """Show the main hotels browsing page with filters"""
+        if self.hidden_browse is not None:
+            # Back from a city or detail view: the browsing page was only
+            # hidden, so it comes back with its filters and scroll position
+            self.clear_main_container()
+            show_packed(self.hidden_browse)
+            self.hidden_browse = None
+            self.browse_visible = True
+            self.navigation_stack = ["main"]
+            return
+        
         for widget in self.main_container.winfo_children():
             widget.destroy()
         
@@ -529,8 +533,19 @@ class Hotel:
         self.create_sidebar_optimized(left_frame)
         self.create_main_content_optimized(right_frame)
         self.create_footer(self.main_container)
+        self.browse_visible = True
         self.bind_mousewheel_to_all()
     
+    def clear_main_container(self):
+        """Remove the current view from main_container, hiding the browsing page instead of destroying it"""
+        if self.browse_visible:
+            self.hidden_browse = hide_packed(self.main_container)
+            self.browse_visible = False
+        kept = {widget for widget, _ in self.hidden_browse or ()}
+        for widget in self.main_container.winfo_children():
+            if widget not in kept:
+                widget.destroy()
+    
     def create_sidebar_optimized(self, parent):
         """Create the filter sidebar"""
         sidebar = tk.Frame(parent, bg=self.colors["sidebar_bg"], width=260,
@@ -683,113 +698,87 @@ class Hotel:
         self.create_city_hotels_section_optimized(city_hotels_frame)
     
     def create_hotels_grid_optimized(self, parent):
-        """Create scrollable grid of hotel cards"""
-        canvas_frame = tk.Frame(parent, bg=self.colors["light"])
-        canvas_frame.pack(fill="both", expand=True)
-        
-        # Canvas for scrolling
-        canvas = tk.Canvas(canvas_frame, bg=self.colors["light"], highlightthickness=0)
-        scrollbar = tk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.colors["light"])
-        
-        # Configure scrolling
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        self.grid_frame = scrollable_frame
+        """Create virtualized grid of hotel cards"""
+        self.hotel_grid = VirtualGrid(parent, self.build_hotel_card, self.fill_hotel_card,
+                                      columns=3, row_height=440, bg=self.colors["light"],
+                                      empty_text="🔍 No hotels found - try adjusting your filters",
+                                      empty_fg=self.colors["primary"])
+        self.hotel_grid.pack(fill="both", expand=True)
+        self.canvas = self.hotel_grid.canvas
         self.display_hotels_grid_optimized()
-        self.canvas = canvas
-        
-        canvas.pack(side="left", fill="both", expand=True, padx=(0, 2))
-        scrollbar.pack(side="right", fill="y")
-        
-        # Mousewheel scrolling
-        canvas.bind("<MouseWheel>", self._on_mousewheel)
-        scrollable_frame.bind("<MouseWheel>", self._on_mousewheel)
     
     def display_hotels_grid_optimized(self):
         """Display hotel cards in grid layout"""
-        for widget in self.grid_frame.winfo_children():
-            widget.destroy()
-        
-        # Show message if no hotels found
-        if not self.filtered_hotels:
-            no_results = tk.Frame(self.grid_frame, bg=self.colors["light"])
-            no_results.pack(expand=True, pady=50)
-            
-            tk.Label(no_results, text="🔍", font=("Arial", 48), bg=self.colors["light"], fg=self.colors["accent"]).pack()
-            tk.Label(no_results, text="No hotels found", font=("Arial", 16, "bold"), bg=self.colors["light"], fg=self.colors["primary"]).pack(pady=10)
-            tk.Label(no_results, text="Try adjusting your filters",font=("Arial", 12), bg=self.colors["light"], fg=self.colors["text_light"]).pack()
-            return
-        
-        # Display hotels in 3-column grid
-        row, col = 0, 0
-        for hotel in self.filtered_hotels:
-            card = self.create_hotel_card_optimized(self.grid_frame, hotel)
-            card.grid(row=row, column=col, padx=8, pady=8, sticky="nsew")
-            col += 1
-            if col == 3:
-                col = 0
-                row += 1
-        
-        # Configure grid columns to be equal width
-        for i in range(3):
-            self.grid_frame.grid_columnconfigure(i, weight=1, uniform="col")
+        self.hotel_grid.set_items(self.filtered_hotels)
     
     def create_hotel_card_optimized(self, parent, hotel_data):
         """Create a single hotel card with image, info, and booking button"""
+        card = self.build_hotel_card(parent)
+        self.fill_hotel_card(card, hotel_data)
+        return card
+    
+    def build_hotel_card(self, parent):
+        """Build an empty hotel card whose widgets are filled by fill_hotel_card"""
         card = tk.Frame(parent, bg="white", relief="flat",
                        highlightbackground=self.colors["border"], highlightthickness=1,
                        width=280, height=350)
         
         # Hotel image
-        photo = self.get_hotel_image(hotel_data)
-        if photo:
-            image_label = tk.Label(card, image=photo, bg="white")
-            image_label.image = photo
-            image_label.pack(fill="x")
-        else:
-            # Placeholder if image not found
-            image_frame = tk.Frame(card, bg='#3498db', height=150)
-            image_frame.pack(fill="x")
-            image_frame.pack_propagate(False)
-            tk.Label(image_frame, text="🏨", font=("Arial", 48),
-                    bg='#3498db', fg="white").pack(expand=True)
+        card.image_label = tk.Label(card, bg="white")
+        card.image_label.pack(fill="x")
         
         # Hotel information
         content = tk.Frame(card, bg="white", padx=12, pady=12)
         content.pack(fill="both", expand=True)
         
-        tk.Label(content, text=hotel_data['name'], font=("Arial", 12, "bold"),
-                bg="white", fg=self.colors["dark"], wraplength=240).pack(anchor="w")
-        tk.Label(content, text=f"📍 {hotel_data['location']}", font=("Arial", 10),
-                bg="white", fg=self.colors["text_light"]).pack(anchor="w", pady=(2, 8))
+        card.name_label = tk.Label(content, font=("Arial", 12, "bold"),
+                                   bg="white", fg=self.colors["dark"], wraplength=240)
+        card.name_label.pack(anchor="w")
+        card.location_label = tk.Label(content, font=("Arial", 10),
+                                       bg="white", fg=self.colors["text_light"])
+        card.location_label.pack(anchor="w", pady=(2, 8))
         
         # Rating and stars
         info_frame = tk.Frame(content, bg="white")
         info_frame.pack(fill="x", pady=(0, 8))
-        tk.Label(info_frame, text=hotel_data['stars'], font=("Arial", 11),
-                bg="white", fg="#f39c12").pack(side="left")
-        tk.Label(info_frame, text=f"⭐ {hotel_data['rating']}/10", font=("Arial", 10, "bold"),
-                bg="white", fg=self.colors["dark"]).pack(side="right")
+        card.stars_label = tk.Label(info_frame, font=("Arial", 11), bg="white", fg="#f39c12")
+        card.stars_label.pack(side="left")
+        card.rating_label = tk.Label(info_frame, font=("Arial", 10, "bold"),
+                                     bg="white", fg=self.colors["dark"])
+        card.rating_label.pack(side="right")
         
         # Price
         price_frame = tk.Frame(content, bg="white")
         price_frame.pack(fill="x", pady=8)
-        tk.Label(price_frame, text=f"RM {hotel_data['price']}", font=("Arial", 14, "bold"),
-                bg="white", fg=self.colors["secondary"]).pack(side="left")
+        card.price_label = tk.Label(price_frame, font=("Arial", 14, "bold"),
+                                    bg="white", fg=self.colors["secondary"])
+        card.price_label.pack(side="left")
         
         # Booking button
         btn_frame = tk.Frame(content, bg="white")
         btn_frame.pack(fill="x", pady=(8, 10))
-        tk.Button(btn_frame, text="View Details", font=("Arial", 10, "bold"),
-                 bg=self.colors["secondary"], fg="white", relief="flat",
-                 cursor="hand2",
-                 command=lambda h=hotel_data: self.show_booking_page(h)).pack(side="left", fill="x", expand=True)    
+        card.details_button = tk.Button(btn_frame, text="View Details", font=("Arial", 10, "bold"),
+                                        bg=self.colors["secondary"], fg="white", relief="flat",
+                                        cursor="hand2")
+        card.details_button.pack(side="left", fill="x", expand=True)
         
         return card
     
+    def fill_hotel_card(self, card, hotel_data):
+        """Show hotel_data in an existing hotel card"""
+        # Show the placeholder now, swap in the photo once decoded
+        photo = self.create_placeholder_image()
+        card.image_label.config(image=photo)
+        card.image_label.image = photo
+        load_photo_async(card.image_label, self.get_hotel_image_path(hotel_data), (300, 200))
+        
+        card.name_label.config(text=hotel_data['name'])
+        card.location_label.config(text=f"📍 {hotel_data['location']}")
+        card.stars_label.config(text=hotel_data['stars'])
+        card.rating_label.config(text=f"⭐ {hotel_data['rating']}/10")
+        card.price_label.config(text=f"RM {hotel_data['price']}")
+        card.details_button.config(command=lambda h=hotel_data: self.show_booking_page(h))
+    
     def create_city_hotels_section_optimized(self, parent):
         """Create city hotels selection section"""
         container = tk.Frame(parent, bg=self.colors["light"])
@@ -830,27 +819,8 @@ class Hotel:
             return
         
         try:
-            # Save user session
-            session_data = {
-                'email': self.email,
-                'user_name': self.user_name
-            }
-            with open('user_session.json', 'w') as f:
-                json.dump(session_data, f)
-            
-            # Launch other modules as separate processes
-            if script_file == "home.py":
-                self.root.destroy()
-                subprocess.Popen(["python", script_file])
-            elif script_file == "attraction.py":
-                self.root.destroy()
-                import attraction
-                root = tk.Tk()
-                attraction.AttractionApp(root, self.email)
-                root.mainloop()
-            else:
-                self.root.destroy()
-                subprocess.Popen(["python", script_file])
+            # Switch to the other module in the same window
+            navigate(script_file, self.email, self.user_name)
         except Exception as e:
             messagebox.showerror("Error", f"Cannot open {script_file}: {e}")
 
@@ -869,6 +839,20 @@ class Hotel:
         label.config(text=f"{float(value):.1f}/10")
         self.filter_hotels()
     
+    def build_hotel_index(self):
+        """Index the numeric hotel fields used by filters and sorting"""
+        return CatalogIndex(
+            self.hotels,
+            columns={
+                "price": lambda h: h["price"],
+                "rating": lambda h: h["rating"],
+                "stars": lambda h: h.get("stars", "").count("★"),
+            },
+            sort_keys={"price": "price", "rating": "rating", "stars": "stars",
+                       "name": lambda h: h["name"]},
+            groups={"category": lambda h: h.get("category", "")},
+        )
+    
     def filter_hotels(self, *args):
         """Filter hotels based on current filter settings"""
         category = self.category_var.get()
@@ -876,36 +860,33 @@ class Hotel:
         max_price = self.price_var.get()
         min_rating = self.rating_var.get()
         
-        # Apply filters
-        self.filtered_hotels = [
-            hotel for hotel in self.hotels
-            if (category == "All" or hotel.get("category", "") == category) and
-            (star_rating == "All" or (hotel.get("stars", "").count("★") >= int(star_rating) if star_rating.isdigit() else True)) and
-            hotel["price"] <= max_price and
-            hotel["rating"] >= min_rating
-        ]
-        
-        # Apply sorting and update display
-        self.sort_hotels()
+        # Sort option -> (index sort key, descending)
+        sort_options = {
+            "Rating (High to Low)": ("rating", True),
+            "Price (Low to High)": ("price", False),
+            "Price (High to Low)": ("price", True),
+            "Name (A-Z)": ("name", False),
+            "Stars (High to Low)": ("stars", True),
+        }
+        sort_by, descending = sort_options.get(self.sort_var.get(), (None, False))
+        
+        # Apply filters and sorting on the index, then update display once
+        self.filtered_hotels = self.hotel_index.select(
+            ranges={
+                "price": (None, max_price),
+                "rating": (min_rating, None),
+                "stars": (int(star_rating), None) if star_rating.isdigit() else None,
+            },
+            equals={"category": {category}} if category != "All" else None,
+            sort_by=sort_by,
+            reverse=descending,
+        )
         self.display_hotels_grid_optimized()
         self.results_label.config(text=f"{len(self.filtered_hotels)} Hotels Found")
     
     def sort_hotels(self, *args):
-        """Sort hotels based on selected sort option"""
-        sort_by = self.sort_var.get()
-        
-        if sort_by == "Rating (High to Low)":
-            self.filtered_hotels.sort(key=lambda x: x["rating"], reverse=True)
-        elif sort_by == "Price (Low to High)":
-            self.filtered_hotels.sort(key=lambda x: x["price"])
-        elif sort_by == "Price (High to Low)":
-            self.filtered_hotels.sort(key=lambda x: x["price"], reverse=True)
-        elif sort_by == "Name (A-Z)":
-            self.filtered_hotels.sort(key=lambda x: x["name"])
-        elif sort_by == "Stars (High to Low)":
-            self.filtered_hotels.sort(key=lambda x: x["stars"].count("★"), reverse=True)
-        
-        self.display_hotels_grid_optimized()
+        """Sort hotels based on selected sort option and update display"""
+        self.filter_hotels()
     
     def reset_filters(self):
         """Reset all filters to default values"""
@@ -970,8 +951,7 @@ class Hotel:
     
     def show_search_results(self, city_name, hotels):
         """Show search results for a city"""
-        for widget in self.main_container.winfo_children():
-            widget.destroy()
+        self.clear_main_container()
         
         self.navigation_stack.append(f"city_{city_name}")
         
@@ -1027,8 +1007,7 @@ class Hotel:
     
     def show_detail_page(self, hotel_data):
         """Show detailed hotel information page"""
-        for widget in self.main_container.winfo_children():
-            widget.destroy()
+        self.clear_main_container()
         self.navigation_stack.append(f"detail_{hotel_data.get('id', hash(hotel_data['name']))}")
         self.create_detail_content(hotel_data)
         self.bind_mousewheel_to_all()
@@ -1137,9 +1116,10 @@ class Hotel:
         self.current_page = "room_selection"
         self.current_hotel_data = hotel_data
         
-        # Clear current window
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        # Hide the hotel page rather than destroying it, so going back is instant
+        self.hide_profile_menu()
+        if self.hidden_main is None:
+            self.hidden_main = hide_packed(self.root)
         
         self.navigation_stack.append(f"booking_{hotel_data.get('id', hash(hotel_data['name']))}")
         
@@ -1161,7 +1141,27 @@ class Hotel:
     
     def restore_main_page(self):
         """Return to main hotel browsing page"""
-        self.init_main_page()
+        if self.hidden_main is None:
+            self.init_main_page()
+            return
+        
+        # Drop the room selection widgets and put the hidden hotel page back
+        kept = {widget for widget, _ in self.hidden_main}
+        for widget in self.root.winfo_children():
+            if widget not in kept:
+                widget.destroy()
+        show_packed(self.hidden_main)
+        self.hidden_main = None
+        self.current_page = "main"
+        # Opened from a browse card, the browsing page is back with the rest;
+        # opened from a city or detail view, bring the hidden browsing page back
+        if not self.browse_visible:
+            self.show_hotels_page_optimized()
+    
+    def suspend(self):
+        """Called by the page router when another page replaces this one"""
+        if self.is_menu_open:
+            self.hide_profile_menu()
 
     def open_booking_detail_window(self, booking_data):
         """Open booking confirmation window"""
@@ -1190,33 +1190,24 @@ class Hotel:
         window.destroy()
 
     def save_booking_to_file(self, booking_data):
-        """Save booking to JSON file"""
+        """Save booking to the booking ledger"""
         try:
-            bookings_file = "bookings.json"
-            
-            if os.path.exists(bookings_file):
-                with open(bookings_file, 'r', encoding='utf-8') as f:
-                    bookings = json.load(f)
-            else:
-                bookings = []
-            
-            bookings.append({
+            booking = {
                 "id": booking_data["booking_id"],
                 "hotel_name": booking_data["hotel_name"],
                 "room_type": booking_data["room_type"],
                 "check_in": booking_data["check_in"],
                 "check_out": booking_data["check_out"],
                 "guests": int(re.search(r'\d+', booking_data["guests"]).group()) if re.search(r'\d+', booking_data["guests"]) else 2,
-                "status": "Confirmed",
+                "status": CONFIRMED,
                 "price": float(re.search(r'\d+', booking_data["total_price"]).group()) if re.search(r'\d+', booking_data["total_price"]) else 0,
                 "booking_date": datetime.now().strftime("%Y-%m-%d"),
                 "email": booking_data["user_email"],
                 "user_name": booking_data["user_name"],
                 "user_phone": booking_data["user_phone"]
-            })
+            }
             
-            with open(bookings_file, 'w', encoding='utf-8') as f:
-                json.dump(bookings, f, indent=2, ensure_ascii=False)
+            get_booking_ledger().record(booking, booking_type="hotel", status=CONFIRMED)
             return True
         except:
             return False
@@ -1535,6 +1526,4 @@ HOTEL_DATA = {
 }
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    Hotel(root, "user@example.com")
-    root.mainloop()
\ No newline at end of file
+    run("hotel", "user@example.com")
\ No newline at end of file
@@ -1,9 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from tkcalendar import Calendar
 import datetime
 import random
 import re
+from booking_dates import normalize_dates
+from booking_record import BookingRecord
 
 class RoomSelection:
     """Room selection page for hotel booking"""
@@ -719,7 +720,8 @@ class RoomSelection:
             default_month = tomorrow.month
             default_year = tomorrow.year
         
-        # Create calendar widget
+        # Create calendar widget (tkcalendar is imported on first use)
+        from tkcalendar import Calendar
         cal = Calendar(cal_window, selectmode='day', 
                     year=default_year,
                     month=default_month,
@@ -970,6 +972,8 @@ class RoomSelection:
             "tax_fee": f" {tax_fee:.2f}",
             "service_charge": f" {service_charge:.2f}",
             "total_price": f" {total_price:.2f}",
+            "pricing": BookingRecord("hotel", room_price_num, num_nights, taxes=tax_fee + service_charge,
+                                     total=total_price).to_dict(),
             "location": self.hotel_data.get('location', ''),
             "hotel_rating": self.hotel_data.get('rating', 'N/A'),
             "hotel_stars": self.hotel_data.get('stars', ''),
@@ -981,7 +985,7 @@ class RoomSelection:
             "room_features": self.selected_room_data.get('features', []) if self.selected_room_data else []
         }
         
-        return booking_data
+        return normalize_dates(booking_data, "hotel")
     
     def bind_mousewheel(self):
         """Enable mousewheel scrolling for the page"""
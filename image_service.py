@@ -0,0 +1,302 @@
+import os
+import queue
+import threading
+import tkinter as tk
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageTk
+from thumbnail_store import get_thumbnail_store
+
+
+class ImageService:
+    """Process-wide cache of decoded and resized card/hero images.
+
+    Entries are keyed by (path, mtime, size, mode) so an edited image file is
+    picked up automatically. Resized PIL images are kept in an LRU bounded by
+    their decoded byte size; Tk PhotoImages are created per Tk root on top of
+    it because a PhotoImage cannot outlive the interpreter that created it.
+    Misses are served from the on-disk ThumbnailStore when one is attached,
+    so only the first ever launch decodes the full-size originals.
+
+    load_into() lets cards render with a placeholder straight away: decoding
+    runs on a small worker pool and finished images are picked up on the Tk
+    thread by a root.after() poll, where the PhotoImage is created and
+    swapped into the label.
+    """
+
+    POLL_MS = 30
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, thumbnails=None):
+        self.max_bytes = max_bytes
+        self.thumbnails = thumbnails
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._images = OrderedDict()
+        self._photos = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()
+
+        # Background decoding
+        self.max_workers = 4
+        self._executor = None
+        self._waiting = {}
+        self._done = queue.Queue()
+        self._poll_root = None
+
+    # ==================== KEYS ====================
+    @staticmethod
+    def find_image(candidates):
+        """Return the first existing path from a list of candidate paths"""
+        for path in candidates:
+            if path and os.path.exists(path):
+                return path
+        return None
+
+    @staticmethod
+    def make_key(path, size, mode="RGB"):
+        """Build the cache key for an image file, or None if it does not exist"""
+        try:
+            abs_path = os.path.abspath(path)
+            mtime = os.stat(abs_path).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+        return (abs_path, mtime, (int(size[0]), int(size[1])), mode)
+
+    @staticmethod
+    def image_bytes(image):
+        """Approximate decoded size of a PIL image in bytes"""
+        return image.width * image.height * len(image.getbands())
+
+    # ==================== PIL LAYER ====================
+    def peek(self, key):
+        """Return a cached PIL image without loading it"""
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def store(self, key, image):
+        """Insert a resized PIL image and evict least recently used entries"""
+        with self._lock:
+            if key in self._images:
+                self.current_bytes -= self.image_bytes(self._images.pop(key))
+            self._images[key] = image
+            self.current_bytes += self.image_bytes(image)
+            while self.current_bytes > self.max_bytes and len(self._images) > 1:
+                old_key, old_image = self._images.popitem(last=False)
+                self.current_bytes -= self.image_bytes(old_image)
+                self.evictions += 1
+                for photos in list(self._photos.values()):
+                    photos.pop(old_key, None)
+
+    def decode(self, path, size, mode="RGB"):
+        """Return a resized image, preferring the on-disk thumbnail over the original"""
+        if self.thumbnails is not None:
+            image = self.thumbnails.load(path, size, mode)
+            if image is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                return image
+
+        with Image.open(path) as image:
+            image = image.convert(mode)
+            image = image.resize(size, Image.Resampling.LANCZOS)
+
+        if self.thumbnails is not None:
+            self.thumbnails.save(path, size, mode, image)
+        return image
+
+    def load_pil(self, path, size, mode="RGB"):
+        """Return a resized PIL image for path, decoding it only on a cache miss"""
+        key = self.make_key(path, size, mode)
+        if key is None:
+            return None
+
+        image = self.peek(key)
+        if image is not None:
+            with self._lock:
+                self.hits += 1
+            return image
+
+        with self._lock:
+            self.misses += 1
+        try:
+            image = self.decode(path, key[2], mode)
+        except Exception as e:
+            print(f"Error loading image {path}: {e}")
+            return None
+        self.store(key, image)
+        return image
+
+    # ==================== TK LAYER ====================
+    def get_photo(self, path, size, mode="RGB"):
+        """Return a PhotoImage for path at size, or None if it cannot be loaded"""
+        key = self.make_key(path, size, mode)
+        if key is None:
+            return None
+
+        root = tk._default_root
+        if root is None:
+            photos = {}
+        else:
+            if root not in self._photos:
+                self._release_dead_roots()
+            photos = self._photos.setdefault(root, {})
+        photo = photos.get(key)
+        if photo is not None:
+            with self._lock:
+                self.hits += 1
+                if key in self._images:
+                    self._images.move_to_end(key)
+            return photo
+
+        image = self.load_pil(path, size, mode)
+        if image is None:
+            return None
+        photo = ImageTk.PhotoImage(image)
+        photos[key] = photo
+        return photo
+
+    # ==================== ASYNC LAYER ====================
+    def load_into(self, label, path, size, mode="RGB"):
+        """Show the image for path in label, decoding it in the background if needed
+
+        The label keeps whatever placeholder it was created with until the
+        image is ready. Returns True when the image was already cached and has
+        been applied immediately.
+        """
+        key = self.make_key(path, size, mode) if path else None
+        # Remember what the label asked for last, so a recycled card never
+        # receives the picture of the item it showed before
+        label.image_request = key
+        if key is None:
+            return False
+
+        root = tk._default_root
+        cached = key in self._photos.get(root, {}) if root is not None else False
+        if cached or self.peek(key) is not None:
+            self._apply(label, self.get_photo(path, size, mode))
+            return True
+
+        with self._lock:
+            labels = self._waiting.get(key)
+            if labels is not None:
+                labels.append(label)
+                return False
+            self._waiting[key] = [label]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="image-decode")
+        future = self._executor.submit(self.load_pil, path, size, mode)
+        future.add_done_callback(lambda f, k=key, p=path: self._done.put((k, p, f)))
+        self._schedule_poll(label)
+        return False
+
+    def _schedule_poll(self, widget):
+        """Start the main-thread poll that collects decoded images"""
+        if self._poll_root is not None:
+            try:
+                if self._poll_root.winfo_exists():
+                    return
+            except tk.TclError:
+                pass
+            # The root was destroyed before its poll ran, taking the poll with it
+            self._poll_root = None
+        try:
+            self._poll_root = widget._root()
+            self._poll_root.after(self.POLL_MS, self._poll)
+        except tk.TclError:
+            self._poll_root = None
+
+    def _poll(self):
+        """Runs on the Tk thread: turn finished PIL images into PhotoImages"""
+        while True:
+            try:
+                key, path, future = self._done.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                labels = self._waiting.pop(key, [])
+            if future.exception() is not None or future.result() is None:
+                continue
+            labels = [label for label in labels if getattr(label, "image_request", None) == key]
+            photo = self.get_photo(path, key[2], key[3]) if labels else None
+            for label in labels:
+                self._apply(label, photo)
+
+        root, self._poll_root = self._poll_root, None
+        with self._lock:
+            pending = bool(self._waiting)
+        if pending and root is not None:
+            self._schedule_poll(root)
+
+    @staticmethod
+    def _apply(label, photo):
+        """Swap photo into label if the label still exists"""
+        if photo is None:
+            return
+        try:
+            if label.winfo_exists():
+                label.config(image=photo)
+                label.image = photo
+        except tk.TclError:
+            pass
+
+    def _release_dead_roots(self):
+        """Forget PhotoImages that belong to destroyed Tk roots"""
+        for root in list(self._photos.keys()):
+            try:
+                root.winfo_exists()
+            except tk.TclError:
+                del self._photos[root]
+
+    # ==================== MAINTENANCE ====================
+    def stats(self):
+        """Return cache counters"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._images),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+    def clear(self):
+        """Drop every cached image and forget the labels still waiting for one"""
+        with self._lock:
+            self._images.clear()
+            self._photos = weakref.WeakKeyDictionary()
+            self.current_bytes = 0
+            self._waiting.clear()
+            self._done = queue.Queue()
+
+
+_service = None
+
+
+def get_image_service():
+    """Return the shared ImageService instance"""
+    global _service
+    if _service is None:
+        _service = ImageService(thumbnails=get_thumbnail_store())
+    return _service
+
+
+def load_photo(path, size, mode="RGB"):
+    """Shortcut for get_image_service().get_photo(...)"""
+    return get_image_service().get_photo(path, size, mode)
+
+
+def load_photo_async(label, path, size, mode="RGB"):
+    """Shortcut for get_image_service().load_into(...)"""
+    return get_image_service().load_into(label, path, size, mode)
@@ -0,0 +1,381 @@
+import random
+import re
+import zlib
+from typing import Dict, List, NamedTuple, Optional
+
+from catalog_store import parse_amount
+from geo_index import GeoIndex, coordinates, haversine_km, path_km, route
+from trip_costs import DAILY_COSTS, budget_tier, country_of
+
+# Day timeline, in hours since midnight
+DAY_START = 9.0
+ARRIVAL_DAY_START = 14.0
+DAY_END = 22.0
+# (name, earliest start, duration) of the meals fitted into every day
+MEALS = (("Lunch", 12.0, 1.0), ("Dinner", 19.0, 1.5))
+# Longest wait for a place to open before something else is chosen
+MAX_WAIT = 1.0
+# Visits at least this long may run through a meal, eaten on site
+LONG_VISIT = 4.0
+# Attractions grouped into one day's route, and how far from that route
+# another attraction may be to fill a gap in the day
+ATTRACTIONS_PER_DAY = 3
+DAY_RADIUS_KM = 15.0
+
+# Score weights; each component is between 0 and 1
+RATING_WEIGHT = 0.45
+PRICE_WEIGHT = 0.25
+STYLE_WEIGHT = 0.30
+
+# Opening hours of attractions that have none, from their best time to visit
+BEST_TIME_HOURS = {
+    "early morning": (6.0, 18.0),
+    "morning": (8.0, 18.0),
+    "afternoon": (10.0, 19.0),
+    "sunset": (16.0, 21.0),
+    "evening": (17.0, 23.0),
+    "night": (18.0, 23.5),
+    "morning/evening": (8.0, 22.0),
+    "all day": (8.0, 22.0),
+}
+DEFAULT_HOURS = (9.0, 18.0)
+
+# Words in an attraction's name, description or features that suit each travel style
+STYLE_KEYWORDS = {
+    "Adventure": ("cave", "hike", "hill", "peak", "climb", "trail", "adventure", "water sports",
+                  "cable car", "skywalk", "nature", "park", "island"),
+    "Relaxation": ("garden", "beach", "spa", "park", "lake", "river", "sunset", "cruise", "views"),
+    "Cultural": ("temple", "museum", "heritage", "historic", "history", "palace", "mosque", "shrine",
+                 "culture", "cultural", "traditional", "art", "architecture", "wall", "unesco"),
+    "Foodie": ("food", "market", "street food", "hawker", "cuisine", "restaurant", "snack", "dining"),
+    "Shopping": ("shopping", "mall", "market", "bazaar", "boutique", "souvenir", "street"),
+    "Family": ("zoo", "aquarium", "theme park", "park", "garden", "family", "kids", "disney"),
+    "Romantic": ("sunset", "views", "observation", "night", "lights", "skyline", "cruise", "bridge"),
+    "Budget": ("free",),
+}
+
+# Activities available in every city, used once the attractions run out.
+# Each: (text, opens, closes, hours, styles)
+GENERIC_ACTIVITIES = (
+    ("Visit local market for breakfast and fresh produce", 7.0, 12.0, 2.0, ("Foodie", "Shopping", "Budget")),
+    ("Morning city tour with professional guide", 8.0, 12.0, 3.0, ("Cultural", "Family")),
+    ("Nature walk or hike in nearby parks", 7.0, 17.0, 2.5, ("Adventure", "Relaxation", "Budget")),
+    ("Museum visit to learn about local history", 9.0, 17.0, 2.0, ("Cultural", "Family")),
+    ("Shopping district exploration and souvenir hunting", 10.0, 22.0, 2.5, ("Shopping",)),
+    ("Cultural performance or traditional show", 14.0, 22.0, 2.0, ("Cultural", "Romantic")),
+    ("Guided tour of architectural landmarks", 9.0, 18.0, 2.5, ("Cultural",)),
+    ("Relaxation time at local cafes or parks", 9.0, 21.0, 1.5, ("Relaxation", "Romantic", "Budget")),
+    ("Night market visit for street food and local crafts", 18.0, 23.0, 2.0, ("Foodie", "Shopping", "Budget")),
+    ("City lights viewing from observation deck", 18.0, 23.0, 1.5, ("Romantic", "Family")),
+    ("Local bar or cafe for nightlife experience", 20.0, 23.5, 1.5, ("Relaxation", "Romantic")),
+)
+
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\s*(min|hour|hr)?")
+
+
+def parse_duration(text, default=2.0):
+    """Hours for "2-3 hours" (2.5), "30 mins" (0.5), "Full day" (7), ..."""
+    text = str(text or "").lower()
+    if "full day" in text:
+        return 7.0
+    if "half day" in text:
+        return 4.0
+    match = DURATION_PATTERN.search(text)
+    if not match:
+        return default
+    low = float(match.group(1))
+    high = float(match.group(2)) if match.group(2) else low
+    hours = (low + high) / 2
+    return hours / 60 if match.group(3) == "min" else hours
+
+
+def parse_hours(text):
+    """(opens, closes) for "09:00-18:00"; None if text is not a time range"""
+    match = re.match(r"\s*(\d{1,2})[:.](\d{2})\s*-\s*(\d{1,2})[:.](\d{2})", str(text or ""))
+    if not match:
+        return None
+    opens = int(match.group(1)) + int(match.group(2)) / 60
+    closes = int(match.group(3)) + int(match.group(4)) / 60
+    return opens, closes if closes > opens else closes + 24
+
+
+def opening_hours(attraction):
+    hours = parse_hours(attraction.get("opening_hours"))
+    if hours:
+        return hours
+    return BEST_TIME_HOURS.get(str(attraction.get("best_time", "")).strip().lower(), DEFAULT_HOURS)
+
+
+def clock(hours):
+    minutes = int(round(hours * 60))
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+
+def period(hours):
+    return "Morning" if hours < 12 else "Afternoon" if hours < 18 else "Evening"
+
+
+def format_hours(hours):
+    return f"{hours:g} hour" if hours == 1 else f"{hours:g} hours"
+
+
+class Candidate(NamedTuple):
+    """Something that can be scheduled, with its precomputed score"""
+    kind: str              # "attraction" or "activity"
+    text: str
+    opens: float
+    closes: float
+    hours: float
+    price: str
+    score: float
+    item: Optional[Dict]
+
+
+class ItineraryPlan(NamedTuple):
+    seed: int
+    tier: str
+    hotel: Optional[Dict]
+    car: Optional[Dict]
+    days: Dict[int, List[Dict]]
+    distances: Dict[int, float]    # day -> km travelled between its attractions
+
+
+class ItineraryPlanner:
+    """Scores the destination's catalogs once and fits the best of them into days.
+
+    Every attraction, restaurant, hotel and car gets one score from its
+    rating, its price against the daily allowance of the budget tier (from
+    trip_costs) and how well it matches the selected travel styles. Days
+    are then filled in order: from the start of the day, the next unused
+    attraction that is open and fits before the next meal is placed, lunch
+    and dinner go to the best restaurants in turn, and generic activities
+    fill what the attractions cannot. Attractions with coordinates are
+    first clustered into day routes with a GeoIndex, best rated first, and
+    each route is ordered with a short-tour heuristic, so a day visits
+    nearby sights in a sensible order. Ties are broken by a random.Random
+    seeded from seed, so the same seed always gives the same plan.
+    """
+
+    def __init__(self, itinerary, catalogs, seed=None):
+        self.itinerary = itinerary
+        self.catalogs = catalogs
+        if seed is None:
+            seed = zlib.crc32(str(itinerary.get("plan_id", "")).encode("utf-8"))
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.days = max(1, int(itinerary.get("days") or 1))
+        self.travelers = max(1, int(itinerary.get("travelers") or 1))
+        self.styles = set(itinerary.get("travel_styles") or [])
+        self.country = country_of(itinerary.get("destination"))
+        self.tier = budget_tier(itinerary.get("budget"))
+        self.hotel = None
+        self.meal_count = 0
+
+    # ---------- scoring ----------
+    def allowance(self, category):
+        return float(DAILY_COSTS[self.country, self.tier, category])
+
+    def price_fit(self, price, allowance):
+        """1 when price is within allowance, falling off as it exceeds it"""
+        if price is None or price <= allowance:
+            return 1.0
+        return allowance / price
+
+    def style_match(self, text, styles=()):
+        if not self.styles:
+            return 0.5
+        text = text.lower()
+        matched = sum(1 for style in self.styles
+                      if style in styles or any(word in text for word in STYLE_KEYWORDS.get(style, ())))
+        return matched / len(self.styles)
+
+    def score(self, rating, price, allowance, text, styles=()):
+        rating = float(rating or 0) / 5.0
+        return (RATING_WEIGHT * min(1.0, rating)
+                + PRICE_WEIGHT * self.price_fit(price, allowance)
+                + STYLE_WEIGHT * self.style_match(text, styles)
+                + self.rng.random() * 1e-6)
+
+    def attraction_candidates(self):
+        allowance = self.allowance("activities")
+        candidates = []
+        for attraction in self.catalogs.get("attractions", []):
+            _, price = parse_amount(attraction.get("price"))
+            text = " ".join([attraction.get("name", ""), attraction.get("description", ""),
+                             attraction.get("price", "")] + list(attraction.get("features", [])))
+            opens, closes = opening_hours(attraction)
+            candidates.append(Candidate(
+                "attraction", attraction.get("name", "Attraction"), opens, closes,
+                parse_duration(attraction.get("duration")), attraction.get("price", ""),
+                self.score(attraction.get("rating"), price, allowance, text), attraction))
+        return sorted(candidates, key=lambda c: -c.score)
+
+    def activity_candidates(self):
+        rating = 4.0  # generic activities rank below well-rated attractions
+        return [Candidate("activity", text, opens, closes, hours, "", self.score(rating, None, 0, text, styles), None)
+                for text, opens, closes, hours, styles in GENERIC_ACTIVITIES]
+
+    def rank(self, items, price_field, category):
+        """items ordered best first for the tier and styles"""
+        allowance = self.allowance(category)
+        scored = []
+        for item in items:
+            _, price = parse_amount(item.get(price_field))
+            text = " ".join([item.get("name", ""), str(item.get("type", ""))] + list(item.get("features", [])))
+            scored.append((self.score(item.get("rating"), price, allowance, text), item))
+        scored.sort(key=lambda pair: -pair[0])
+        return [item for _, item in scored]
+
+    # ---------- scheduling ----------
+    def entry(self, start, hours, text, kind, price="", item=None, note=""):
+        return {
+            "time": f"{clock(start)} - {clock(start + hours)}",
+            "period": period(start),
+            "activity": text,
+            "kind": kind,
+            "start": clock(start),
+            "end": clock(start + hours),
+            "duration": format_hours(hours),
+            "price": price,
+            "note": note,
+            "attraction": item,
+            "distance_km": None,
+        }
+
+    def best_fit(self, candidates, now, limit, long_limit, used):
+        """(start, candidate) of the best candidate that can run between now and limit
+
+        Long visits may run until long_limit instead.
+        """
+        for candidate in candidates:
+            if candidate.text in used:
+                continue
+            start = max(now, candidate.opens)
+            end_by = long_limit if candidate.hours >= LONG_VISIT else limit
+            if start - now <= MAX_WAIT and start + candidate.hours <= min(end_by, candidate.closes):
+                return start, candidate
+        return None
+
+    def day_routes(self, attractions):
+        """The located attraction candidates clustered into per-day routes
+
+        Returns (routes, located, index): lists of candidates in visiting
+        order, best rated cluster first; the candidates with coordinates; and
+        the GeoIndex over them.
+        """
+        located = [candidate for candidate in attractions if coordinates(candidate.item)]
+        index = GeoIndex([candidate.item for candidate in located])
+        routes = []
+        # located is in score order, so clusters start from the best attractions
+        for group in index.clusters(ATTRACTIONS_PER_DAY, range(len(located))):
+            order = route([coordinates(located[i].item) for i in group])
+            routes.append([located[group[i]] for i in order])
+        return routes, located, index
+
+    def day_candidates(self, day, attractions, routes, located, index):
+        """Attractions to try on day, in order: its route, then nearby ones, else best rated"""
+        if day > len(routes):
+            return attractions
+        day_route = routes[day - 1]
+        centre = coordinates(day_route[0].item)
+        nearby = [located[i] for _, i in index.within(centre, DAY_RADIUS_KM)]
+        return day_route + [candidate for candidate in nearby if candidate not in day_route]
+
+    def measure_day(self, entries):
+        """Set each located attraction's distance from the previous one; returns the day's km"""
+        points = []
+        for entry in entries:
+            point = coordinates(entry["attraction"] or {})
+            if point is None:
+                continue
+            if points:
+                entry["distance_km"] = round(haversine_km(points[-1], point), 1)
+            points.append(point)
+        return round(path_km(points), 1)
+
+    def schedule_day(self, day, attractions, activities, restaurants, used_attractions, activity_uses):
+        entries = []
+        now = ARRIVAL_DAY_START if day == 1 else DAY_START
+        hotel = self.hotel
+        if day == 1 and hotel:
+            entries.append(self.entry(now, 1.0, f"Check in at {hotel['name']}", "hotel",
+                                      hotel.get("price", ""), note=hotel.get("location", "")))
+            now += 1.0
+        meals = [meal for meal in MEALS if meal[1] >= now - 0.5]
+        used_today = set()
+
+        while now < DAY_END:
+            next_meal = meals[0] if meals else None
+            if next_meal and now >= next_meal[1] - 0.25:
+                name, _, hours = meals.pop(0)
+                if restaurants:
+                    restaurant = restaurants[self.meal_count % len(restaurants)]
+                    self.meal_count += 1
+                    entries.append(self.entry(now, hours, f"{name} at {restaurant['name']}", "meal",
+                                              restaurant.get("price_range", ""),
+                                              note=", ".join(restaurant.get("features", [])[:2])))
+                else:
+                    entries.append(self.entry(now, hours, f"{name} at a local restaurant", "meal"))
+                now += hours
+                continue
+
+            limit = next_meal[1] if next_meal else DAY_END
+            long_limit = meals[1][1] if len(meals) > 1 else DAY_END
+            fit = self.best_fit(attractions, now, limit, long_limit, used_attractions)
+            if fit is None:
+                # Least used generic activity first, so days don't repeat
+                ordered = sorted(activities, key=lambda c: (activity_uses.get(c.text, 0), -c.score))
+                fit = self.best_fit(ordered, now, limit, long_limit, used_today)
+            if fit is None:
+                now = limit if next_meal else DAY_END
+                continue
+
+            start, candidate = fit
+            if candidate.kind == "attraction":
+                used_attractions.add(candidate.text)
+            else:
+                activity_uses[candidate.text] = activity_uses.get(candidate.text, 0) + 1
+            used_today.add(candidate.text)
+            now = start + candidate.hours
+            note = (candidate.item or {}).get("best_time", "")
+            while meals and meals[0][1] < now:
+                note = f"{meals.pop(0)[0]} during the visit"
+            entries.append(self.entry(start, candidate.hours, candidate.text, candidate.kind,
+                                      candidate.price, candidate.item, note))
+        return entries
+
+    def plan(self, progress=None):
+        """Build the ItineraryPlan; progress(done, total, message) is called as it goes"""
+        total = self.days + 1
+
+        def report(done, message):
+            if progress is not None:
+                progress(done, total, message)
+
+        report(0, "Scoring attractions, hotels and restaurants...")
+        attractions = self.attraction_candidates()
+        activities = self.activity_candidates()
+        restaurants = self.rank(self.catalogs.get("restaurants", []), "price_range", "food")
+        hotels = self.rank(self.catalogs.get("hotels", []), "price", "accommodation")
+        cars = self.rank(self.catalogs.get("cars", []), "price_per_day", "transportation")
+        self.hotel = hotels[0] if hotels else None
+        wants_car = self.itinerary.get("transportation") in ("Rental Car", "Mix of All")
+        car = cars[0] if cars and wants_car else None
+        self.meal_count = 0
+        report(1, "Scheduling days...")
+
+        routes, located, index = self.day_routes(attractions)
+        days, distances = {}, {}
+        used_attractions, activity_uses = set(), {}
+        for day in range(1, self.days + 1):
+            candidates = self.day_candidates(day, attractions, routes, located, index)
+            days[day] = self.schedule_day(day, candidates, activities, restaurants,
+                                          used_attractions, activity_uses)
+            distances[day] = self.measure_day(days[day])
+            report(day + 1, f"Planned day {day} of {self.days}")
+        return ItineraryPlan(self.seed, self.tier, self.hotel, car, days, distances)
+
+
+def plan_itinerary(itinerary, catalogs, seed=None, progress=None):
+    """Plan itinerary from catalogs ({"attractions", "restaurants", "hotels", "cars"}: [items])"""
+    return ItineraryPlanner(itinerary, catalogs, seed).plan(progress)
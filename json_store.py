@@ -0,0 +1,180 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+COMPACT_SEPARATORS = (",", ":")
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(path):
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(path, threading.RLock())
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock for path across threads and processes
+
+    The lock is taken on a "<path>.lock" file next to path, so it also
+    covers the moment the data file itself is replaced by a rename.
+    """
+    path = os.path.abspath(path)
+    with _thread_lock(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".lock", "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    """Write data as JSON so that path always holds either the old or the new file
+
+    The JSON goes to a temporary file in the same directory, is flushed to
+    disk and then renamed over path, so a crash mid-write never leaves a
+    truncated file behind.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _dump_options(compact, indent):
+    if compact:
+        return {"separators": COMPACT_SEPARATORS, "ensure_ascii": False}
+    return {"indent": indent, "ensure_ascii": False}
+
+
+def write_json(path, data, compact=False, indent=2, lock=True):
+    """Atomically replace path with data as JSON, holding the file lock
+
+    compact drops indentation and spaces, for files only the app reads.
+    """
+    if lock:
+        with file_lock(path):
+            write_json_atomic(path, data, **_dump_options(compact, indent))
+    else:
+        write_json_atomic(path, data, **_dump_options(compact, indent))
+
+
+def _load_json(path, default):
+    """Parsed JSON from path; a file that is not valid JSON is moved aside and default returned"""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            return json.load(f)
+        except ValueError as e:
+            error = e
+    corrupt_path = path + ".corrupt"
+    os.replace(path, corrupt_path)
+    print(f"Error reading {path}: {error}; moved it to {corrupt_path}")
+    return default
+
+
+def read_json(path, default=None, lock=True):
+    """Parsed JSON from path, or default if the file is missing or unreadable
+
+    A file that is not valid JSON is renamed to "<path>.corrupt" before
+    default is returned, so the next save cannot overwrite the only copy
+    of the user's data.
+    """
+    if not os.path.exists(path):
+        return default
+    try:
+        if lock:
+            with file_lock(path):
+                return _load_json(path, default)
+        return _load_json(path, default)
+    except OSError as e:
+        print(f"Error reading {path}: {e}")
+        return default
+
+
+class BackgroundWriter:
+    """Writes JSON files on a daemon thread, keeping only the latest data per path.
+
+    write() returns immediately; if the same path is written again before the
+    thread got to it, only the newer data is written. Each file is written
+    with write_json(), so it is atomic and holds the file lock. flush() blocks
+    until everything handed over so far is on disk, for use when a page
+    closes.
+    """
+
+    def __init__(self):
+        self._pending = {}       # path -> (data, write_json options)
+        self._writing = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def write(self, path, data, compact=False, indent=2):
+        """Queue data for path; data must not be mutated afterwards"""
+        with self._cond:
+            self._pending[path] = (data, {"compact": compact, "indent": indent})
+            self._cond.notify_all()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="json-writer", daemon=True)
+                self._thread.start()
+
+    def flush(self, timeout=None):
+        """Wait until every queued write has finished; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                path, (data, options) = self._pending.popitem()
+                self._writing += 1
+            try:
+                write_json(path, data, **options)
+            except Exception as e:
+                print(f"Error saving {path}: {e}")
+            finally:
+                with self._cond:
+                    self._writing -= 1
+                    self._cond.notify_all()
+
+
+_writer = None
+
+
+def get_background_writer():
+    """Return the shared BackgroundWriter, flushed when the interpreter exits"""
+    global _writer
+    if _writer is None:
+        _writer = BackgroundWriter()
+        atexit.register(_writer.flush, 5)
+    return _writer
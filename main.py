@@ -1,13 +1,100 @@
+import time
+STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import messagebox, ttk
-import json
+import argparse
 import os
 import re
 from datetime import datetime, timedelta
+import base64
+import binascii
 import hashlib
+import hmac
 import random
 import string
-import sys
+from page_router import StartupProfiler, get_router, run
+from user_store import get_user_store
+from session import start_session
+
+class PasswordHasher:
+    """Salted, tunable password hashing with self-describing hash strings.
+
+    Hashes are stored as "scrypt$n$r$p$salt$hash" or
+    "pbkdf2_sha256$iterations$salt$hash" (salt and hash base64), so the
+    algorithm and cost used for each user travel with the hash and can be
+    raised later without breaking existing accounts. Unsalted SHA-256 hex
+    digests written by older versions still verify; needs_rehash() reports
+    them, and any hash made with other settings, so login can upgrade them.
+    Run benchmarks/password_hashing.py to pick costs for the target machine.
+    """
+    LEGACY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+    
+    def __init__(self, algorithm="scrypt", n=2 ** 14, r=8, p=1, iterations=600_000, salt_size=16):
+        if algorithm == "scrypt" and not hasattr(hashlib, "scrypt"):
+            # Python built against an OpenSSL without scrypt
+            algorithm = "pbkdf2_sha256"
+        if algorithm not in ("scrypt", "pbkdf2_sha256"):
+            raise ValueError(f"Unknown password hash algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.n, self.r, self.p = n, r, p
+        self.iterations = iterations
+        self.salt_size = salt_size
+    
+    @staticmethod
+    def _scrypt(password, salt, n, r, p):
+        # maxmem must cover the 128 * r * (n + p + 2) bytes scrypt works in
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=128 * r * (n + p + 2) + 1024 * 1024, dklen=32)
+    
+    @staticmethod
+    def _pbkdf2(password, salt, iterations):
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    
+    @staticmethod
+    def _b64(data):
+        return base64.b64encode(data).decode("ascii")
+    
+    def hash(self, password):
+        """Hash password with a fresh salt using the configured algorithm and cost"""
+        salt = os.urandom(self.salt_size)
+        if self.algorithm == "scrypt":
+            digest = self._scrypt(password, salt, self.n, self.r, self.p)
+            return f"scrypt${self.n}${self.r}${self.p}${self._b64(salt)}${self._b64(digest)}"
+        digest = self._pbkdf2(password, salt, self.iterations)
+        return f"pbkdf2_sha256${self.iterations}${self._b64(salt)}${self._b64(digest)}"
+    
+    def verify(self, password, stored):
+        """True if password matches a stored hash of any supported format"""
+        if not stored:
+            return False
+        if self.LEGACY_PATTERN.match(stored):
+            legacy = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(legacy, stored)
+        
+        parts = stored.split("$")
+        try:
+            if parts[0] == "scrypt" and len(parts) == 6:
+                n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+                digest = self._scrypt(password, base64.b64decode(parts[4]), n, r, p)
+                return hmac.compare_digest(digest, base64.b64decode(parts[5]))
+            if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+                digest = self._pbkdf2(password, base64.b64decode(parts[2]), int(parts[1]))
+                return hmac.compare_digest(digest, base64.b64decode(parts[3]))
+        except (ValueError, binascii.Error):
+            pass
+        return False
+    
+    def needs_rehash(self, stored):
+        """True if stored was made with a legacy format or other settings than ours"""
+        parts = (stored or "").split("$")
+        if self.algorithm == "scrypt":
+            return parts[:4] != ["scrypt", str(self.n), str(self.r), str(self.p)]
+        return parts[:2] != ["pbkdf2_sha256", str(self.iterations)]
+
+
+# Hasher used for new and upgraded passwords
+password_hasher = PasswordHasher()
 
 class ModernButton(tk.Button):
     """Custom modern button with hover effects"""
@@ -171,7 +258,7 @@ class WelcomeApp:
         self.welcome_gradient = ["#1a2980", "#26d0ce"]
         
         # Files
-        self.users_file = "traney_users.json"
+        self.users = get_user_store()
         self.users_data = {} 
         self.pending_otps = {}
         self.reset_email = None
@@ -862,32 +949,20 @@ class WelcomeApp:
     
     def hash_password(self, password):
         """Hash password"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        return password_hasher.hash(password)
     
     def user_exists(self, email):
         """Check if user exists"""
-        if not os.path.exists(self.users_file):
-            return False
         try:
-            with open(self.users_file, 'r', encoding='utf-8') as f:
-                users = json.load(f)
-                return email in users
+            return self.users.exists(email)
         except:
             return False
     
     def create_account_simple(self, name, email, password):
         """Create new account"""
         try:
-            users = {}
-            if os.path.exists(self.users_file):
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    users = json.load(f)
-            
-            if email in users:
-                return False
-            
             # Create complete user data structure compatible with profile.py
-            users[email] = {
+            user = {
                 "personal_info": {
                     "full_name": name,
                     "email": email,
@@ -901,10 +976,8 @@ class WelcomeApp:
                 "bookings": []  # Initialize empty bookings list
             }
             
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump(users, f, indent=4, ensure_ascii=False)
-            
-            return True
+            # Fails if the email was registered in the meantime
+            return self.users.create(email, user)
         except Exception as e:
             return False
     
@@ -949,20 +1022,20 @@ class WelcomeApp:
     
     def validate_login_simple(self, email, password):
         """Simple login validation"""
-        if not os.path.exists(self.users_file):
-            return False
-        
         try:
-            with open(self.users_file, 'r', encoding='utf-8') as f:
-                users = json.load(f)
-            
-            if email not in users:
+            stored_hash = self.users.password_hash(email)
+            if stored_hash is None:
                 return False
             
             # Validate password
-            stored_hash = users[email].get("password")
-            input_hash = self.hash_password(password)
-            password_match = stored_hash == input_hash
+            password_match = password_hasher.verify(password, stored_hash)
+            
+            # Upgrade legacy or weaker hashes now that we know the password
+            if password_match and password_hasher.needs_rehash(stored_hash):
+                try:
+                    self.users.set_password(email, self.hash_password(password))
+                except Exception:
+                    pass
             
             return password_match
             
@@ -972,26 +1045,14 @@ class WelcomeApp:
     def get_user_data(self, email):
         """Get user data"""
         try:
-            with open(self.users_file, 'r', encoding='utf-8') as f:
-                users = json.load(f)
-                return users.get(email)
+            return self.users.get(email)
         except Exception as e:
             return None
     
     def reset_user_password(self, email, new_password):
         """Reset user password"""
         try:
-            with open(self.users_file, 'r', encoding='utf-8') as f:
-                users = json.load(f)
-            
-            if email not in users:
-                return False
-            
-            users[email]["password"] = self.hash_password(new_password)
-            
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump(users, f, indent=4, ensure_ascii=False)
-            return True
+            return self.users.set_password(email, self.hash_password(new_password))
         except:
             return False
     
@@ -1010,8 +1071,12 @@ class WelcomeApp:
             messagebox.showerror("Error", "Please enter a valid email address")
             return
         
-        # Check if user file exists
-        if not os.path.exists(self.users_file):
+        # Check if any account exists
+        try:
+            has_users = self.users.count() > 0
+        except Exception:
+            has_users = False
+        if not has_users:
             messagebox.showerror("Error", "No user database found. Please sign up first.")
             return
         
@@ -1041,61 +1106,32 @@ class WelcomeApp:
                 
                 user_name = user_data['personal_info']['full_name']
                 
-                # Save user data to session file
-                session_data = {
-                    'email': email,
-                    'user_name': user_name,
-                    'full_profile': user_data
-                }
-                
-                try:
-                    with open('user_session.json', 'w', encoding='utf-8') as f:
-                        json.dump(session_data, f, indent=2, ensure_ascii=False)
-                except Exception as e:
-                    pass
+                # Start the session; it is kept on disk for pages started on their own
+                start_session(email, user_name, user_data)
                 
-                # Destroy current window
-                self.root.destroy()
-                
-                # Open HomeApp
+                # Open HomeApp in the same window
                 try:
-                    from home import HomeApp
-                    
-                    home_root = tk.Tk()
-                    
-                    try:
-                        # Try different parameter combinations for HomeApp
-                        try:
-                            app = HomeApp(home_root, email, user_name)
-                        except TypeError as e:
-                            error_msg = str(e)
-                            
-                            if "__init__() takes 2 positional arguments" in error_msg:
-                                app = HomeApp(home_root)
-                            elif "__init__() takes from 2 to 4 positional arguments" in error_msg:
-                                try:
-                                    app = HomeApp(home_root, email)
-                                except:
-                                    app = HomeApp(home_root, email, user_name)
-                            else:
-                                # Try 4 parameters
-                                app = HomeApp(home_root, email, user_name, user_data)
-                    
-                    except Exception as e:
-                        messagebox.showerror("Error", f"Cannot create home screen: {str(e)}")
-                        sys.exit(1)
-                    
-                    home_root.mainloop()
-                    
+                    get_router().show("home", email, user_name)
                 except Exception as e:
                     messagebox.showerror("Error", f"Cannot open home screen: {str(e)}")
-                    sys.exit(1)
             else:
                 messagebox.showerror("Error", "User data not found")
         else:
             messagebox.showerror("Error", "Invalid email or password!")
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = WelcomeApp(root)
-    root.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Traney travel application")
+    parser.add_argument("--profile-startup", nargs="?", const="", metavar="JSON",
+                        help="print import and first-frame times of every page shown, "
+                             "optionally also writing them to JSON")
+    args = parser.parse_args()
+    
+    profiler = None
+    if args.profile_startup is not None:
+        profiler = StartupProfiler(STARTED, args.profile_startup or None)
+        get_router().profiler = profiler
+    try:
+        run("login")
+    finally:
+        if profiler is not None:
+            profiler.report()
\ No newline at end of file
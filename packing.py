@@ -1,12 +1,13 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
-import os
-import sys
-import subprocess
 from datetime import datetime
+from page_router import get_router, run
+from json_store import get_background_writer, read_json
 
 class PackingApp:
+    # Autosave waits this long after a change so that a burst of clicks is saved once
+    SAVE_DELAY_MS = 500
+    
     def __init__(self, root, email=None, return_home_callback=None, user_data=None):
         self.root = root
         self.email = email
@@ -50,16 +51,25 @@ class PackingApp:
             "Miscellaneous": ["Books/Magazines", "Travel Pillow", "Water Bottle", "Snacks", "Sunglasses"]
         }
         
-        # Track checked items
+        # Track checked items: category -> set of packed item names
         self.checked_items = {}
         for category in self.default_items.keys():
-            self.checked_items[category] = []
+            self.checked_items[category] = set()
+        
+        # Running totals shown in the stats bar, kept up to date by every edit
+        self.total_items = 0
+        self.packed_total = 0
         
         # Load packing list
         self.load_packing_list()
+        self.index_checked_items()
+        
+        # Pending autosave; changes within SAVE_DELAY_MS are written together
+        self.save_job = None
         
         # Setup UI
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def load_packing_list(self):
         """Load packing list from file or use defaults"""
@@ -72,30 +82,31 @@ class PackingApp:
                 self.packing_items[category] = items.copy()
     
     def save_packing_list(self):
-        """Save packing list to file"""
-        if self.email:
+        """Schedule an autosave of the packing list"""
+        if self.email and self.save_job is None:
+            self.save_job = self.root.after(self.SAVE_DELAY_MS, self.save_to_file)
+    
+    def flush_packing_list(self):
+        """Write any pending changes now and wait until they are on disk"""
+        if self.save_job is not None:
+            self.root.after_cancel(self.save_job)
             self.save_to_file()
+        get_background_writer().flush()
     
     def save_to_file(self):
-        """Save packing list to local JSON file"""
+        """Save packing list to local JSON file on the background writer"""
+        self.save_job = None
         if not self.email:
             return
-            
-        try:
-            # Create directory if it doesn't exist
-            if not os.path.exists("user_data"):
-                os.makedirs("user_data")
-            
-            filename = f"user_data/packing_{self.email.replace('@', '_').replace('.', '_')}.json"
-            with open(filename, 'w') as f:
-                json.dump({
-                    'packing_items': self.packing_items,
-                    'checked_items': self.checked_items,
-                    'last_modified': datetime.now().isoformat()
-                }, f)
-            print(f"Saved packing list to {filename}")
-        except Exception as e:
-            print(f"Error saving to file: {e}")
+        
+        filename = f"user_data/packing_{self.email.replace('@', '_').replace('.', '_')}.json"
+        # Copy the lists so later edits on the Tk thread cannot race the writer
+        get_background_writer().write(filename, {
+            'packing_items': {category: list(items) for category, items in self.packing_items.items()},
+            'checked_items': {category: [item for item in items if item in self.checked_items.get(category, ())]
+                              for category, items in self.packing_items.items()},
+            'last_modified': datetime.now().isoformat()
+        }, compact=True)
     
     def load_from_file(self):
         """Load packing list from local JSON file"""
@@ -104,10 +115,8 @@ class PackingApp:
             
         try:
             filename = f"user_data/packing_{self.email.replace('@', '_').replace('.', '_')}.json"
-            if os.path.exists(filename):
-                with open(filename, 'r') as f:
-                    file_data = json.load(f)
-                
+            file_data = read_json(filename)
+            if isinstance(file_data, dict):
                 # Load packing items
                 if 'packing_items' in file_data and isinstance(file_data['packing_items'], dict):
                     self.packing_items = file_data['packing_items']
@@ -127,6 +136,16 @@ class PackingApp:
             for category, items in self.default_items.items():
                 self.packing_items[category] = items.copy()
     
+    def index_checked_items(self):
+        """Turn the loaded checked lists into sets and recompute the running totals"""
+        checked = self.checked_items
+        self.checked_items = {}
+        for category, items in self.packing_items.items():
+            # Drop checks for items no longer on the list
+            self.checked_items[category] = set(checked.get(category, ())) & set(items)
+        self.total_items = sum(len(items) for items in self.packing_items.values())
+        self.packed_total = sum(len(items) for items in self.checked_items.values())
+    
     def setup_ui(self):
         """Setup packing list UI"""
         self.root.title("TravelEase - Packing List")
@@ -405,7 +424,7 @@ class PackingApp:
         self.update_quick_add_items()
     
     def setup_stats_frame(self, parent):
-        """Setup statistics frame"""
+        """Setup statistics frame; update_stats() only changes the label texts"""
         self.stats_frame = tk.Frame(parent, bg=self.COLORS["white"], height=50)
         self.stats_frame.pack(fill="x", pady=(15, 0))
         self.stats_frame.pack_propagate(False)
@@ -413,6 +432,46 @@ class PackingApp:
         stats_inner = tk.Frame(self.stats_frame, bg=self.COLORS["white"])
         stats_inner.pack(expand=True, fill="both")
         
+        self.categories_label = tk.Label(stats_inner,
+                font=("Arial", 11),
+                bg=self.COLORS["white"],
+                fg=self.COLORS["text"])
+        self.categories_label.pack(side="left", padx=20)
+        
+        self.total_label = tk.Label(stats_inner,
+                font=("Arial", 11),
+                bg=self.COLORS["white"],
+                fg=self.COLORS["text"])
+        self.total_label.pack(side="left", padx=20)
+        
+        self.packed_label = tk.Label(stats_inner,
+                font=("Arial", 11),
+                bg=self.COLORS["white"],
+                fg=self.COLORS["success"])
+        self.packed_label.pack(side="left", padx=20)
+        
+        # Summary List Button
+        summary_btn = tk.Button(stats_inner, 
+                               text="📊 Summary List",
+                               command=self.show_summary_list,
+                               font=("Arial", 11, "bold"),
+                               bg=self.COLORS["info"],
+                               fg="white",
+                               bd=0,
+                               cursor="hand2",
+                               padx=15,
+                               pady=5)
+        summary_btn.pack(side="right", padx=20)
+        
+        # Auto-save notice
+        if self.email:
+            save_label = tk.Label(stats_inner, 
+                                 text="💾 Auto-saved",
+                                 font=("Arial", 9),
+                                 bg=self.COLORS["white"],
+                                 fg=self.COLORS["success"])
+            save_label.pack(side="right", padx=5)
+        
         self.update_stats()
     
     def switch_category(self, category):
@@ -484,6 +543,7 @@ class PackingApp:
             widget.destroy()
         
         self.checkbox_vars = []
+        self.checkbox_labels = []
         items = self.packing_items.get(self.current_category, [])
         
         # Display items
@@ -503,7 +563,7 @@ class PackingApp:
         # Checkbox
         var = tk.BooleanVar()
         # Check if this item is already marked as packed
-        initial_state = item in self.checked_items.get(self.current_category, [])
+        initial_state = item in self.checked_items.get(self.current_category, ())
         var.set(initial_state)
         self.checkbox_vars.append(var)
         
@@ -514,6 +574,7 @@ class PackingApp:
                                  fg=self.COLORS["success"] if initial_state else self.COLORS["text_light"],
                                  cursor="hand2")
         checkbox_label.pack(side="left", padx=(15, 10))
+        self.checkbox_labels.append(checkbox_label)
         checkbox_label.bind("<Button-1>", 
                           lambda e, idx=index, v=var, it=item: self.toggle_checkbox(idx, v, it))
         
@@ -565,81 +626,32 @@ class PackingApp:
         """Toggle checkbox state and update checked items"""
         var.set(not var.get())
         
-        # Find the checkbox label in the widget tree
-        item_frame = self.items_container.winfo_children()[index]
-        checkbox_label = item_frame.winfo_children()[0]
+        checkbox_label = self.checkbox_labels[index]
+        checked = self.checked_items.setdefault(self.current_category, set())
         
         if var.get():
             checkbox_label.config(text="☑", fg=self.COLORS["success"])
             # Add to checked items
-            if item not in self.checked_items[self.current_category]:
-                self.checked_items[self.current_category].append(item)
+            if item not in checked:
+                checked.add(item)
+                self.packed_total += 1
         else:
             checkbox_label.config(text="☐", fg=self.COLORS["text_light"])
             # Remove from checked items
-            if item in self.checked_items[self.current_category]:
-                self.checked_items[self.current_category].remove(item)
+            if item in checked:
+                checked.discard(item)
+                self.packed_total -= 1
         
         self.save_packing_list()  # Auto-save when checking/unchecking
         self.update_stats()
     
     def update_stats(self):
-        """Update statistics display"""
-        # Clear existing stats
-        for widget in self.stats_frame.winfo_children():
-            widget.destroy()
-        
-        stats_inner = tk.Frame(self.stats_frame, bg=self.COLORS["white"])
-        stats_inner.pack(expand=True, fill="both")
-        
-        # Calculate totals
-        total_items = 0
-        packed_items = 0
+        """Update statistics display from the running totals"""
+        packed_percentage = (self.packed_total / self.total_items * 100) if self.total_items > 0 else 0
         
-        for category, items in self.packing_items.items():
-            total_items += len(items)
-            packed_items += len(self.checked_items.get(category, []))
-        
-        # Calculate percentages
-        packed_percentage = (packed_items / total_items * 100) if total_items > 0 else 0
-        
-        # Display stats
-        tk.Label(stats_inner, text=f"📦 Categories: {len(self.packing_items)}",
-                font=("Arial", 11),
-                bg=self.COLORS["white"],
-                fg=self.COLORS["text"]).pack(side="left", padx=20)
-        
-        tk.Label(stats_inner, text=f"📋 Total Items: {total_items}",
-                font=("Arial", 11),
-                bg=self.COLORS["white"],
-                fg=self.COLORS["text"]).pack(side="left", padx=20)
-        
-        tk.Label(stats_inner, text=f"✅ Packed: {packed_items}/{total_items} ({packed_percentage:.0f}%)",
-                font=("Arial", 11),
-                bg=self.COLORS["white"],
-                fg=self.COLORS["success"]).pack(side="left", padx=20)
-        
-        # Summary List Button
-        summary_btn = tk.Button(stats_inner, 
-                               text="📊 Summary List",
-                               command=self.show_summary_list,
-                               font=("Arial", 11, "bold"),
-                               bg=self.COLORS["info"],
-                               fg="white",
-                               bd=0,
-                               cursor="hand2",
-                               padx=15,
-                               pady=5)
-        summary_btn.pack(side="right", padx=20)
-        
-        # Auto-save notice
-        if self.email:
-            save_label = tk.Label(stats_inner, 
-                                 text="💾 Auto-saved",
-                                 font=("Arial", 9),
-                                 bg=self.COLORS["white"],
-                                 fg=self.COLORS["success"])
-            save_label.pack(side="right", padx=5)
+        self.categories_label.config(text=f"📦 Categories: {len(self.packing_items)}")
+        self.total_label.config(text=f"📋 Total Items: {self.total_items}")
+        self.packed_label.config(text=f"✅ Packed: {self.packed_total}/{self.total_items} ({packed_percentage:.0f}%)")
     
     def on_frame_configure(self, event):
         """Update scrollregion when frame size changes"""
@@ -673,6 +685,8 @@ class PackingApp:
                 self.packing_items[self.current_category] = []
             
             self.packing_items[self.current_category].append(item)
+            self.checked_items.setdefault(self.current_category, set())
+            self.total_items += 1
             self.save_packing_list()
             self.new_item_var.set("")
             self.item_entry.delete(0, tk.END)
@@ -690,6 +704,8 @@ class PackingApp:
         
         if item not in self.packing_items[category]:
             self.packing_items[category].append(item)
+            self.checked_items.setdefault(category, set())
+            self.total_items += 1
             self.save_packing_list()
             
             # If we're viewing this category, update display
@@ -706,10 +722,12 @@ class PackingApp:
             if messagebox.askyesno("Remove Item", 
                                  f"Remove '{item}' from your {self.current_category} list?"):
                 # Remove from checked items if it's there
-                if item in self.checked_items.get(self.current_category, []):
-                    self.checked_items[self.current_category].remove(item)
+                if item in self.checked_items.get(self.current_category, ()):
+                    self.checked_items[self.current_category].discard(item)
+                    self.packed_total -= 1
                 
                 items.pop(index)
+                self.total_items -= 1
                 self.save_packing_list()
                 self.display_current_category_items()
                 self.update_quick_add_items()
@@ -752,13 +770,9 @@ class PackingApp:
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
         
-        # Calculate totals
-        total_items = 0
-        packed_items = 0
-        
-        for category, items in self.packing_items.items():
-            total_items += len(items)
-            packed_items += len(self.checked_items.get(category, []))
+        # Totals
+        total_items = self.total_items
+        packed_items = self.packed_total
         
         packed_percentage = (packed_items / total_items * 100) if total_items > 0 else 0
         
@@ -809,7 +823,7 @@ class PackingApp:
                         bg=self.COLORS["light_gray"], 
                         fg=self.COLORS["navy"]).pack(side="left", padx=15, pady=10)
                 
-                cat_packed = len(self.checked_items.get(category, []))
+                cat_packed = len(self.checked_items.get(category, ()))
                 cat_total = len(items)
                 cat_percentage = (cat_packed / cat_total * 100) if cat_total > 0 else 0
                 
@@ -827,7 +841,7 @@ class PackingApp:
                     item_row.pack(fill="x", pady=2)
                     
                     # Checkbox icon
-                    checkbox_icon = "✅" if item in self.checked_items.get(category, []) else "◻️"
+                    checkbox_icon = "✅" if item in self.checked_items.get(category, ()) else "◻️"
                     tk.Label(item_row, text=checkbox_icon,
                             font=("Arial", 12),
                             bg="white",
@@ -856,7 +870,7 @@ class PackingApp:
         
         for category, important_list in important_items.items():
             for item in important_list:
-                if item in self.packing_items.get(category, []) and item not in self.checked_items.get(category, []):
+                if item in self.packing_items.get(category, []) and item not in self.checked_items.get(category, ()):
                     recommendations.append(f"❗ Remember to pack: {item} ({category})")
         
         # Check for empty categories
@@ -904,96 +918,26 @@ class PackingApp:
         # Save auto-save timestamp
         self.save_packing_list()
     
+    def on_close(self):
+        """Save pending changes before the window closes"""
+        self.flush_packing_list()
+        self.root.destroy()
+    
+    def unmount(self):
+        """Called by the page router before this page is destroyed"""
+        self.flush_packing_list()
+    
     def go_home(self):
         """Return to home page"""
-        self.save_packing_list()
+        self.flush_packing_list()
         self.root.destroy()
         
         if self.return_home_callback:
             self.return_home_callback()
         else:
-            # Try to launch home.py
-            try:
-                import home
-                root = tk.Tk()
-                try:
-                    app = home.HomeApp(root, self.email)
-                except TypeError:
-                    try:
-                        user_name = self.user_data.get('name', 'User')
-                        app = home.HomeApp(root, self.email, user_name)
-                    except TypeError:
-                        app = home.HomeApp(root)
-                root.mainloop()
-            except ImportError:
-                try:
-                    subprocess.Popen([sys.executable, "home.py"])
-                except:
-                    home_window = tk.Tk()
-                    home_window.title("TravelEase - Home")
-                    home_window.geometry("800x600")
-                    home_window.configure(bg=self.COLORS["bg"])
-                    
-                    header = tk.Frame(home_window, bg=self.COLORS["navy"], height=100)
-                    header.pack(fill="x")
-                    header.pack_propagate(False)
-                    
-                    tk.Label(header, text="🏠 TravelEase Home", 
-                            font=("Arial", 28, "bold"),
-                            fg="white", 
-                            bg=self.COLORS["navy"]).pack(pady=30)
-                    
-                    content = tk.Frame(home_window, bg=self.COLORS["bg"])
-                    content.pack(fill="both", expand=True, padx=40, pady=40)
-                    
-                    tk.Label(content, text="Welcome to TravelEase!", 
-                            font=("Arial", 24, "bold"),
-                            bg=self.COLORS["bg"],
-                            fg=self.COLORS["navy"]).pack(pady=20)
-                    
-                    tk.Label(content, text="Your one-stop travel planning solution", 
-                            font=("Arial", 16),
-                            bg=self.COLORS["bg"],
-                            fg=self.COLORS["text_light"]).pack(pady=10)
-                    
-                    features = [
-                        "🧳 Packing List - Plan what to pack",
-                        "🗺️ Itinerary - Plan your daily activities",
-                        "🏨 Accommodation - Find and book hotels",
-                        "🍽️ Restaurants - Discover local dining",
-                        "🚗 Transportation - Book rides and tickets"
-                    ]
-                    
-                    for feature in features:
-                        tk.Label(content, text=feature, 
-                                font=("Arial", 14),
-                                bg=self.COLORS["bg"],
-                                fg=self.COLORS["text"]).pack(anchor="w", pady=8)
-                    
-                    packing_btn = tk.Button(content,
-                                          text="🧳 Open Packing List",
-                                          command=lambda: self.open_packing(home_window),
-                                          font=("Arial", 14, "bold"),
-                                          bg=self.COLORS["dark_orange"],
-                                          fg="white",
-                                          bd=0,
-                                          cursor="hand2",
-                                          padx=30,
-                                          pady=15)
-                    packing_btn.pack(pady=40)
-                    
-                    home_window.mainloop()
-    
-    def open_packing(self, home_window):
-        """Open packing list from home window"""
-        home_window.destroy()
-        root = tk.Tk()
-        app = PackingApp(root, email=self.email, user_data=self.user_data)
-        root.mainloop()
+            get_router().show("home", self.email)
 
 
 # For standalone testing
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = PackingApp(root, "test@example.com")
-    root.mainloop()
\ No newline at end of file
+    run("packing", "test@example.com")
\ No newline at end of file
@@ -0,0 +1,505 @@
+import importlib
+import os
+import sys
+import time
+import tkinter as tk
+from collections import OrderedDict
+
+# Page name -> (module, class). Modules are imported the first time a page is shown.
+PAGES = {
+    "login": ("main", "WelcomeApp"),
+    "home": ("home", "HomeApp"),
+    "hotel": ("hotel", "Hotel"),
+    "flight": ("flight", "Flight"),
+    "attraction": ("attraction", "AttractionApp"),
+    "car_rental": ("car_rental", "CarRentalApp"),
+    "travel_plan": ("travel_plan", "Enhancedtravel_plan"),
+    "packing": ("packing", "PackingApp"),
+    "attraction_detail": ("attraction_detail", "AttractionDetailApp"),
+    "car_detail": ("car_detail", "CarDetailApp"),
+    "detail": ("detail_page", "DetailPage"),
+}
+
+# Script names used by the navigation bars -> page name
+SCRIPTS = {
+    "main.py": "login",
+    "home.py": "home",
+    "hotel.py": "hotel",
+    "Hotel.py": "hotel",
+    "flight.py": "flight",
+    "attraction.py": "attraction",
+    "car_rental.py": "car_rental",
+    "travel_plan.py": "travel_plan",
+    "packing.py": "packing",
+}
+
+
+# Listing pages kept alive (suspended) when the user navigates away, so
+# coming back restores them instead of rebuilding them
+CACHED_PAGES = {"home", "hotel", "flight", "attraction", "car_rental"}
+
+# Global bindings pages install straight from their canvases; they would
+# otherwise keep pointing at destroyed widgets after a page switch
+SCROLL_SEQUENCES = ("<MouseWheel>", "<Button-4>", "<Button-5>")
+
+
+class PageHost(tk.Frame):
+    """Frame a page is mounted into, standing in for the Tk root.
+
+    Pages were written against a tk.Tk root, so window-manager calls (title,
+    geometry, attributes, protocol, ...) and window-level bindings are
+    forwarded to the real root. Bindings and after() jobs made through the
+    host are remembered and removed when the page is unmounted, so the next
+    page starts from a clean window.
+
+    A host can also be suspended: its frame is unpacked and its window and
+    global bindings are set aside, but the widget tree stays alive so
+    resume() can put the page back exactly as it was.
+    """
+
+    def __init__(self, router):
+        super().__init__(router.root)
+        self.router = router
+        self.window = router.root
+        self._bindings = []
+        self._global_bindings = []
+        self._after_jobs = set()
+        self._close_handler = None
+        self._unmounting = False
+        self.suspended = False
+        self._saved = None   # window state set aside by suspend()
+
+    # ==================== WINDOW MANAGER ====================
+    def title(self, *args):
+        return self.window.title(*args)
+
+    def geometry(self, *args):
+        return self.window.geometry(*args)
+
+    def attributes(self, *args):
+        return self.window.attributes(*args)
+
+    def state(self, *args):
+        return self.window.state(*args)
+
+    def minsize(self, *args):
+        return self.window.minsize(*args)
+
+    def resizable(self, *args):
+        return self.window.resizable(*args)
+
+    def iconbitmap(self, *args, **kwargs):
+        return self.window.iconbitmap(*args, **kwargs)
+
+    def protocol(self, name=None, func=None):
+        if name == "WM_DELETE_WINDOW" and func is not None:
+            self._close_handler = func
+        return self.window.protocol(name, func)
+
+    def winfo_x(self):
+        return self.window.winfo_x()
+
+    def winfo_y(self):
+        return self.window.winfo_y()
+
+    # ==================== BINDINGS AND TIMERS ====================
+    def bind(self, sequence=None, func=None, add=None):
+        if sequence is None or func is None:
+            return self.window.bind(sequence, func, add)
+        funcid = self.window.bind(sequence, func, add)
+        self._bindings.append((sequence, funcid))
+        return funcid
+
+    def bind_all(self, sequence=None, func=None, add=None):
+        funcid = super().bind_all(sequence, func, add)
+        if sequence is not None and func is not None:
+            self._global_bindings.append(sequence)
+        return funcid
+
+    def after(self, ms, func=None, *args):
+        if func is None:
+            return super().after(ms)
+
+        def run():
+            self._after_jobs.discard(job)
+            func(*args)
+
+        job = super().after(ms, run)
+        self._after_jobs.add(job)
+        return job
+
+    def after_cancel(self, id):
+        self._after_jobs.discard(id)
+        super().after_cancel(id)
+
+    # ==================== LIFECYCLE ====================
+    def _global_sequences(self):
+        return set(self._global_bindings) | set(SCROLL_SEQUENCES)
+
+    def suspend(self):
+        """Hide the page and detach its bindings, keeping every widget alive"""
+        if self.suspended:
+            return
+        window_bindings = {}
+        for sequence, _ in self._bindings:
+            if sequence not in window_bindings:
+                window_bindings[sequence] = self.window.bind(sequence)
+                self.window.unbind(sequence)
+        global_bindings = {}
+        for sequence in self._global_sequences():
+            global_bindings[sequence] = self.tk.call("bind", "all", sequence)
+            self.unbind_all(sequence)
+        # Pop-up windows of the page would otherwise float over the next one
+        popups = [child for child in self.winfo_children()
+                  if isinstance(child, tk.Toplevel) and child.winfo_ismapped()]
+        for popup in popups:
+            popup.withdraw()
+        self._saved = (self.window.title(), window_bindings, global_bindings, popups)
+        self.window.protocol("WM_DELETE_WINDOW", self.window.destroy)
+        self.pack_forget()
+        self.suspended = True
+
+    def resume(self):
+        """Show a suspended page again with the bindings it had"""
+        if not self.suspended:
+            return
+        title, window_bindings, global_bindings, popups = self._saved
+        self._saved = None
+        self.suspended = False
+        self.pack(fill="both", expand=True)
+        # The Tcl scripts still name the page's callbacks, which stay
+        # registered for as long as the page's widgets exist
+        for sequence, script in window_bindings.items():
+            if script:
+                self.tk.call("bind", self.window._w, sequence, script)
+        for sequence, script in global_bindings.items():
+            if script:
+                self.tk.call("bind", "all", sequence, script)
+        if self._close_handler is not None:
+            self.window.protocol("WM_DELETE_WINDOW", self._close_handler)
+        self.window.title(title)
+        for popup in popups:
+            if popup.winfo_exists():
+                popup.deiconify()
+
+    def unmount(self):
+        """Remove everything the page attached to the window and destroy its widgets"""
+        self._unmounting = True
+        if self.suspended:
+            # The bindings were already detached; the window may now hold
+            # another page's bindings for the same sequences
+            for _, funcid in self._bindings:
+                try:
+                    self.window.deletecommand(funcid)
+                except tk.TclError:
+                    pass
+        else:
+            for sequence, funcid in self._bindings:
+                try:
+                    self.window.unbind(sequence, funcid)
+                except tk.TclError:
+                    pass
+            for sequence in self._global_sequences():
+                self.unbind_all(sequence)
+        for job in list(self._after_jobs):
+            try:
+                super().after_cancel(job)
+            except tk.TclError:
+                pass
+        self._bindings.clear()
+        self._global_bindings.clear()
+        self._after_jobs.clear()
+        self.window.protocol("WM_DELETE_WINDOW", self.window.destroy)
+        tk.Frame.destroy(self)
+
+    def destroy(self):
+        """A page closing its "root" leaves the page; the app exits unless another page opens"""
+        if self._unmounting:
+            tk.Frame.destroy(self)
+        else:
+            self.router.page_closed(self)
+
+
+class StartupProfiler:
+    """Import time and time to first frame of every page the router shows.
+
+    Enabled by main.py --profile-startup. For each page built, import_ms is
+    the time spent importing its module (zero once it is loaded) and
+    first_frame_ms the time from the start of show() until the new page's
+    idle tasks (geometry and drawing) have run. Resumed pages are recorded
+    too, so a regression in either path shows up in the report.
+    """
+
+    def __init__(self, started=None, output=None):
+        self.started = time.perf_counter() if started is None else started
+        self.output = output
+        self.records = []
+
+    def record(self, name, root, started, imported, module_loaded, resumed=False):
+        root.update_idletasks()
+        now = time.perf_counter()
+        self.records.append({
+            "page": name,
+            "resumed": resumed,
+            "module_loaded": module_loaded,
+            "import_ms": round((imported - started) * 1000, 2),
+            "first_frame_ms": round((now - started) * 1000, 2),
+            "since_start_ms": round((now - self.started) * 1000, 2),
+        })
+
+    def report(self):
+        """Print the records, and write them to the output file if one was given"""
+        print(f"{'page':<20}{'import ms':>12}{'first frame ms':>16}{'since start ms':>16}")
+        for record in self.records:
+            name = record["page"] + (" (resumed)" if record["resumed"] else "")
+            print(f"{name:<20}{record['import_ms']:>12.1f}{record['first_frame_ms']:>16.1f}"
+                  f"{record['since_start_ms']:>16.1f}")
+        if self.output:
+            from json_store import write_json
+            write_json(self.output, {"python": sys.version.split()[0], "pages": self.records})
+
+
+class PageRouter:
+    """Shows one page at a time inside a single Tk root.
+
+    Navigation used to destroy the window and start a new Python process
+    for the next screen. The router instead unmounts the current page and
+    builds the next one in the same interpreter, so imports, the image
+    caches and the catalog data survive a page switch.
+
+    Pages in CACHED_PAGES are suspended rather than unmounted. Up to
+    max_suspended of them are kept, least recently used first out, keyed by
+    page name and constructor arguments; showing the same page with the same
+    arguments again resumes it with its widgets, scroll position and filters
+    as the user left them. Pages may define suspend() and resume() methods,
+    which are called around those transitions, and unmount(), called just
+    before the page's widgets are destroyed for good.
+    """
+
+    def __init__(self, root, max_suspended=3):
+        self.root = root
+        self.host = None
+        self.page = None
+        self.page_name = None
+        self.page_key = None
+        self.max_suspended = max_suspended
+        self.suspended = OrderedDict()   # (name, args) -> (host, page), oldest first
+        self.running = False
+        self.profiler = None   # StartupProfiler, set by main.py --profile-startup
+        self._close_job = None
+
+    def page_class(self, name):
+        module_name, class_name = PAGES[name]
+        module = loaded_module(module_name) or importlib.import_module(module_name)
+        return getattr(module, class_name)
+
+    @staticmethod
+    def cache_key(name, args, kwargs):
+        """Key a page is suspended under, or None if it is never cached"""
+        if name not in CACHED_PAGES:
+            return None
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def show(self, name, *args, **kwargs):
+        """Leave the current page and show page name, built with args
+
+        A suspended page with the same name and arguments is resumed instead
+        of being built again.
+        """
+        key = self.cache_key(name, args, kwargs)
+        if key is not None and key == self.page_key:
+            return self.page
+        cached = self.suspended.pop(key, None) if key is not None else None
+        if cached is not None and not cached[0].winfo_exists():
+            cached = None
+        started = time.perf_counter()
+        module_loaded = loaded_module(PAGES[name][0]) is not None
+        page_class = None if cached is not None else self.page_class(name)
+        imported = time.perf_counter()
+        self.leave()
+        if name == "login":
+            # Logging out ends the session the suspended pages belong to
+            self.clear_suspended()
+
+        if cached is not None:
+            host, page = cached
+            self.host, self.page, self.page_name, self.page_key = host, page, name, key
+            host.resume()
+            if hasattr(page, "resume"):
+                page.resume()
+            if self.profiler is not None:
+                self.profiler.record(name, self.root, started, imported, module_loaded, resumed=True)
+            return page
+
+        host = PageHost(self)
+        host.pack(fill="both", expand=True)
+        self.host = host
+        self.page_name = name
+        self.page_key = key
+        self.page = page_class(host, *args, **kwargs)
+        if self.profiler is not None and self.alive():
+            self.profiler.record(name, self.root, started, imported, module_loaded)
+        return self.page
+
+    def open_script(self, script_file, email=None, user_name=None):
+        """Show the page a navigation bar refers to by its script name"""
+        name = SCRIPTS[script_file]
+        if name == "login":
+            return self.show(name)
+        if name == "home":
+            return self.show(name, email, user_name)
+        return self.show(name, email)
+
+    def open_window(self):
+        """A Toplevel over the app window, for the booking and payment screens
+
+        Opened while no page is shown (a screen started on its own), the
+        empty app window is hidden, and the app closes with the last of
+        these windows.
+        """
+        window = tk.Toplevel(self.root)
+        if self.host is None:
+            self.root.withdraw()
+        window.bind("<Destroy>", lambda event: self._window_closed(event, window), add="+")
+        return window
+
+    def _window_closed(self, event, window):
+        if event.widget is window and self._close_job is None:
+            self._close_job = self.root.after_idle(self._close_if_empty)
+
+    def run(self):
+        """Enter the Tk main loop unless it is already running"""
+        if self.running:
+            return
+        self.running = True
+        try:
+            self.root.mainloop()
+        finally:
+            self.running = False
+
+    def alive(self):
+        """False once the window has been closed"""
+        try:
+            return bool(self.root.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def leave(self):
+        """Suspend the current page if it is cacheable, otherwise unmount it"""
+        host, page, key = self.host, self.page, self.page_key
+        if key is None or host is None or not host.winfo_exists():
+            self.unmount()
+            return
+        self.host = self.page = self.page_name = self.page_key = None
+        if hasattr(page, "suspend"):
+            page.suspend()
+        host.suspend()
+        self.suspended[key] = (host, page)
+        while len(self.suspended) > self.max_suspended:
+            _, (old_host, old_page) = self.suspended.popitem(last=False)
+            self._unmount_page(old_host, old_page)
+
+    @staticmethod
+    def _unmount_page(host, page):
+        """Give the page its unmount() hook, then remove its host"""
+        if page is not None and hasattr(page, "unmount"):
+            try:
+                page.unmount()
+            except Exception as e:
+                print(f"Error unmounting page: {e}")
+        if host is not None and host.winfo_exists():
+            host.unmount()
+
+    def unmount(self):
+        host, page = self.host, self.page
+        self.host = None
+        self.page = None
+        self.page_name = None
+        self.page_key = None
+        self._unmount_page(host, page)
+
+    def clear_suspended(self):
+        """Unmount every suspended page"""
+        while self.suspended:
+            _, (host, page) = self.suspended.popitem(last=False)
+            self._unmount_page(host, page)
+
+    def page_closed(self, host):
+        """Called when a page destroys its host itself"""
+        if host is self.host:
+            self.unmount()
+        else:
+            page = None
+            for key, (suspended_host, suspended_page) in list(self.suspended.items()):
+                if suspended_host is host:
+                    del self.suspended[key]
+                    page = suspended_page
+            self._unmount_page(host, page)
+        if self._close_job is None:
+            self._close_job = self.root.after_idle(self._close_if_empty)
+
+    def _close_if_empty(self):
+        self._close_job = None
+        windows = [child for child in self.root.winfo_children() if isinstance(child, tk.Toplevel)]
+        if self.host is None and not windows:
+            self.root.destroy()
+
+
+def loaded_module(module_name):
+    """The page module if it is already imported, or None
+
+    The script the app was started with (main.py, or a page run on its own)
+    is loaded as __main__, not under its own name; importing it again would
+    run the whole script a second time and define a second copy of its page
+    class, so it is returned from there.
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        main = sys.modules.get("__main__")
+        path = getattr(main, "__file__", None)
+        if path and os.path.splitext(os.path.basename(path))[0] == module_name:
+            module = main
+    return module
+
+
+def hide_packed(container):
+    """Unpack every packed child of container, returning what show_packed needs to restore them"""
+    hidden = [(widget, widget.pack_info()) for widget in container.pack_slaves()]
+    for widget, _ in hidden:
+        widget.pack_forget()
+    return hidden
+
+
+def show_packed(hidden):
+    """Pack widgets hidden by hide_packed back in their original order and options"""
+    for widget, options in hidden:
+        if widget.winfo_exists():
+            widget.pack(**options)
+
+
+_router = None
+
+
+def get_router():
+    """Return the shared PageRouter, creating the Tk root on first use"""
+    global _router
+    if _router is None or not _router.alive():
+        _router = PageRouter(tk.Tk())
+    return _router
+
+
+def navigate(script_file, email=None, user_name=None):
+    """Switch the window to the page for script_file"""
+    return get_router().open_script(script_file, email, user_name)
+
+
+def run(name, *args, **kwargs):
+    """Start the app on page name and enter the Tk main loop"""
+    router = get_router()
+    router.show(name, *args, **kwargs)
+    router.run()
@@ -1,11 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
-import json
-import os
-import sys
-import subprocess
 import random
+from page_router import get_router
+from booking_ledger import CANCELLED, CONFIRMED, get_booking_ledger
+from booking_record import BookingRecord, checkout_totals, quote
 
 class PaymentApp:
     def __init__(self, root, email, booking=None, callback=None):
@@ -53,6 +52,9 @@ class PaymentApp:
         # Validate booking data
         self.validate_booking_data()
         
+        # Amount charged, worked out once from the booking's pricing
+        self.checkout = checkout_totals(quote(BookingRecord.from_booking(self.booking)).total)
+        
         # Setup UI
         self.setup_ui()
         
@@ -291,21 +293,12 @@ class PaymentApp:
                 font=("Arial", 16, "bold"),
                 bg="#f8f9fa", fg=self.colors["dark"]).pack(anchor="w", pady=(0, 15))
         
-        # Calculate total
-        try:
-            total_price = float(self.booking.get("total_price", 0))
-        except (ValueError, TypeError):
-            total_price = 0.0
-        
-        tax = total_price * 0.06
-        service_fee = 5.00 if total_price < 500 else 10.00
-        total = total_price + tax + service_fee
-        
+        checkout = self.checkout
         prices = [
-            ("Subtotal:", f"RM {total_price:,.2f}"),
-            ("Tax (6%):", f"RM {tax:,.2f}"),
-            ("Service Fee:", f"RM {service_fee:,.2f}"),
-            ("TOTAL:", f"RM {total:,.2f}")
+            ("Subtotal:", f"RM {checkout.subtotal:,.2f}"),
+            ("Tax (6%):", f"RM {checkout.tax:,.2f}"),
+            ("Service Fee:", f"RM {checkout.service_fee:,.2f}"),
+            ("TOTAL:", f"RM {checkout.total:,.2f}")
         ]
         
         for label, value in prices:
@@ -642,6 +635,7 @@ Never share your banking credentials with anyone else."""
             "payment_method": method,
             "payment_date": now.strftime("%Y-%m-%d %H:%M:%S"),
             "payment_status": "processing",
+            "amount_paid": str(self.checkout.total),
             "payment_confirmation_id": f"PAY{now.strftime('%Y%m%d%H%M%S')}{random.randint(1000, 9999)}"
         }
         
@@ -762,14 +756,7 @@ Never share your banking credentials with anyone else."""
         booking_id = self.booking.get("booking_id", "N/A")
         item_name = self.booking.get("item_name", "your booking")
         
-        # Calculate total
-        try:
-            total_price = float(self.booking.get("total_price", 0))
-            tax = total_price * 0.06
-            service_fee = 5.00 if total_price < 500 else 10.00
-            total = total_price + tax + service_fee
-        except:
-            total = 0.0
+        total = self.checkout.total
         
         method_names = {
             "credit_card": "Credit/Debit Card",
@@ -834,18 +821,16 @@ Your booking is now confirmed!"""
             updated_booking = {
                 **self.booking,
                 **payment_details,
-                "status": "confirmed",
+                "status": CONFIRMED,
                 "confirmed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "customer_email": self.email
             }
             
-            # Save to JSON file
-            os.makedirs("bookings", exist_ok=True)
-            booking_id = updated_booking.get('booking_id', 'unknown')
-            filename = f"bookings/booking_{booking_id}.json"
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(updated_booking, f, indent=2, default=str)
+            # Record the booking with its payment as the confirmation event
+            get_booking_ledger().record(
+                {**self.booking, "customer_email": self.email},
+                status=CONFIRMED,
+                details={**payment_details, "confirmed_at": updated_booking["confirmed_at"]})
             
             # Execute callback if provided
             if self.callback:
@@ -880,18 +865,11 @@ Your booking is now confirmed!"""
     def cancel_booking(self):
         """Cancel the booking and jump to home.py"""
         try:
-            cancelled_booking = {
-                **self.booking,
-                "status": "cancelled",
-                "cancelled_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            }
-            
-            os.makedirs("bookings", exist_ok=True)
-            booking_id = cancelled_booking.get('booking_id', 'unknown')
-            filename = f"bookings/booking_{booking_id}.json"
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(cancelled_booking, f, indent=2, default=str)
+            # The cancellation is recorded even if the booking never reached payment
+            get_booking_ledger().record(
+                {**self.booking, "customer_email": self.email},
+                status=CANCELLED,
+                details={"cancelled_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
             
             messagebox.showinfo("Booking Cancelled", 
                               "Your booking has been cancelled.")
@@ -907,34 +885,20 @@ Your booking is now confirmed!"""
             messagebox.showerror("Error", "Failed to cancel booking.")
     
     def launch_home_page(self):
-        """Launch the home.py script"""
+        """Show the home page in the main window"""
         try:
-            # Get the current directory
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            home_script = os.path.join(current_dir, "home.py")
-            
-            # Check if home.py exists
-            if os.path.exists(home_script):
-                # Use the same Python executable
-                python_executable = sys.executable
-                
-                # Launch home.py as a new process
-                subprocess.Popen([python_executable, home_script])
-            else:
-                # If home.py doesn't exist, show a message
-                print(f"home.py not found at: {home_script}")
-                messagebox.showinfo("Home", "Returning to home...")
-                
+            router = get_router()
+            # Hidden while the payment screen was started on its own
+            router.root.deiconify()
+            router.show("home", self.email)
         except Exception as e:
-            print(f"Error launching home.py: {e}")
+            print(f"Error opening home page: {e}")
 
 
 # Main function
 def show_payment_window(email, booking_data=None, callback=None):
-    """Show payment window"""
-    root = tk.Tk()
-    app = PaymentApp(root, email, booking_data, callback)
-    root.mainloop()
+    """Show payment window over the app window"""
+    return PaymentApp(get_router().open_window(), email, booking_data, callback)
 
 
 # For standalone testing
@@ -957,4 +921,5 @@ if __name__ == "__main__":
         "contact": "contact@grandpalace.com",
         "notes": "Late check-in requested"
     }
-    show_payment_window("customer@example.com", test_booking)
\ No newline at end of file
+    show_payment_window("customer@example.com", test_booking)
+    get_router().run()
\ No newline at end of file
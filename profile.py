@@ -1,10 +1,10 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-import json
-import os
 from datetime import datetime
 import re
-import subprocess
+from page_router import get_router
+from json_store import read_json, write_json
+from session import end_session, get_session
 
 class Profile:
     def __init__(self, parent_frame, profile_btn, use_custom_menu=False):
@@ -30,43 +30,32 @@ class Profile:
             self.create_profile_widgets()
     
     def load_profile_data(self):
-        if os.path.exists(self.profile_data_file):
-            try:
-                with open(self.profile_data_file, 'r', encoding='utf-8') as f:
-                    self.profile_data = json.load(f)
-            except:
-                self.profile_data = self.get_default_profile()
-        else:
+        self.profile_data = read_json(self.profile_data_file)
+        if self.profile_data is None:
             self.profile_data = self.get_default_profile()
     
     def save_profile_data(self):
         try:
-            with open(self.profile_data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.profile_data, f, indent=2, ensure_ascii=False)
+            write_json(self.profile_data_file, self.profile_data)
             return True
         except Exception as e:
             print(f"Save failed: {e}")
             return False
     
     def get_default_profile(self):
-        # Try to get user information from user_session.json
-        session_file = 'user_session.json'
-        if os.path.exists(session_file):
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                    return {
-                        "personal_info": {
-                            "full_name": session_data.get('user_name', 'Guest User'),
-                            "email": session_data.get('email', 'guest@example.com'),
-                            "phone": "",
-                            "address": "",
-                            "nationality": "",
-                            "date_of_birth": ""
-                        }
-                    }
-            except:
-                pass
+        # Use the signed-in user's information if there is one
+        session = get_session()
+        if session.signed_in:
+            return {
+                "personal_info": {
+                    "full_name": session.user_name or 'Guest User',
+                    "email": session.email,
+                    "phone": "",
+                    "address": "",
+                    "nationality": "",
+                    "date_of_birth": ""
+                }
+            }
         
         return {
             "personal_info": {
@@ -338,17 +327,13 @@ Thank you for choosing Traney!
                 except:
                     pass
             
-            # Destroy main window
-            try:
-                self.parent.destroy()
-            except:
-                pass
+            end_session()
             
-            # Start main.py
+            # Back to the login page in the same window
             try:
-                subprocess.Popen(["python", "main.py"])
+                get_router().show("login")
             except Exception as e:
-                print(f"Error starting main.py: {e}")
+                print(f"Error opening login page: {e}")
                 messagebox.showinfo("Logout", "You have been logged out.\n\nPlease run main.py manually.")
                 
         except Exception as e:
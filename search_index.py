@@ -0,0 +1,119 @@
+import re
+from bisect import bisect_left
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lowercase word tokens of text"""
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+class SearchIndex:
+    """Inverted index for the search boxes of the listing pages.
+
+    Every item is split into word tokens per field; each token maps to the
+    positions of the items containing it together with a score (the weight of
+    the field it was found in). Query terms match tokens by prefix, using a
+    sorted token list, and by infix through a trigram index, so "lumpur"
+    finds "Kuala Lumpur" and "ang" finds "Bangkok". All terms of a query must
+    match (AND); the result is ranked by the summed scores, exact token
+    matches counting double.
+
+    Positions refer to the item list the index was built from, so a search
+    result composes directly with a CatalogIndex built over the same list.
+    """
+
+    def __init__(self, items, fields, id_field="id"):
+        self.items = list(items)
+        self.id_field = id_field
+        self.postings = {}   # token -> {position: score}
+        self.trigrams = {}   # trigram -> set of tokens
+
+        for position, item in enumerate(self.items):
+            for extract, weight in fields:
+                for token in tokenize(extract(item)):
+                    scores = self.postings.setdefault(token, {})
+                    scores[position] = scores.get(position, 0) + weight
+
+        self.tokens = sorted(self.postings)
+        for token in self.tokens:
+            for i in range(len(token) - 2):
+                self.trigrams.setdefault(token[i:i + 3], set()).add(token)
+
+    def __len__(self):
+        return len(self.items)
+
+    # ==================== TERMS ====================
+    def prefix_tokens(self, term):
+        """Tokens starting with term"""
+        start = bisect_left(self.tokens, term)
+        matches = []
+        for token in self.tokens[start:]:
+            if not token.startswith(term):
+                break
+            matches.append(token)
+        return matches
+
+    def infix_tokens(self, term):
+        """Tokens containing term anywhere (needs at least three characters)"""
+        if len(term) < 3:
+            return []
+        candidates = None
+        for i in range(len(term) - 2):
+            tokens = self.trigrams.get(term[i:i + 3])
+            if not tokens:
+                return []
+            candidates = set(tokens) if candidates is None else candidates & tokens
+        return [token for token in candidates if term in token]
+
+    def term_scores(self, term):
+        """{position: score} for items containing a token that matches term"""
+        scores = {}
+        for token in set(self.prefix_tokens(term)) | set(self.infix_tokens(term)):
+            boost = 2 if token == term else 1
+            for position, score in self.postings[token].items():
+                scores[position] = scores.get(position, 0) + score * boost
+        return scores
+
+    # ==================== QUERIES ====================
+    def match(self, query):
+        """{position: score} for items matching every term of query
+
+        An empty query returns None, meaning "no search filter".
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+
+        # Resolve the rarest terms first so the intersection shrinks quickly
+        term_results = sorted((self.term_scores(term) for term in set(terms)), key=len)
+        result = dict(term_results[0])
+        for scores in term_results[1:]:
+            if not result:
+                break
+            result = {position: score + scores[position]
+                      for position, score in result.items() if position in scores}
+        return result
+
+    def positions(self, query):
+        """Set of matching positions, or None for an empty query"""
+        result = self.match(query)
+        return None if result is None else set(result)
+
+    def ids(self, query):
+        """Set of matching item ids, or None for an empty query"""
+        result = self.match(query)
+        if result is None:
+            return None
+        return {self.items[position].get(self.id_field) for position in result}
+
+    def search(self, query, limit=None):
+        """Matching items, best match first (catalog order breaks ties)"""
+        result = self.match(query)
+        if result is None:
+            return list(self.items[:limit] if limit else self.items)
+        ranked = sorted(result, key=lambda position: (-result[position], position))
+        if limit:
+            ranked = ranked[:limit]
+        return [self.items[position] for position in ranked]
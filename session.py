@@ -0,0 +1,63 @@
+import os
+
+from json_store import read_json, write_json
+
+SESSION_FILE = 'user_session.json'
+
+
+class Session:
+    """The signed-in user of this process"""
+
+    def __init__(self, email=None, user_name=None, profile=None):
+        self.email = email
+        self.user_name = user_name
+        self.profile = profile or {}
+
+    @property
+    def signed_in(self):
+        return bool(self.email)
+
+    def to_dict(self):
+        return {'email': self.email, 'user_name': self.user_name, 'full_profile': self.profile}
+
+
+# The one Session shared by every page. Pages used to re-read
+# user_session.json on startup and rewrite it on every navigation; now the
+# file is only read once, for a page started on its own, and only written
+# at login and removed at logout.
+_session = None
+
+
+def get_session():
+    """Return the current session, reading user_session.json the first time"""
+    global _session
+    if _session is None:
+        data = read_json(SESSION_FILE, {})
+        if not isinstance(data, dict):
+            data = {}
+        _session = Session(data.get('email'), data.get('user_name'), data.get('full_profile'))
+    return _session
+
+
+def start_session(email, user_name, profile=None, persist=True):
+    """Sign a user in; persist keeps the session for pages started on their own"""
+    global _session
+    _session = Session(email, user_name, profile)
+    if persist:
+        try:
+            write_json(SESSION_FILE, _session.to_dict())
+        except OSError as e:
+            print(f"Error saving session: {e}")
+    return _session
+
+
+def end_session():
+    """Sign the current user out and forget the persisted session"""
+    global _session
+    _session = Session()
+    try:
+        os.remove(SESSION_FILE)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Error removing session: {e}")
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import threading
+from PIL import Image
+
+from json_store import write_json
+
+
+class ThumbnailStore:
+    """On-disk store of pre-resized image variants.
+
+    Thumbnails live in .cache/thumbs/ and are named after the SHA-1 of the
+    source file plus the target size and mode, so the same picture saved under
+    two names is only resized once. manifest.json remembers the hash of each
+    source together with its mtime and size; as long as those match, the
+    source file is not even read on startup.
+    """
+
+    MANIFEST_VERSION = 1
+
+    def __init__(self, cache_dir=None):
+        if cache_dir is None:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            cache_dir = os.path.join(base_dir, ".cache", "thumbs")
+        self.cache_dir = cache_dir
+        self.manifest_file = os.path.join(cache_dir, "manifest.json")
+        self._lock = threading.Lock()
+        self._manifest = self.load_manifest()
+
+    # ==================== MANIFEST ====================
+    def load_manifest(self):
+        """Load manifest from disk, starting fresh if it is missing or stale"""
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == self.MANIFEST_VERSION:
+                manifest.setdefault("sources", {})
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {"version": self.MANIFEST_VERSION, "sources": {}}
+
+    def save_manifest(self):
+        """Write manifest atomically"""
+        write_json(self.manifest_file, self._manifest, compact=True)
+
+    def source_hash(self, path):
+        """Return the content hash of a source image, reusing the manifest when unchanged"""
+        abs_path = os.path.abspath(path)
+        stat = os.stat(abs_path)
+
+        with self._lock:
+            entry = self._manifest["sources"].get(abs_path)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                return entry["sha1"]
+
+        digest = hashlib.sha1()
+        with open(abs_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        sha1 = digest.hexdigest()
+
+        with self._lock:
+            self._manifest["sources"][abs_path] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha1": sha1,
+            }
+            try:
+                self.save_manifest()
+            except OSError as e:
+                print(f"Error saving thumbnail manifest: {e}")
+        return sha1
+
+    # ==================== THUMBNAILS ====================
+    def thumb_path(self, sha1, size, mode):
+        """Path of the stored variant for a source hash, size and mode"""
+        extension = "jpg" if mode == "RGB" else "png"
+        return os.path.join(self.cache_dir, f"{sha1}_{size[0]}x{size[1]}_{mode}.{extension}")
+
+    def load(self, path, size, mode="RGB"):
+        """Return the stored thumbnail for path, or None if it has not been generated"""
+        try:
+            thumb_file = self.thumb_path(self.source_hash(path), size, mode)
+            if not os.path.exists(thumb_file):
+                return None
+            with Image.open(thumb_file) as image:
+                image.load()
+                return image if image.mode == mode else image.convert(mode)
+        except Exception:
+            return None
+
+    def save(self, path, size, mode, image):
+        """Store a resized variant of path"""
+        try:
+            thumb_file = self.thumb_path(self.source_hash(path), size, mode)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_file = f"{thumb_file}.{threading.get_ident()}.tmp"
+            if mode == "RGB":
+                image.save(temp_file, format="JPEG", quality=90)
+            else:
+                image.save(temp_file, format="PNG")
+            os.replace(temp_file, thumb_file)
+        except Exception as e:
+            print(f"Error saving thumbnail for {path}: {e}")
+
+    def clear(self):
+        """Delete every stored thumbnail and the manifest"""
+        with self._lock:
+            if os.path.isdir(self.cache_dir):
+                for filename in os.listdir(self.cache_dir):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, filename))
+                    except OSError:
+                        pass
+            self._manifest = {"version": self.MANIFEST_VERSION, "sources": {}}
+
+
+_store = None
+
+
+def get_thumbnail_store():
+    """Return the shared ThumbnailStore instance"""
+    global _store
+    if _store is None:
+        _store = ThumbnailStore()
+    return _store
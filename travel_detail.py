@@ -1,17 +1,21 @@
 import tkinter as tk
 from tkinter import ttk
 import datetime
-import random
 from PIL import Image, ImageTk
 import os
+from image_service import get_image_service, load_photo
+from catalog_store import load_city_catalog
+from itinerary_planner import plan_itinerary
+from trip_costs import BUDGET_TIERS, HOME_CURRENCY, format_money, estimate_trip
 
 
 class TravelDetail:
-    def __init__(self, root, itinerary_data, user_data, email="user@example.com"):
+    def __init__(self, root, itinerary_data, user_data, email="user@example.com", plan=None):
         self.root = root
         self.email = email
         self.itinerary_data = itinerary_data
         self.user_data = user_data
+        self.plan = plan
         self.root.attributes('-fullscreen', True)
         
         # Color scheme matching travel_plan.py
@@ -45,6 +49,9 @@ class TravelDetail:
         self.restaurants_data = self.load_restaurants_data()
         self.car_rental_data = self.load_car_rental_data()
         
+        # Cost estimates for the chosen budget and, for comparison, every other tier
+        self.cost_estimate, self.cost_estimates = estimate_trip(self.itinerary_data)
+        
         # Pre-load placeholder images
         self.preload_placeholders()
         
@@ -174,38 +181,27 @@ class TravelDetail:
             self.placeholder_images[category] = img
     
     def load_local_image(self, filename, size=(300, 200), placeholder_category='attraction'):
-        """Load image from local file with caching and error handling"""
+        """Load image from local file through the shared image service"""
         if not filename:
             return self.create_placeholder_image(placeholder_category, size)
         
-        # Check cache
-        if filename in self.image_cache:
-            return self.image_cache[filename]
-        
         # Define possible image paths
         base_dir = os.path.dirname(os.path.abspath(__file__))
-        possible_paths = [
+        img_path = get_image_service().find_image([
             os.path.join(base_dir, "data", "images", filename),
             os.path.join(base_dir, "images", filename),
             os.path.join(base_dir, filename),
-        ]
+        ])
         
-        for img_path in possible_paths:
-            try:
-                if os.path.exists(img_path):
-                    img = Image.open(img_path)
-                    img = img.resize(size, Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(img)
-                    self.image_cache[filename] = photo
-                    return photo
-            except Exception as e:
-                print(f"Error loading image {img_path}: {e}")
-                continue
+        photo = load_photo(img_path, size) if img_path else None
+        if photo is not None:
+            return photo
         
-        # If no image found, create placeholder
-        placeholder = self.create_placeholder_image(placeholder_category, size)
-        self.image_cache[filename] = placeholder
-        return placeholder
+        # If no image found, create placeholder (cached per window)
+        cache_key = f"placeholder_{placeholder_category}_{size[0]}_{size[1]}"
+        if cache_key not in self.image_cache:
+            self.image_cache[cache_key] = self.create_placeholder_image(placeholder_category, size)
+        return self.image_cache[cache_key]
     
     def create_placeholder_image(self, category, size=(300, 200)):
         """Create a colored placeholder image with emoji"""
@@ -303,7 +299,6 @@ class TravelDetail:
             ("🚗 Transportation", self.calculate_transportation_cost()),
         ]
         
-        total_cost = 0
         for item, cost in cost_items:
             item_frame = tk.Frame(card_content, bg=self.COLORS['card_bg'])
             item_frame.pack(fill='x', pady=(0, 12))  # Increased spacing
@@ -315,22 +310,6 @@ class TravelDetail:
             tk.Label(item_frame, text=cost, 
                     font=("Segoe UI", 13, 'bold'), bg=self.COLORS['card_bg'],  # Increased font size
                     fg=self.COLORS['primary']).pack(side='right')
-            
-            try:
-                if "RM" in cost:
-                    total_cost += float(cost.replace("RM", "").replace(",", "").strip())
-                elif "¥" in cost:
-                    total_cost += float(cost.replace("¥", "").replace(",", "").strip())
-                elif "S$" in cost:
-                    total_cost += float(cost.replace("S$", "").replace(",", "").strip()) * 3.5
-                elif "NT$" in cost:
-                    total_cost += float(cost.replace("NT$", "").replace(",", "").strip()) * 0.15
-                elif "HK$" in cost:
-                    total_cost += float(cost.replace("HK$", "").replace(",", "").strip()) * 0.6
-                elif "฿" in cost:
-                    total_cost += float(cost.replace("฿", "").replace(",", "").strip()) * 0.13
-            except:
-                pass
         
         total_frame = tk.Frame(card_content, bg=self.COLORS['primary'], height=2)
         total_frame.pack(fill='x', pady=20)
@@ -340,11 +319,36 @@ class TravelDetail:
                 font=("Segoe UI", 15, 'bold'), bg=self.COLORS['primary'],  # Increased font size
                 fg="white").pack(side='left', padx=15, pady=10)  # Increased padding
         
-        total_text = f"RM {total_cost:,.2f}" if "Malaysia" in self.itinerary_data['destination'] else f"¥ {total_cost:,.0f}"
+        total_text = format_money(self.cost_estimate.home_total, HOME_CURRENCY)
         tk.Label(total_frame, text=total_text, 
                 font=("Segoe UI", 18, 'bold'), bg=self.COLORS['primary'],  # Increased font size
                 fg="white").pack(side='right', padx=15, pady=10)  # Increased padding
         
+        estimate = self.cost_estimate
+        if estimate.currency != HOME_CURRENCY:
+            tk.Label(card_content, text=f"{format_money(estimate.total, estimate.currency)} in local currency", 
+                    font=("Segoe UI", 11), bg=self.COLORS['card_bg'],
+                    fg=self.COLORS['text_light']).pack(anchor='e')
+        
+        tk.Label(card_content, text=f"{format_money(estimate.home_per_traveller_per_day, HOME_CURRENCY)} per traveller per day", 
+                font=("Segoe UI", 11), bg=self.COLORS['card_bg'],
+                fg=self.COLORS['text_light']).pack(anchor='e', pady=(0, 10))
+        
+        # Same trip on the other budgets
+        for tier in BUDGET_TIERS:
+            if tier == estimate.tier:
+                continue
+            tier_frame = tk.Frame(card_content, bg=self.COLORS['card_bg'])
+            tier_frame.pack(fill='x', pady=(0, 6))
+            
+            tk.Label(tier_frame, text=f"{tier} budget", 
+                    font=("Segoe UI", 12), bg=self.COLORS['card_bg'],
+                    fg=self.COLORS['text_light']).pack(side='left')
+            
+            tk.Label(tier_frame, text=format_money(self.cost_estimates[tier].home_total, HOME_CURRENCY), 
+                    font=("Segoe UI", 12), bg=self.COLORS['card_bg'],
+                    fg=self.COLORS['text_light']).pack(side='right')
+        
         tk.Frame(card_content, bg=self.COLORS['border'], height=1).pack(fill='x', pady=30)
         
         if self.itinerary_data['transportation'] in ["Rental Car", "Mix of All"]:
@@ -354,7 +358,7 @@ class TravelDetail:
             
             destination = self.itinerary_data['destination']
             if destination in self.car_rental_data:
-                cars = self.car_rental_data[destination][:1]
+                cars = [self.plan.car] if self.plan.car else self.car_rental_data[destination][:1]
                 for car in cars:
                     car_frame = tk.Frame(card_content, bg=self.COLORS['light'], padx=20, pady=20)  # Increased padding
                     car_frame.pack(fill='x', pady=(0, 15))
@@ -551,6 +555,12 @@ class TravelDetail:
                 bg=self.COLORS['card_bg'], 
                 fg=self.COLORS['secondary']).pack(anchor='w')
         
+        if self.plan.distances.get(day):
+            tk.Label(theme_frame, text=f"🗺️ {self.plan.distances[day]:g} km between today's sights", 
+                    font=("Segoe UI", 12), 
+                    bg=self.COLORS['card_bg'], 
+                    fg=self.COLORS['text_light']).pack(anchor='w', pady=(5, 0))
+        
         summaries = [
             "Get settled and explore the local area. Perfect for recovering from travel.",
             "Dive deep into the local culture with museums, temples, and traditional activities.",
@@ -570,13 +580,12 @@ class TravelDetail:
                 bg=self.COLORS['light'], 
                 fg=self.COLORS['dark'], wraplength=600, justify='left').pack()
         
-        # Show recommended attraction for this day with image
+        # Show the day's first planned attraction with image
         destination = self.itinerary_data['destination']
-        if destination in self.attractions_data:
-            attractions = self.attractions_data[destination]
-            if attractions:
-                attraction = attractions[day % len(attractions)]
-                self.create_day_attraction_section(content_frame, attraction, day)
+        attraction = next((activity['attraction'] for activity in self.day_activities.get(day, [])
+                           if activity.get('attraction')), None)
+        if attraction:
+            self.create_day_attraction_section(content_frame, attraction, day)
         
         # Car rental recommendation section (only for certain days)
         if day == 1 and self.itinerary_data['transportation'] in ["Rental Car", "Mix of All"]:
@@ -612,7 +621,7 @@ class TravelDetail:
                     "Join a guided tour to learn more",
                     "Shop for souvenirs and local crafts",
                 ]
-                desc = descriptions[(self.day_activities[day].index(activity) + day) % len(descriptions)]
+                desc = activity.get('note') or descriptions[(self.day_activities[day].index(activity) + day) % len(descriptions)]
                 
                 tk.Label(desc_frame, text=f"💡 {desc}", 
                         font=("Segoe UI", 11), 
@@ -622,15 +631,22 @@ class TravelDetail:
                 duration_frame = tk.Frame(desc_frame, bg=self.COLORS['card_bg'])
                 duration_frame.pack(fill='x', pady=(5, 0))
                 
-                tk.Label(duration_frame, text="⏱️ 2-3 hours", 
+                tk.Label(duration_frame, text=f"⏱️ {activity.get('duration', '2-3 hours')}", 
                         font=("Segoe UI", 10), 
                         bg=self.COLORS['card_bg'], 
                         fg=self.COLORS['success']).pack(side='left', padx=(0, 15))
                 
-                tk.Label(duration_frame, text="💰 RM 50-100 / ¥ 1000-2000", 
-                        font=("Segoe UI", 10), 
-                        bg=self.COLORS['card_bg'], 
-                        fg=self.COLORS['warning']).pack(side='left')
+                if activity.get('price'):
+                    tk.Label(duration_frame, text=f"💰 {activity['price']}", 
+                            font=("Segoe UI", 10), 
+                            bg=self.COLORS['card_bg'], 
+                            fg=self.COLORS['warning']).pack(side='left', padx=(0, 15))
+                
+                if activity.get('distance_km'):
+                    tk.Label(duration_frame, text=f"📍 {activity['distance_km']:g} km from previous sight", 
+                            font=("Segoe UI", 10), 
+                            bg=self.COLORS['card_bg'], 
+                            fg=self.COLORS['text_light']).pack(side='left')
         
         tips_frame = tk.Frame(content_frame, bg=self.COLORS['light'])
         tips_frame.pack(fill='x', pady=(20, 0))
@@ -868,9 +884,12 @@ class TravelDetail:
         
         stats = [
             ("Total Days", f"{self.itinerary_data['days']} days"),
-            ("Activities Planned", f"{self.itinerary_data['days'] * 4} activities"),
+            ("Activities Planned", f"{sum(len(activities) for activities in self.day_activities.values())} activities"),
             ("Recommended Attractions", f"{min(4, len(self.attractions_data.get(self.itinerary_data['destination'], [])))} spots"),
             ("Car Rental Options", f"{len(self.car_rental_data.get(self.itinerary_data['destination'], []))} vehicles"),
+            ("Estimated Total", format_money(self.cost_estimate.home_total, HOME_CURRENCY)),
+            ("Per Traveller per Day", format_money(self.cost_estimate.home_per_traveller_per_day, HOME_CURRENCY)),
+            ("Travel Between Sights", f"{sum(self.plan.distances.values()):,.1f} km"),
         ]
         
         for i in range(0, len(stats), 2):
@@ -920,51 +939,31 @@ class TravelDetail:
                     fg=self.COLORS['dark'], wraplength=600, justify='left').pack(side='left')
     
     def generate_all_day_activities(self):
-        """Generate activities for all days"""
-        self.day_activities = {}
-        destination = self.itinerary_data['destination']
-        
-        for day in range(1, self.itinerary_data['days'] + 1):
-            activities = self.generate_day_activities(destination, day)
-            self.day_activities[day] = activities
+        """Plan every day from the catalogs, unless the plan was built before the window opened"""
+        if self.plan is None:
+            self.plan = plan_itinerary(self.itinerary_data, self.destination_catalogs())
+        self.day_activities = self.plan.days
     
-    def generate_day_activities(self, destination, day):
-        """Generate activities for a specific day"""
-        activities = []
-        
-        morning_options = [
-            "Visit local market for breakfast and fresh produce",
-            "Morning city tour with professional guide",
-            "Historical site visit and cultural exploration",
-            "Nature walk or hike in nearby parks",
-            "Museum visit to learn about local history"
-        ]
-        
-        afternoon_options = [
-            "Local restaurant lunch with traditional cuisine",
-            "Shopping district exploration and souvenir hunting",
-            "Cultural performance or traditional show",
-            "Guided tour of architectural landmarks",
-            "Relaxation time at local cafes or parks"
-        ]
-        
-        evening_options = [
-            "Fine dining experience at highly-rated restaurant",
-            "Night market visit for street food and local crafts",
-            "City lights viewing from observation deck",
-            "Cultural show or theater performance",
-            "Local bar or cafe for nightlife experience"
-        ]
-        
-        morning = random.choice(morning_options)
-        afternoon = random.choice(afternoon_options)
-        evening = random.choice(evening_options)
-        
-        activities.append({"time": "Morning ", "activity": morning})
-        activities.append({"time": "Afternoon ", "activity": afternoon})
-        activities.append({"time": "Evening ", "activity": evening})
-        
-        return activities
+    def destination_catalogs(self):
+        """The itinerary destination's entries of each catalog, as the planner takes them"""
+        return self.catalogs_for(self.itinerary_data['destination'], self.hotel_data,
+                                 self.attractions_data, self.restaurants_data, self.car_rental_data)
+    
+    @classmethod
+    def load_destination_catalogs(cls, destination):
+        """destination_catalogs() without a window, for planning on a worker thread"""
+        return cls.catalogs_for(destination, cls.load_hotel_data(), cls.load_attractions_data(),
+                                cls.load_restaurants_data(), cls.load_car_rental_data())
+    
+    @staticmethod
+    def catalogs_for(destination, hotels, attractions, restaurants, cars):
+        """destination's entries of the by-city catalogs, keyed as the planner takes them"""
+        return {
+            "attractions": attractions.get(destination, []),
+            "restaurants": restaurants.get(destination, []),
+            "hotels": hotels.get(destination, []),
+            "cars": cars.get(destination, []),
+        }
     
     def bind_sidebar_mousewheel(self, canvas):
         """Bind mousewheel to sidebar canvas"""
@@ -985,8 +984,30 @@ class TravelDetail:
         widget.bind("<Enter>", lambda e: widget.config(bg=hover_color) if widget.cget("state") != "disabled" else None)
         widget.bind("<Leave>", lambda e: widget.config(bg=normal_color) if widget.cget("state") != "disabled" else None)
     
-    # Data loading methods
-    def load_hotel_data(self):
+    # Data loading methods; they need no page, so the planner thread can call them
+    @classmethod
+    def load_hotel_data(cls):
+        """Load plan hotels by city from the local catalog store"""
+        return load_city_catalog("plan_hotel", 1, cls.default_hotel_data)
+    
+    @classmethod
+    def load_attractions_data(cls):
+        """Load plan attractions by city from the local catalog store"""
+        return load_city_catalog("plan_attraction", 2, cls.default_attractions_data)
+    
+    @classmethod
+    def load_restaurants_data(cls):
+        """Load restaurants by city from the local catalog store"""
+        return load_city_catalog("plan_restaurant", 1, cls.default_restaurants_data)
+    
+    @classmethod
+    def load_car_rental_data(cls):
+        """Load plan car rentals by city from the local catalog store"""
+        return load_city_catalog("plan_car", 1, cls.default_car_rental_data)
+    
+    # Default catalog data, written to the catalog store on first run
+    @staticmethod
+    def default_hotel_data():
         return {
             "Kuala Lumpur, Malaysia": [
                 {"name": "Riveria City Kuala Lumpur Sentral by Archos", "price": "RM 93", "rating": 4.0, "type": "3-star", "features": ["City views", "Swimming pool", "Modern design"], "location": "KL Sentral"},
@@ -1026,12 +1047,14 @@ class TravelDetail:
             ],
         }
     
-    def load_attractions_data(self):
-        """Load attractions data with local image files"""
+    @staticmethod
+    def default_attractions_data():
+        """Default attractions data with local image files"""
         return {
             "Kuala Lumpur, Malaysia": [
                 {
                     "name": "Petronas Twin Towers",
+                    "lat": 3.1579, "lon": 101.7116,
                     "price": "RM 85", 
                     "rating": 4.8, 
                     "duration": "2-3 hours", 
@@ -1042,6 +1065,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Batu Caves",
+                    "lat": 3.2379, "lon": 101.684,
                     "price": "RM 25", 
                     "rating": 4.5, 
                     "duration": "2 hours", 
@@ -1052,6 +1076,7 @@ class TravelDetail:
                 },
                 {
                     "name": "KL Tower",
+                    "lat": 3.1528, "lon": 101.7038,
                     "price": "RM 52", 
                     "rating": 4.6, 
                     "duration": "1-2 hours", 
@@ -1062,6 +1087,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Merdeka Square",
+                    "lat": 3.1478, "lon": 101.6934,
                     "price": "Free", 
                     "rating": 4.4, 
                     "duration": "1 hour", 
@@ -1074,6 +1100,7 @@ class TravelDetail:
             "Tokyo, Japan": [
                 {
                     "name": "Tokyo Skytree",
+                    "lat": 35.7101, "lon": 139.8107,
                     "price": "¥ 2,060", 
                     "rating": 4.7, 
                     "duration": "2-3 hours", 
@@ -1084,6 +1111,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Senso-ji Temple",
+                    "lat": 35.7148, "lon": 139.7967,
                     "price": "Free", 
                     "rating": 4.8, 
                     "duration": "1-2 hours", 
@@ -1094,6 +1122,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Shibuya Crossing",
+                    "lat": 35.6595, "lon": 139.7005,
                     "price": "Free", 
                     "rating": 4.6, 
                     "duration": "30 mins", 
@@ -1104,6 +1133,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Meiji Shrine",
+                    "lat": 35.6764, "lon": 139.6993,
                     "price": "Free", 
                     "rating": 4.7, 
                     "duration": "1-2 hours", 
@@ -1116,6 +1146,7 @@ class TravelDetail:
             "Bangkok, Thailand": [
                 {
                     "name": "Grand Palace",
+                    "lat": 13.75, "lon": 100.4913,
                     "price": "฿ 500", 
                     "rating": 4.8, 
                     "duration": "3-4 hours", 
@@ -1126,6 +1157,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Wat Arun",
+                    "lat": 13.7437, "lon": 100.4889,
                     "price": "฿ 100", 
                     "rating": 4.7, 
                     "duration": "1-2 hours", 
@@ -1136,6 +1168,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Chatuchak Market",
+                    "lat": 13.7999, "lon": 100.55,
                     "price": "Free", 
                     "rating": 4.5, 
                     "duration": "2-3 hours", 
@@ -1146,6 +1179,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Wat Pho",
+                    "lat": 13.7465, "lon": 100.493,
                     "price": "฿ 200", 
                     "rating": 4.6, 
                     "duration": "1-2 hours", 
@@ -1158,6 +1192,7 @@ class TravelDetail:
             "Singapore, Singapore": [
                 {
                     "name": "Gardens by the Bay",
+                    "lat": 1.2816, "lon": 103.8636,
                     "price": "S$ 28", 
                     "rating": 4.8, 
                     "duration": "3-4 hours", 
@@ -1168,6 +1203,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Marina Bay Sands",
+                    "lat": 1.2834, "lon": 103.8607,
                     "price": "S$ 23", 
                     "rating": 4.7, 
                     "duration": "2-3 hours", 
@@ -1178,6 +1214,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Sentosa Island",
+                    "lat": 1.2494, "lon": 103.8303,
                     "price": "S$ 4", 
                     "rating": 4.6, 
                     "duration": "Full day", 
@@ -1188,6 +1225,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Singapore Zoo",
+                    "lat": 1.4043, "lon": 103.793,
                     "price": "S$ 48", 
                     "rating": 4.7, 
                     "duration": "4-5 hours", 
@@ -1200,6 +1238,7 @@ class TravelDetail:
             "Hong Kong, China": [
                 {
                     "name": "Victoria Peak",
+                    "lat": 22.2759, "lon": 114.1455,
                     "price": "HK$ 52", 
                     "rating": 4.8, 
                     "duration": "2-3 hours", 
@@ -1210,6 +1249,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Star Ferry",
+                    "lat": 22.2935, "lon": 114.1688,
                     "price": "HK$ 5", 
                     "rating": 4.7, 
                     "duration": "30 mins", 
@@ -1220,6 +1260,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Tian Tan Buddha",
+                    "lat": 22.254, "lon": 113.905,
                     "price": "Free", 
                     "rating": 4.6, 
                     "duration": "2-3 hours", 
@@ -1230,6 +1271,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Temple Street Night Market",
+                    "lat": 22.3057, "lon": 114.1701,
                     "price": "Free", 
                     "rating": 4.4, 
                     "duration": "1-2 hours", 
@@ -1242,6 +1284,7 @@ class TravelDetail:
             "Taipei, Taiwan": [
                 {
                     "name": "Taipei 101",
+                    "lat": 25.034, "lon": 121.5645,
                     "price": "NT$ 600", 
                     "rating": 4.8, 
                     "duration": "2-3 hours", 
@@ -1252,6 +1295,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Shilin Night Market",
+                    "lat": 25.088, "lon": 121.5241,
                     "price": "Free", 
                     "rating": 4.7, 
                     "duration": "2-3 hours", 
@@ -1262,6 +1306,7 @@ class TravelDetail:
                 },
                 {
                     "name": "National Palace Museum",
+                    "lat": 25.1024, "lon": 121.5485,
                     "price": "NT$ 350", 
                     "rating": 4.7, 
                     "duration": "3-4 hours", 
@@ -1272,6 +1317,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Elephant Mountain",
+                    "lat": 25.0274, "lon": 121.5767,
                     "price": "Free", 
                     "rating": 4.6, 
                     "duration": "1-2 hours", 
@@ -1284,6 +1330,7 @@ class TravelDetail:
             "Shanghai, China": [
                 {
                     "name": "The Bund",
+                    "lat": 31.24, "lon": 121.49,
                     "price": "Free", 
                     "rating": 4.8, 
                     "duration": "1-2 hours", 
@@ -1294,6 +1341,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Shanghai Tower",
+                    "lat": 31.2335, "lon": 121.5055,
                     "price": "¥ 180", 
                     "rating": 4.7, 
                     "duration": "2-3 hours", 
@@ -1304,6 +1352,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Yu Garden",
+                    "lat": 31.2272, "lon": 121.4921,
                     "price": "¥ 40", 
                     "rating": 4.6, 
                     "duration": "2-3 hours", 
@@ -1314,6 +1363,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Nanjing Road",
+                    "lat": 31.235, "lon": 121.475,
                     "price": "Free", 
                     "rating": 4.5, 
                     "duration": "2-3 hours", 
@@ -1326,6 +1376,7 @@ class TravelDetail:
             "Beijing, China": [
                 {
                     "name": "Great Wall of China",
+                    "lat": 40.4319, "lon": 116.5704,
                     "price": "¥ 45", 
                     "rating": 4.9, 
                     "duration": "Full day", 
@@ -1336,6 +1387,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Forbidden City",
+                    "lat": 39.9163, "lon": 116.3972,
                     "price": "¥ 60", 
                     "rating": 4.8, 
                     "duration": "3-4 hours", 
@@ -1346,6 +1398,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Temple of Heaven",
+                    "lat": 39.8822, "lon": 116.4066,
                     "price": "¥ 15", 
                     "rating": 4.7, 
                     "duration": "2-3 hours", 
@@ -1356,6 +1409,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Summer Palace",
+                    "lat": 39.9999, "lon": 116.2755,
                     "price": "¥ 30", 
                     "rating": 4.7, 
                     "duration": "3-4 hours", 
@@ -1368,6 +1422,7 @@ class TravelDetail:
             "Penang, Malaysia": [
                 {
                     "name": "George Town Street Art",
+                    "lat": 5.4144, "lon": 100.3367,
                     "price": "Free", 
                     "rating": 4.8, 
                     "duration": "2-3 hours", 
@@ -1378,6 +1433,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Kek Lok Si Temple",
+                    "lat": 5.3997, "lon": 100.2737,
                     "price": "RM 2", 
                     "rating": 4.7, 
                     "duration": "2-3 hours", 
@@ -1388,6 +1444,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Penang Hill",
+                    "lat": 5.4246, "lon": 100.269,
                     "price": "RM 30", 
                     "rating": 4.6, 
                     "duration": "3-4 hours", 
@@ -1398,6 +1455,7 @@ class TravelDetail:
                 },
                 {
                     "name": "Batu Ferringhi Beach",
+                    "lat": 5.4716, "lon": 100.246,
                     "price": "Free", 
                     "rating": 4.5, 
                     "duration": "2-3 hours", 
@@ -1409,7 +1467,8 @@ class TravelDetail:
             ],
         }
     
-    def load_restaurants_data(self):
+    @staticmethod
+    def default_restaurants_data():
         return {
             "Kuala Lumpur, Malaysia": [
                 {"name": "Jalan Alor Food Street", "type": "Street Food", "price_range": "RM 10-30", "rating": 4.5, "features": ["Local cuisine", "Night market", "Variety"]},
@@ -1449,8 +1508,9 @@ class TravelDetail:
             ],
         }
     
-    def load_car_rental_data(self):
-        """Load car rental data with local images"""
+    @staticmethod
+    def default_car_rental_data():
+        """Default car rental data with local images"""
         return {
             "Kuala Lumpur, Malaysia": [
                 {
@@ -1672,341 +1732,13 @@ class TravelDetail:
     
     # Cost calculation methods
     def calculate_accommodation_cost(self):
-        days = self.itinerary_data['days']
-        budget = self.itinerary_data['budget']
-        travelers = self.itinerary_data['travelers']
-        destination = self.itinerary_data['destination']
-        
-        if "Malaysia" in destination:
-            if "Low" in budget:
-                base = 60
-            elif "Medium" in budget:
-                base = 120
-            elif "High" in budget:
-                base = 250
-            else:  # Luxury
-                base = 400
-            cost = base * days * travelers
-            return f"RM {cost:,.0f}"
-        elif "Japan" in destination:
-            if "Low" in budget:
-                base = 3000
-            elif "Medium" in budget:
-                base = 7000
-            elif "High" in budget:
-                base = 15000
-            else:  # Luxury
-                base = 25000
-            cost = base * days * travelers
-            return f"¥ {cost:,.0f}"
-        elif "Thailand" in destination:
-            if "Low" in budget:
-                base = 800
-            elif "Medium" in budget:
-                base = 2000
-            elif "High" in budget:
-                base = 4000
-            else:  # Luxury
-                base = 8000
-            cost = base * days * travelers
-            return f"฿ {cost:,.0f}"
-        elif "Singapore" in destination:
-            if "Low" in budget:
-                base = 100
-            elif "Medium" in budget:
-                base = 250
-            elif "High" in budget:
-                base = 500
-            else:  # Luxury
-                base = 1000
-            cost = base * days * travelers
-            return f"S$ {cost:,.0f}"
-        elif "Hong Kong" in destination:
-            if "Low" in budget:
-                base = 500
-            elif "Medium" in budget:
-                base = 1200
-            elif "High" in budget:
-                base = 2500
-            else:  # Luxury
-                base = 5000
-            cost = base * days * travelers
-            return f"HK$ {cost:,.0f}"
-        elif "Taiwan" in destination:
-            if "Low" in budget:
-                base = 1200
-            elif "Medium" in budget:
-                base = 2500
-            elif "High" in budget:
-                base = 5000
-            else:  # Luxury
-                base = 10000
-            cost = base * days * travelers
-            return f"NT$ {cost:,.0f}"
-        else:  # China (Shanghai/Beijing)
-            if "Low" in budget:
-                base = 200
-            elif "Medium" in budget:
-                base = 500
-            elif "High" in budget:
-                base = 1000
-            else:  # Luxury
-                base = 2000
-            cost = base * days * travelers
-            return f"¥ {cost:,.0f}"
-        return "N/A"
+        return self.cost_estimate.formatted('accommodation')
     
     def calculate_food_cost(self):
-        days = self.itinerary_data['days']
-        budget = self.itinerary_data['budget']
-        travelers = self.itinerary_data['travelers']
-        destination = self.itinerary_data['destination']
-        
-        if "Malaysia" in destination:
-            if "Low" in budget:
-                daily = 40
-            elif "Medium" in budget:
-                daily = 80
-            elif "High" in budget:
-                daily = 150
-            else:  # Luxury
-                daily = 250
-            cost = daily * days * travelers
-            return f"RM {cost:,.0f}"
-        elif "Japan" in destination:
-            if "Low" in budget:
-                daily = 2000
-            elif "Medium" in budget:
-                daily = 4000
-            elif "High" in budget:
-                daily = 8000
-            else:  # Luxury
-                daily = 15000
-            cost = daily * days * travelers
-            return f"¥ {cost:,.0f}"
-        elif "Thailand" in destination:
-            if "Low" in budget:
-                daily = 300
-            elif "Medium" in budget:
-                daily = 600
-            elif "High" in budget:
-                daily = 1200
-            else:  # Luxury
-                daily = 2500
-            cost = daily * days * travelers
-            return f"฿ {cost:,.0f}"
-        elif "Singapore" in destination:
-            if "Low" in budget:
-                daily = 30
-            elif "Medium" in budget:
-                daily = 60
-            elif "High" in budget:
-                daily = 120
-            else:  # Luxury
-                daily = 250
-            cost = daily * days * travelers
-            return f"S$ {cost:,.0f}"
-        elif "Hong Kong" in destination:
-            if "Low" in budget:
-                daily = 150
-            elif "Medium" in budget:
-                daily = 300
-            elif "High" in budget:
-                daily = 600
-            else:  # Luxury
-                daily = 1200
-            cost = daily * days * travelers
-            return f"HK$ {cost:,.0f}"
-        elif "Taiwan" in destination:
-            if "Low" in budget:
-                daily = 300
-            elif "Medium" in budget:
-                daily = 600
-            elif "High" in budget:
-                daily = 1200
-            else:  # Luxury
-                daily = 2500
-            cost = daily * days * travelers
-            return f"NT$ {cost:,.0f}"
-        else:  # China (Shanghai/Beijing)
-            if "Low" in budget:
-                daily = 100
-            elif "Medium" in budget:
-                daily = 200
-            elif "High" in budget:
-                daily = 400
-            else:  # Luxury
-                daily = 800
-            cost = daily * days * travelers
-            return f"¥ {cost:,.0f}"
-        return "N/A"
+        return self.cost_estimate.formatted('food')
     
     def calculate_activities_cost(self):
-        days = self.itinerary_data['days']
-        budget = self.itinerary_data['budget']
-        travelers = self.itinerary_data['travelers']
-        destination = self.itinerary_data['destination']
-        
-        if "Malaysia" in destination:
-            if "Low" in budget:
-                daily = 30
-            elif "Medium" in budget:
-                daily = 60
-            elif "High" in budget:
-                daily = 120
-            else:  # Luxury
-                daily = 200
-            cost = daily * days * travelers
-            return f"RM {cost:,.0f}"
-        elif "Japan" in destination:
-            if "Low" in budget:
-                daily = 1500
-            elif "Medium" in budget:
-                daily = 3000
-            elif "High" in budget:
-                daily = 6000
-            else:  # Luxury
-                daily = 10000
-            cost = daily * days * travelers
-            return f"¥ {cost:,.0f}"
-        elif "Thailand" in destination:
-            if "Low" in budget:
-                daily = 500
-            elif "Medium" in budget:
-                daily = 1000
-            elif "High" in budget:
-                daily = 2000
-            else:  # Luxury
-                daily = 4000
-            cost = daily * days * travelers
-            return f"฿ {cost:,.0f}"
-        elif "Singapore" in destination:
-            if "Low" in budget:
-                daily = 40
-            elif "Medium" in budget:
-                daily = 80
-            elif "High" in budget:
-                daily = 150
-            else:  # Luxury
-                daily = 300
-            cost = daily * days * travelers
-            return f"S$ {cost:,.0f}"
-        elif "Hong Kong" in destination:
-            if "Low" in budget:
-                daily = 100
-            elif "Medium" in budget:
-                daily = 200
-            elif "High" in budget:
-                daily = 400
-            else:  # Luxury
-                daily = 800
-            cost = daily * days * travelers
-            return f"HK$ {cost:,.0f}"
-        elif "Taiwan" in destination:
-            if "Low" in budget:
-                daily = 400
-            elif "Medium" in budget:
-                daily = 800
-            elif "High" in budget:
-                daily = 1600
-            else:  # Luxury
-                daily = 3000
-            cost = daily * days * travelers
-            return f"NT$ {cost:,.0f}"
-        else:  # China (Shanghai/Beijing)
-            if "Low" in budget:
-                daily = 150
-            elif "Medium" in budget:
-                daily = 300
-            elif "High" in budget:
-                daily = 600
-            else:  # Luxury
-                daily = 1200
-            cost = daily * days * travelers
-            return f"¥ {cost:,.0f}"
-        return "N/A"
+        return self.cost_estimate.formatted('activities')
     
     def calculate_transportation_cost(self):
-        days = self.itinerary_data['days']
-        budget = self.itinerary_data['budget']
-        travelers = self.itinerary_data['travelers']
-        destination = self.itinerary_data['destination']
-        
-        if "Malaysia" in destination:
-            if "Low" in budget:
-                daily = 20
-            elif "Medium" in budget:
-                daily = 40
-            elif "High" in budget:
-                daily = 80
-            else:  # Luxury
-                daily = 150
-            cost = daily * days * travelers
-            return f"RM {cost:,.0f}"
-        elif "Japan" in destination:
-            if "Low" in budget:
-                daily = 1000
-            elif "Medium" in budget:
-                daily = 2000
-            elif "High" in budget:
-                daily = 4000
-            else:  # Luxury
-                daily = 8000
-            cost = daily * days * travelers
-            return f"¥ {cost:,.0f}"
-        elif "Thailand" in destination:
-            if "Low" in budget:
-                daily = 200
-            elif "Medium" in budget:
-                daily = 400
-            elif "High" in budget:
-                daily = 800
-            else:  # Luxury
-                daily = 1500
-            cost = daily * days * travelers
-            return f"฿ {cost:,.0f}"
-        elif "Singapore" in destination:
-            if "Low" in budget:
-                daily = 15
-            elif "Medium" in budget:
-                daily = 30
-            elif "High" in budget:
-                daily = 60
-            else:  # Luxury
-                daily = 120
-            cost = daily * days * travelers
-            return f"S$ {cost:,.0f}"
-        elif "Hong Kong" in destination:
-            if "Low" in budget:
-                daily = 50
-            elif "Medium" in budget:
-                daily = 100
-            elif "High" in budget:
-                daily = 200
-            else:  # Luxury
-                daily = 400
-            cost = daily * days * travelers
-            return f"HK$ {cost:,.0f}"
-        elif "Taiwan" in destination:
-            if "Low" in budget:
-                daily = 200
-            elif "Medium" in budget:
-                daily = 400
-            elif "High" in budget:
-                daily = 800
-            else:  # Luxury
-                daily = 1500
-            cost = daily * days * travelers
-            return f"NT$ {cost:,.0f}"
-        else:  # China (Shanghai/Beijing)
-            if "Low" in budget:
-                daily = 50
-            elif "Medium" in budget:
-                daily = 100
-            elif "High" in budget:
-                daily = 200
-            else:  # Luxury
-                daily = 400
-            cost = daily * days * travelers
-            return f"¥ {cost:,.0f}"
-        return "N/A"
\ No newline at end of file
+        return self.cost_estimate.formatted('transportation')
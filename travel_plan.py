@@ -1,13 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from tkcalendar import Calendar
 import os
-import json
 import datetime
+import queue
 import random
+import threading
 from PIL import Image, ImageTk
-import requests
-from io import BytesIO
+from page_router import get_router, run
+from json_store import read_json, write_json
+from session import end_session
+
+# How often the loading screen checks the planner thread for progress (ms)
+PLAN_POLL_MS = 50
 
 
 class Enhancedtravel_plan:
@@ -117,22 +121,17 @@ class Enhancedtravel_plan:
     
     def load_user_data(self):
         """Load user data with error handling"""
-        try:
-            if os.path.exists('user_data.json'):
-                with open('user_data.json', 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if 'travel_plans' not in data:
-                        data['travel_plans'] = []
-                    return data
-        except Exception as e:
-            print(f"Error loading user data: {e}")
-        return {'travel_plans': []}
+        data = read_json('user_data.json')
+        if not isinstance(data, dict):
+            return {'travel_plans': []}
+        if 'travel_plans' not in data:
+            data['travel_plans'] = []
+        return data
     
     def save_user_data(self):
         """Save user data with error handling"""
         try:
-            with open('user_data.json', 'w', encoding='utf-8') as f:
-                json.dump(self.user_data, f, indent=2, ensure_ascii=False)
+            write_json('user_data.json', self.user_data)
             return True
         except Exception as e:
             print(f"Error saving user data: {e}")
@@ -685,6 +684,7 @@ class Enhancedtravel_plan:
                 fg="white").pack(pady=18)
         
         today = datetime.date.today()
+        from tkcalendar import Calendar
         cal = Calendar(cal_window, 
                       selectmode='day',
                       year=today.year,
@@ -756,9 +756,47 @@ class Enhancedtravel_plan:
         self.save_form_data()
         
         loading_window = self.show_loading_screen()
-        self.root.update()
         
-        self.root.after(1500, lambda: self.finish_plan_generation(loading_window))
+        # Plan on a worker thread; it only reports through updates, which
+        # the Tk thread polls, since widgets must not be touched from it
+        updates = queue.Queue()
+        threading.Thread(target=self.build_plan, args=(dict(self.itinerary_data), updates),
+                         name="itinerary-planner", daemon=True).start()
+        self.root.after(PLAN_POLL_MS, self.poll_plan, loading_window, updates)
+
+    def build_plan(self, itinerary, updates):
+        """Runs on the planner thread: load the catalogs and plan every day"""
+        from itinerary_planner import plan_itinerary
+        from travel_detail import TravelDetail
+        try:
+            catalogs = TravelDetail.load_destination_catalogs(itinerary['destination'])
+            plan = plan_itinerary(itinerary, catalogs,
+                                  progress=lambda done, total, message: updates.put(("progress", done, total, message)))
+            updates.put(("done", plan))
+        except Exception as e:
+            updates.put(("error", e))
+
+    def poll_plan(self, loading_window, updates):
+        """Runs on the Tk thread: show the planner's progress and open the plan when it is ready"""
+        if not loading_window.winfo_exists():
+            return
+        while True:
+            try:
+                update = updates.get_nowait()
+            except queue.Empty:
+                break
+            if update[0] == "progress":
+                _, done, total, message = update
+                self.plan_progress.config(maximum=total, value=done)
+                self.plan_status.config(text=message)
+            elif update[0] == "done":
+                self.finish_plan_generation(loading_window, update[1])
+                return
+            else:
+                loading_window.destroy()
+                messagebox.showerror("Error", f"Could not generate the travel plan: {update[1]}")
+                return
+        self.root.after(PLAN_POLL_MS, self.poll_plan, loading_window, updates)
 
     def show_loading_screen(self):
         """Show loading screen while generating plan"""
@@ -780,26 +818,26 @@ class Enhancedtravel_plan:
                 font=("Arial", 16, 'bold'), bg=self.COLORS['white'], 
                 fg=self.COLORS['navy']).pack()
         
-        tk.Label(loading_window, text="Analyzing preferences and generating recommendations...", 
+        self.plan_status = tk.Label(loading_window, text="Analyzing preferences and generating recommendations...", 
                 font=("Arial", 11), bg=self.COLORS['white'], 
-                fg=self.COLORS['text_light']).pack(pady=(5, 20))
+                fg=self.COLORS['text_light'])
+        self.plan_status.pack(pady=(5, 20))
         
         progress_frame = tk.Frame(loading_window, bg=self.COLORS['white'])
         progress_frame.pack(pady=10)
         
-        progress_bar = ttk.Progressbar(progress_frame, maximum=100, 
-                                      length=300, mode='indeterminate')
-        progress_bar.pack()
-        progress_bar.start(10)
+        self.plan_progress = ttk.Progressbar(progress_frame, maximum=100, 
+                                      length=300, mode='determinate')
+        self.plan_progress.pack()
         
         return loading_window
 
-    def finish_plan_generation(self, loading_window):
+    def finish_plan_generation(self, loading_window, plan=None):
         """Finish plan generation and show results"""
         loading_window.destroy()
-        self.show_travel_details()
+        self.show_travel_details(plan)
 
-    def show_travel_details(self):
+    def show_travel_details(self, plan=None):
         """Open travel details window with the itinerary data"""
         from travel_detail import TravelDetail
         # Create new window for travel details
@@ -809,7 +847,7 @@ class Enhancedtravel_plan:
         detail_window.minsize(1400, 800)
         
         # Pass the itinerary data and user data to the detail window
-        detail_app = TravelDetail(detail_window, self.itinerary_data, self.user_data, self.email)
+        detail_app = TravelDetail(detail_window, self.itinerary_data, self.user_data, self.email, plan)
         
         # Make the detail window modal
         detail_window.transient(self.root)
@@ -867,101 +905,18 @@ class Enhancedtravel_plan:
         if self.return_home_callback:
             self.return_home_callback()
         else:
-            # Try to launch home.py
-            try:
-                import home
-                root = tk.Tk()
-                try:
-                    app = home.HomeApp(root, self.email)
-                except TypeError:
-                    try:
-                        user_name = self.user_data.get('name', 'User')
-                        app = home.HomeApp(root, self.email, user_name)
-                    except TypeError:
-                        app = home.HomeApp(root)
-                root.mainloop()
-            except ImportError:
-                import subprocess
-                import sys
-                try:
-                    subprocess.Popen([sys.executable, "home.py"])
-                except:
-                    home_window = tk.Tk()
-                    home_window.title("TravelEase - Home")
-                    home_window.geometry("800x600")
-                    home_window.configure(bg=self.COLORS["bg"])
-                    
-                    header = tk.Frame(home_window, bg=self.COLORS["navy"], height=100)
-                    header.pack(fill="x")
-                    header.pack_propagate(False)
-                    
-                    tk.Label(header, text="🏠 TravelEase Home", 
-                            font=("Arial", 28, "bold"),
-                            fg="white", 
-                            bg=self.COLORS["navy"]).pack(pady=30)
-                    
-                    content = tk.Frame(home_window, bg=self.COLORS["bg"])
-                    content.pack(fill="both", expand=True, padx=40, pady=40)
-                    
-                    tk.Label(content, text="Welcome to TravelEase!", 
-                            font=("Arial", 24, "bold"),
-                            bg=self.COLORS["bg"],
-                            fg=self.COLORS["navy"]).pack(pady=20)
-                    
-                    tk.Label(content, text="Your one-stop travel planning solution", 
-                            font=("Arial", 16),
-                            bg=self.COLORS["bg"],
-                            fg=self.COLORS["text_light"]).pack(pady=10)
-                    
-                    features = [
-                        "✈️ Travel Plan - Create personalized itineraries",
-                        "🧳 Packing List - Plan what to pack",
-                        "🏨 Accommodation - Find and book hotels",
-                        "🏛️ Attractions - Discover local attractions",
-                        "🚗 Transportation - Book rides and tickets"
-                    ]
-                    
-                    for feature in features:
-                        tk.Label(content, text=feature, 
-                                font=("Arial", 14),
-                                bg=self.COLORS["bg"],
-                                fg=self.COLORS["text"]).pack(anchor="w", pady=8)
-                    
-                    travel_btn = tk.Button(content,
-                                          text="✈️ Create Travel Plan",
-                                          command=lambda: self.open_travel_plan(home_window),
-                                          font=("Arial", 14, "bold"),
-                                          bg=self.COLORS["dark_orange"],
-                                          fg="white",
-                                          bd=0,
-                                          cursor="hand2",
-                                          padx=30,
-                                          pady=15)
-                    travel_btn.pack(pady=40)
-                    
-                    home_window.mainloop()
-    
-    def open_travel_plan(self, home_window):
-        """Open travel plan from home window"""
-        home_window.destroy()
-        root = tk.Tk()
-        app = Enhancedtravel_plan(root, email=self.email, user_data=self.user_data)
-        root.mainloop()
+            get_router().show("home", self.email)
     
     def logout(self):
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
+            end_session()
             self.root.destroy()
             try:
-                import main
-                root = tk.Tk()
-                app = main.LoginApp(root)
-                root.mainloop()
+                get_router().show("login")
             except ImportError:
                 print("Login module not found")
 
 
 # Main execution
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = Enhancedtravel_plan(root)
-    root.mainloop()
\ No newline at end of file
+    run("travel_plan")
\ No newline at end of file
@@ -0,0 +1,190 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import NamedTuple
+
+CENTS = Decimal("0.01")
+
+BUDGET_TIERS = ("Low", "Medium", "High", "Luxury")
+COST_CATEGORIES = ("accommodation", "food", "activities", "transportation")
+
+HOME_CURRENCY = "MYR"
+
+# currency code -> display symbol
+CURRENCY_SYMBOLS = {
+    "MYR": "RM",
+    "JPY": "¥",
+    "THB": "฿",
+    "SGD": "S$",
+    "HKD": "HK$",
+    "TWD": "NT$",
+    "CNY": "¥",
+}
+
+# Offline exchange rates: HOME_CURRENCY per one unit of each currency.
+# Approximate, updated by hand; estimates never need live rates.
+FX_RATES = {
+    "MYR": Decimal("1"),
+    "JPY": Decimal("0.031"),
+    "THB": Decimal("0.13"),
+    "SGD": Decimal("3.5"),
+    "HKD": Decimal("0.6"),
+    "TWD": Decimal("0.15"),
+    "CNY": Decimal("0.65"),
+}
+
+# Countries in the order a destination name is matched against them; a
+# destination matching none of them is priced as China (Shanghai/Beijing).
+COUNTRIES = ("Malaysia", "Japan", "Thailand", "Singapore", "Hong Kong", "Taiwan")
+DEFAULT_COUNTRY = "China"
+
+COUNTRY_CURRENCIES = {
+    "Malaysia": "MYR",
+    "Japan": "JPY",
+    "Thailand": "THB",
+    "Singapore": "SGD",
+    "Hong Kong": "HKD",
+    "Taiwan": "TWD",
+    "China": "CNY",
+}
+
+# Local-currency cost per traveller per day: country -> category -> one
+# amount per budget tier, in BUDGET_TIERS order
+_COST_ROWS = {
+    "Malaysia": {
+        "accommodation": (60, 120, 250, 400),
+        "food": (40, 80, 150, 250),
+        "activities": (30, 60, 120, 200),
+        "transportation": (20, 40, 80, 150),
+    },
+    "Japan": {
+        "accommodation": (3000, 7000, 15000, 25000),
+        "food": (2000, 4000, 8000, 15000),
+        "activities": (1500, 3000, 6000, 10000),
+        "transportation": (1000, 2000, 4000, 8000),
+    },
+    "Thailand": {
+        "accommodation": (800, 2000, 4000, 8000),
+        "food": (300, 600, 1200, 2500),
+        "activities": (500, 1000, 2000, 4000),
+        "transportation": (200, 400, 800, 1500),
+    },
+    "Singapore": {
+        "accommodation": (100, 250, 500, 1000),
+        "food": (30, 60, 120, 250),
+        "activities": (40, 80, 150, 300),
+        "transportation": (15, 30, 60, 120),
+    },
+    "Hong Kong": {
+        "accommodation": (500, 1200, 2500, 5000),
+        "food": (150, 300, 600, 1200),
+        "activities": (100, 200, 400, 800),
+        "transportation": (50, 100, 200, 400),
+    },
+    "Taiwan": {
+        "accommodation": (1200, 2500, 5000, 10000),
+        "food": (300, 600, 1200, 2500),
+        "activities": (400, 800, 1600, 3000),
+        "transportation": (200, 400, 800, 1500),
+    },
+    "China": {
+        "accommodation": (200, 500, 1000, 2000),
+        "food": (100, 200, 400, 800),
+        "activities": (150, 300, 600, 1200),
+        "transportation": (50, 100, 200, 400),
+    },
+}
+
+# (country, budget tier, category) -> local cost per traveller per day
+DAILY_COSTS = {
+    (country, tier, category): Decimal(amounts[i])
+    for country, categories in _COST_ROWS.items()
+    for category, amounts in categories.items()
+    for i, tier in enumerate(BUDGET_TIERS)
+}
+
+
+def country_of(destination):
+    """Country a destination such as "Tokyo, Japan" is priced as"""
+    for country in COUNTRIES:
+        if country in (destination or ""):
+            return country
+    return DEFAULT_COUNTRY
+
+
+def budget_tier(budget):
+    """Tier of a budget option such as "Medium (RM 1,000 - 3,000)"; anything unrecognised is Luxury"""
+    for tier in BUDGET_TIERS[:-1]:
+        if tier in (budget or ""):
+            return tier
+    return BUDGET_TIERS[-1]
+
+
+def to_home(amount, currency, home=HOME_CURRENCY):
+    """amount in currency converted to home, to the cent"""
+    converted = amount * FX_RATES[currency] / FX_RATES[home]
+    return converted.quantize(CENTS, ROUND_HALF_UP)
+
+
+def format_money(amount, currency):
+    return f"{CURRENCY_SYMBOLS.get(currency, currency)} {amount:,.0f}"
+
+
+class CostEstimate(NamedTuple):
+    """Estimated trip cost for one budget tier
+
+    daily holds the local cost of each category per traveller per day;
+    totals and total are for the whole trip. Amounts are local currency
+    unless the name says home.
+    """
+    country: str
+    tier: str
+    currency: str
+    days: int
+    travelers: int
+    daily: dict
+    totals: dict
+    total: Decimal
+    home_total: Decimal
+
+    @property
+    def per_traveller(self):
+        return self.total / self.travelers
+
+    @property
+    def per_day(self):
+        return self.total / self.days
+
+    @property
+    def home_per_traveller_per_day(self):
+        return (self.home_total / (self.days * self.travelers)).quantize(CENTS, ROUND_HALF_UP)
+
+    def formatted(self, category):
+        return format_money(self.totals[category], self.currency)
+
+
+def estimate_budgets(destination, days, travelers, tiers=BUDGET_TIERS, home=HOME_CURRENCY):
+    """CostEstimate for every tier in tiers, from a single walk over the cost table
+
+    The country, currency and exchange rate are resolved once; each tier is
+    then its row of daily costs scaled by days x travelers.
+    """
+    country = country_of(destination)
+    currency = COUNTRY_CURRENCIES[country]
+    days = max(1, int(days or 1))
+    travelers = max(1, int(travelers or 1))
+    person_days = days * travelers
+
+    estimates = {}
+    for tier in tiers:
+        daily = {category: DAILY_COSTS[country, tier, category] for category in COST_CATEGORIES}
+        totals = {category: cost * person_days for category, cost in daily.items()}
+        total = sum(totals.values(), Decimal(0))
+        estimates[tier] = CostEstimate(country, tier, currency, days, travelers, daily, totals,
+                                       total, to_home(total, currency, home))
+    return estimates
+
+
+def estimate_trip(itinerary):
+    """(estimate for the itinerary's own budget, estimates for every budget tier)"""
+    estimates = estimate_budgets(itinerary.get('destination'), itinerary.get('days'),
+                                 itinerary.get('travelers'))
+    return estimates[budget_tier(itinerary.get('budget'))], estimates
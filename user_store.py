@@ -0,0 +1,134 @@
+import json
+import os
+import sqlite3
+import threading
+
+
+class UserStore:
+    """SQLite-backed user accounts, one row per email.
+
+    The accounts used to live in traney_users.json, which every login read
+    completely and every signup or password reset rewrote completely. Here
+    the email is the primary key, so a login is a single indexed lookup and
+    a signup is a single INSERT: two processes signing up at the same time
+    both keep their accounts, and a duplicate email is rejected by the
+    database rather than by a read-then-write race.
+
+    The user dict the pages work with (personal_info, bookings, ...) is kept
+    as JSON in data; password and created_at are real columns. On first use
+    the accounts from the legacy JSON file are imported once.
+    """
+
+    def __init__(self, db_path=None, legacy_file=None):
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        if db_path is None:
+            db_path = os.path.join(base_dir, "traney_users.db")
+        if legacy_file is None:
+            legacy_file = os.path.join(base_dir, "traney_users.json")
+        self.db_path = db_path
+        self.legacy_file = legacy_file
+        self._lock = threading.Lock()
+        # timeout makes a writer wait for another process' transaction instead of failing
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self.create_schema()
+
+    def create_schema(self):
+        with self._lock, self._conn:
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users'").fetchone()
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS users (
+                    email      TEXT PRIMARY KEY,
+                    password   TEXT NOT NULL DEFAULT '',
+                    created_at TEXT NOT NULL DEFAULT '',
+                    data       TEXT NOT NULL
+                );
+            """)
+        if not exists:
+            self.import_legacy()
+
+    def close(self):
+        self._conn.close()
+
+    @staticmethod
+    def _row(email, user):
+        data = {key: value for key, value in user.items() if key not in ("password", "created_at")}
+        return (email, user.get("password", ""), user.get("created_at", ""),
+                json.dumps(data, ensure_ascii=False))
+
+    @staticmethod
+    def _user(row):
+        user = json.loads(row[2])
+        user["password"] = row[0]
+        user["created_at"] = row[1]
+        return user
+
+    def import_legacy(self):
+        """Copy the accounts of the legacy JSON file into the store (existing emails win)"""
+        if not os.path.exists(self.legacy_file):
+            return 0
+        try:
+            with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                users = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading {self.legacy_file}: {e}")
+            return 0
+        rows = [self._row(email, user) for email, user in users.items() if isinstance(user, dict)]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO users (email, password, created_at, data) VALUES (?, ?, ?, ?)",
+                rows)
+        return len(rows)
+
+    # ==================== READING ====================
+    def exists(self, email):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM users WHERE email = ?", (email,)).fetchone() is not None
+
+    def get(self, email):
+        """The user dict for email (password and created_at included), or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT password, created_at, data FROM users WHERE email = ?",
+                                     (email,)).fetchone()
+        return self._user(row) if row else None
+
+    def password_hash(self, email):
+        """Stored password hash for email, or None if there is no such user"""
+        with self._lock:
+            row = self._conn.execute("SELECT password FROM users WHERE email = ?", (email,)).fetchone()
+        return row[0] if row else None
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    # ==================== WRITING ====================
+    def create(self, email, user):
+        """Insert a new user; False if the email is already registered"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO users (email, password, created_at, data) VALUES (?, ?, ?, ?)",
+                    self._row(email, user))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def set_password(self, email, password_hash):
+        """Replace the password hash of email; False if there is no such user"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("UPDATE users SET password = ? WHERE email = ?",
+                                        (password_hash, email))
+        return cursor.rowcount == 1
+
+
+_store = None
+
+
+def get_user_store():
+    """Return the shared UserStore instance"""
+    global _store
+    if _store is None:
+        _store = UserStore()
+    return _store
@@ -0,0 +1,201 @@
+import tkinter as tk
+from collections import OrderedDict
+
+
+class VirtualGrid:
+    """Scrollable card grid that only builds widgets for the rows on screen.
+
+    Every row has a fixed height, so the grid knows which items fall inside
+    the canvas viewport without measuring anything. Cards for those rows (plus
+    a small overscan) are placed as canvas windows; when a row scrolls out of
+    view its cards are hidden and reused for the rows coming into view.
+    Pages supply two callbacks:
+
+        build_card(parent) -> widget   creates an empty card skeleton
+        fill_card(card, item)          updates an existing card in place
+
+    Cards are reconciled by item key (key(item), the item's id by default).
+    When set_items() is called after a filter or sort change, a card that
+    already shows an item is only moved to its new cell; fill_card runs only
+    when a card is handed to a different item object. When what a card shows
+    also depends on page state (a selected class, a passenger count), pass
+    refill=True, or call refresh(), so every card is filled again.
+    """
+
+    def __init__(self, parent, build_card, fill_card, columns=3, row_height=400,
+                 overscan=1, padx=8, pady=8, bg="#f0f8ff", height=None,
+                 empty_text="No results found", empty_fg="#64748b", key=None):
+        self.build_card = build_card
+        self.fill_card = fill_card
+        self.key = key or (lambda item: item.get("id", id(item)))
+        self.columns = max(1, columns)
+        self.row_height = row_height
+        self.overscan = overscan
+        self.padx = padx
+        self.pady = pady
+
+        self.items = []
+        self._shown = {}            # item key -> (card, window id) on screen
+        self._hidden = OrderedDict()  # item key -> (card, window id), oldest first
+        self._bound = {}            # window id -> item the card was last filled with
+        self._render_job = None
+        self._width = 0
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.canvas = tk.Canvas(self.frame, bg=bg, highlightthickness=0)
+        if height:
+            self.canvas.configure(height=height)
+        self.scrollbar = tk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
+
+        self.canvas.pack(side="left", fill="both", expand=True, padx=(0, 2))
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.bind("<Configure>", self._on_resize)
+
+        # Empty-state message, shown instead of cards when there are no items
+        self.empty_label = tk.Label(self.canvas, text=empty_text, font=("Arial", 14),
+                                    bg=bg, fg=empty_fg)
+        self._empty_window = self.canvas.create_window(0, 50, window=self.empty_label,
+                                                       anchor="n", state="hidden")
+
+    # ==================== GEOMETRY ====================
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    def row_count(self):
+        return (len(self.items) + self.columns - 1) // self.columns
+
+    def column_width(self):
+        width = self._width or self.canvas.winfo_width()
+        if width <= 1:
+            width = self.canvas.winfo_reqwidth()
+        return max(1, width / self.columns)
+
+    def cell_origin(self, index):
+        """Top-left corner of the card for item index"""
+        row, col = divmod(index, self.columns)
+        return col * self.column_width() + self.padx, row * self.row_height + self.pady
+
+    def visible_range(self):
+        """Indices of items inside the viewport, including overscan rows"""
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        if height <= 1:
+            height = self.canvas.winfo_reqheight()
+
+        first_row = max(0, int(top // self.row_height) - self.overscan)
+        last_row = min(self.row_count() - 1, int((top + height) // self.row_height) + self.overscan)
+        if last_row < first_row:
+            return range(0)
+        return range(first_row * self.columns, min(len(self.items), (last_row + 1) * self.columns))
+
+    # ==================== DATA ====================
+    def set_items(self, items, reset_scroll=True, refill=False):
+        """Show a new list of items, keeping the cards of items that stay visible
+
+        refill fills every card again even if it keeps its item, for page
+        state changes that the items themselves don't reflect.
+        """
+        self.items = list(items)
+        if reset_scroll:
+            self.canvas.yview_moveto(0)
+        if refill:
+            self._bound.clear()
+        self._update_scrollregion()
+        self.render()
+
+    def refresh(self):
+        """Refill every card from its current item (hidden cards when they are shown again)"""
+        self._bound.clear()
+        self.render()
+
+    def visible_cards(self):
+        """(item, card) pairs currently on screen"""
+        cards = []
+        for index, key in self._visible_keys():
+            slot = self._shown.get(key)
+            if slot is not None:
+                cards.append((self.items[index], slot[0]))
+        return cards
+
+    def _visible_keys(self):
+        """(index, key) for the visible items; repeated keys are made unique"""
+        seen = {}
+        keyed = []
+        for index in self.visible_range():
+            key = self.key(self.items[index])
+            count = seen.get(key, 0)
+            seen[key] = count + 1
+            keyed.append((index, key if count == 0 else (key, count)))
+        return keyed
+
+    # ==================== RENDERING ====================
+    def render(self):
+        """Attach cards to the visible rows and hide the rest"""
+        self._render_job = None
+        if not self.canvas.winfo_exists():
+            return
+        wanted = self._visible_keys()
+        wanted_keys = {key for _, key in wanted}
+
+        for key in list(self._shown):
+            if key not in wanted_keys:
+                self._hide(key)
+
+        card_width = self.column_width() - 2 * self.padx
+        card_height = self.row_height - 2 * self.pady
+        for index, key in wanted:
+            item = self.items[index]
+            slot = self._shown.get(key) or self._acquire(key, wanted_keys)
+            self._shown[key] = slot
+            if self._bound.get(slot[1]) is not item:
+                self.fill_card(slot[0], item)
+                self._bound[slot[1]] = item
+
+            x, y = self.cell_origin(index)
+            self.canvas.coords(slot[1], x, y)
+            self.canvas.itemconfigure(slot[1], width=card_width, height=card_height, state="normal")
+
+        self.canvas.itemconfigure(self._empty_window, state="normal" if not self.items else "hidden")
+
+    def _acquire(self, key, wanted_keys):
+        """Return a card for key, reusing hidden cards before building new ones"""
+        slot = self._hidden.pop(key, None)
+        if slot is not None:
+            return slot
+
+        for old_key in self._hidden:
+            if old_key not in wanted_keys:
+                return self._hidden.pop(old_key)
+
+        card = self.build_card(self.canvas)
+        window = self.canvas.create_window(0, 0, window=card, anchor="nw")
+        return card, window
+
+    def _hide(self, key):
+        """Take the card for key off screen, keeping it bound to its item"""
+        slot = self._shown.pop(key)
+        self.canvas.itemconfigure(slot[1], state="hidden")
+        self._hidden[key] = slot
+
+    def _schedule_render(self):
+        if self._render_job is None:
+            self._render_job = self.canvas.after_idle(self.render)
+
+    def _update_scrollregion(self):
+        width = self._width or self.canvas.winfo_width()
+        self.canvas.configure(scrollregion=(0, 0, width, self.row_count() * self.row_height))
+
+    # ==================== EVENTS ====================
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_render()
+
+    def _on_resize(self, event):
+        self._width = event.width
+        self.canvas.coords(self._empty_window, event.width / 2, 50)
+        self._update_scrollregion()
+        self._schedule_render()